@@ -0,0 +1,778 @@
+import asyncio
+import functools
+from typing import List, Iterable, AsyncIterator, Tuple
+import Solution
+import Utility.AsyncDBConnector as AsyncConnector
+from Utility.Status import Status
+from Utility.Exceptions import DatabaseException
+from Business.File import File
+from Business.RAM import RAM
+from Business.Disk import Disk
+from Solution import FILES_CACHE, DISKS_CACHE, RAMS_CACHE
+from SolutionCommon import createDisk, createFile, createRAM, lookupKeys, resultsByIDs, chunks, chunkRows, \
+    stagedStatuses, addStatus, placementRows, placementStatuses, unplacedStatuses
+
+# the API of Solution.py for asyncio callers: every function is a coroutine (the stream functions are async
+# generators) with the same arguments, statements, caches and Status/sentinel results as its Solution.py
+# counterpart, on the connections of AsyncDBConnector. many concurrent calls share a few connections,
+# a call waiting for the database does not hold a thread. what does no I/O is shared through SolutionCommon.py.
+# the table management functions run Solution.py in a thread of the default executor, they are not on
+# any request path. with engine = memory (see Solution.backendEngine) every function calls MemorySolution.py
+
+
+# ========= TABLES ===========
+async def createTables():
+    await inThread(Solution.createTables)
+
+
+async def clearTables():
+    await inThread(Solution.clearTables)
+
+
+async def dropTables():
+    await inThread(Solution.dropTables)
+
+
+async def tablesExist() -> bool:
+    return await inThread(Solution.tablesExist)
+
+
+async def inThread(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+# ========= CRUD API ===========
+async def addFile(file: File) -> Status:
+    conn = None
+    ret = Status.OK
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        rows_effected, _ = await conn.execute(Solution.ADD_FILE,
+                                              args=(file.getFileID(), file.getType(), file.getSize()))
+        await conn.commit()
+    except DatabaseException.NOT_NULL_VIOLATION:
+        ret = Status.BAD_PARAMS
+        await conn.rollback()
+
+    except DatabaseException.CHECK_VIOLATION:
+        ret = Status.BAD_PARAMS
+        await conn.rollback()
+
+    except DatabaseException.UNIQUE_VIOLATION:
+        ret = Status.ALREADY_EXISTS
+        await conn.rollback()
+
+    except Exception:
+        ret = Status.ERROR
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ret
+
+
+async def getFileByID(fileID: int) -> File:
+    row = FILES_CACHE.get(fileID)
+    if row is not None:
+        return createFile(row)
+    token = FILES_CACHE.token()
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        rows_effected, result = await conn.execute(Solution.GET_FILE, args=(fileID,))
+        if rows_effected == 0:
+            file = File.badFile()
+        else:
+            file = createFile(result.rows[0])
+            FILES_CACHE.put(fileID, result.rows[0], token)
+        await conn.commit()
+    except Exception:
+        file = File.badFile()
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return file
+
+
+async def deleteFile(file: File) -> Status:
+    conn = None
+    ret = Status.OK
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        _, disks = await conn.execute(Solution.FREE_SPACE_OF_DELETED_FILE, args=(file.getFileID(),))
+        rows_effected, _ = await conn.execute(Solution.DELETE_FILE, args=(file.getFileID(),))
+        await conn.commit()
+        FILES_CACHE.invalidate(file.getFileID())
+        for row in disks.rows:
+            DISKS_CACHE.invalidate(row[0])
+    except Exception as e:
+        ret = Status.ERROR
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ret
+
+
+async def addDisk(disk: Disk) -> Status:
+    conn = None
+    ret = Status.OK
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        rows_effected, _ = await conn.execute(Solution.ADD_DISK,
+                                              args=(disk.getDiskID(), disk.getCompany(), disk.getSpeed(),
+                                                    disk.getFreeSpace(), disk.getCost()))
+        await conn.commit()
+    except DatabaseException.NOT_NULL_VIOLATION:
+        ret = Status.BAD_PARAMS
+        await conn.rollback()
+
+    except DatabaseException.CHECK_VIOLATION:
+        ret = Status.BAD_PARAMS
+        await conn.rollback()
+
+    except DatabaseException.UNIQUE_VIOLATION:
+        ret = Status.ALREADY_EXISTS
+        await conn.rollback()
+
+    except Exception as e:
+        print(e)
+        ret = Status.ERROR
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ret
+
+
+async def getDiskByID(diskID: int) -> Disk:
+    row = DISKS_CACHE.get(diskID)
+    if row is not None:
+        return createDisk(row)
+    token = DISKS_CACHE.token()
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        rows_effected, result = await conn.execute(Solution.GET_DISK, args=(diskID,))
+        if rows_effected == 0:
+            disk = Disk.badDisk()
+        else:
+            disk = createDisk(result.rows[0])
+            DISKS_CACHE.put(diskID, result.rows[0], token)
+    except Exception as e:
+        disk = Disk.badDisk()
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return disk
+
+
+async def deleteDisk(diskID: int) -> Status:
+    conn = None
+    ret = Status.OK
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        rows_effected, _ = await conn.execute(Solution.DELETE_DISK, args=(diskID,))
+        if rows_effected == 0:
+            ret = Status.NOT_EXISTS
+        await conn.commit()
+        DISKS_CACHE.invalidate(diskID)
+    except Exception as e:
+        ret = Status.ERROR
+        if conn is not None:
+            await conn.rollback()
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ret
+
+
+async def addRAM(ram: RAM) -> Status:
+    conn = None
+    ret = Status.OK
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        rows_effected, _ = await conn.execute(Solution.ADD_RAM, args=(ram.getRamID(), ram.getSize(), ram.getCompany()))
+        await conn.commit()
+    except DatabaseException.NOT_NULL_VIOLATION:
+        ret = Status.BAD_PARAMS
+        await conn.rollback()
+
+    except DatabaseException.CHECK_VIOLATION:
+        ret = Status.BAD_PARAMS
+        await conn.rollback()
+
+    except DatabaseException.UNIQUE_VIOLATION:
+        ret = Status.ALREADY_EXISTS
+        await conn.rollback()
+
+    except Exception as e:
+        ret = Status.ERROR
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ret
+
+
+async def getRAMByID(ramID: int) -> RAM:
+    row = RAMS_CACHE.get(ramID)
+    if row is not None:
+        return createRAM(row)
+    token = RAMS_CACHE.token()
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        rows_effected, result = await conn.execute(Solution.GET_RAM, args=(ramID,))
+        if rows_effected == 0:
+            ram = RAM.badRAM()
+        else:
+            ram = createRAM(result.rows[0])
+            RAMS_CACHE.put(ramID, result.rows[0], token)
+        await conn.commit()
+    except Exception:
+        ram = RAM.badRAM()
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ram
+
+
+async def deleteRAM(ramID: int) -> Status:
+    conn = None
+    ret = Status.OK
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        rows_effected, _ = await conn.execute(Solution.DELETE_RAM, args=(ramID,))
+        if rows_effected == 0:
+            ret = Status.NOT_EXISTS
+        await conn.commit()
+        RAMS_CACHE.invalidate(ramID)
+
+    except Exception:
+        ret = Status.ERROR
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ret
+
+
+async def addDiskAndFile(disk: Disk, file: File) -> Status:
+    conn = None
+    ret = Status.OK
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        await conn.execute(Solution.ADD_FILE, args=(file.getFileID(), file.getType(), file.getSize()))
+        rows_effected, _ = await conn.execute(Solution.ADD_DISK,
+                                              args=(disk.getDiskID(), disk.getCompany(), disk.getSpeed(),
+                                                    disk.getFreeSpace(), disk.getCost()))
+        await conn.commit()
+    except DatabaseException.UNIQUE_VIOLATION:
+        ret = Status.ALREADY_EXISTS
+        await conn.rollback()
+
+    except Exception as e:
+        ret = Status.ERROR
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ret
+
+
+async def addFileToDisk(file: File, diskID: int) -> Status:
+    conn = None
+    ret = Status.OK
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        await conn.execute(Solution.TAKE_FILE_SPACE, args=(file.getFileID(), diskID))
+        rows_effected, _ = await conn.execute(Solution.ADD_FILE_TO_DISK, args=(file.getFileID(), diskID))
+        await conn.commit()
+        DISKS_CACHE.invalidate(diskID)
+        if rows_effected == 0:
+            ret = Status.NOT_EXISTS
+
+    except DatabaseException.NOT_NULL_VIOLATION as e:
+        ret = Status.BAD_PARAMS
+        await conn.rollback()
+
+    except DatabaseException.CHECK_VIOLATION as e:
+        ret = Status.BAD_PARAMS
+        await conn.rollback()
+
+    except DatabaseException.UNIQUE_VIOLATION as e:
+        ret = Status.ALREADY_EXISTS
+        await conn.rollback()
+
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        ret = Status.NOT_EXISTS
+        await conn.rollback()
+
+    except Exception as e:
+        ret = Status.ERROR
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ret
+
+
+async def removeFileFromDisk(file: File, diskID: int) -> Status:
+    conn = None
+    ret = Status.OK
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        await conn.execute(Solution.RETURN_FILE_SPACE, args=(file.getFileID(), diskID))
+        rows_effected, _ = await conn.execute(Solution.REMOVE_FILE_FROM_DISK, args=(file.getFileID(), diskID))
+        await conn.commit()
+        DISKS_CACHE.invalidate(diskID)
+    except Exception as e:
+        ret = Status.ERROR
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ret
+
+
+async def addRAMToDisk(ramID: int, diskID: int) -> Status:
+    conn = None
+    ret = Status.OK
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        rows_effected, _ = await conn.execute(Solution.ADD_RAM_TO_DISK, args=(ramID, diskID))
+        if rows_effected == 0:
+            ret = Status.NOT_EXISTS
+        await conn.commit()
+    except DatabaseException.UNIQUE_VIOLATION:
+        ret = Status.ALREADY_EXISTS
+        await conn.rollback()
+
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        ret = Status.NOT_EXISTS
+        await conn.rollback()
+
+    except Exception as e:
+        ret = Status.ERROR
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ret
+
+
+async def removeRAMFromDisk(ramID: int, diskID: int) -> Status:
+    conn = None
+    ret = Status.OK
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        rows_effected, _ = await conn.execute(Solution.REMOVE_RAM_FROM_DISK, args=(ramID, diskID))
+        if rows_effected == 0:
+            ret = Status.NOT_EXISTS
+        await conn.commit()
+    except Exception:
+        ret = Status.ERROR
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return ret
+
+
+async def averageFileSizeOnDisk(diskID: int) -> float:
+    conn = None
+    average = 0
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        _, result = await conn.execute(Solution.AVERAGE_FILE_SIZE_ON_DISK, args=(diskID,))
+        if result.rows[0][0] == None:
+            average = 0
+        else:
+            average = result.rows[0][0]
+        await conn.commit()
+    except Exception as e:
+        average = -1
+    finally:
+        if conn is not None:
+            await conn.close()
+        return average
+
+
+async def diskTotalRAM(diskID: int) -> int:
+    conn = None
+    total = 0
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        _, result = await conn.execute(Solution.DISK_TOTAL_RAM, args=(diskID,))
+        if result.rows[0][0] == None:
+            total = 0
+        else:
+            total = result.rows[0][0]
+        await conn.commit()
+    except Exception as e:
+        total = -1
+        if conn is not None:
+            await conn.rollback()
+    finally:
+        if conn is not None:
+            await conn.close()
+        return total
+
+
+# the disks whose stored RAM total disagrees with the RAMSizeOFDisk aggregate, should always be empty
+async def diskTotalRAMMismatches() -> List[int]:
+    return await queryIDs(Solution.DISK_TOTAL_RAM_MISMATCHES, None, emptyFirst=False)
+
+
+async def getCostForType(type: str) -> int:
+    conn = None
+    cost = 0
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        # a bound parameter would be coerced to TEXT, while the type must already be a string
+        if not isinstance(type, str):
+            raise TypeError("type should be a string")
+        _, result = await conn.execute(Solution.COST_FOR_TYPE, args=(type,))
+        if result.rows[0][0] == None:
+            cost = 0
+        else:
+            cost = result.rows[0][0]
+        await conn.commit()
+    except Exception as e:
+        cost = -1
+    finally:
+        if conn is not None:
+            await conn.close()
+        return cost
+
+
+async def getFilesCanBeAddedToDisk(diskID: int) -> List[int]:
+    return await queryIDs(Solution.FILES_CAN_BE_ADDED_TO_DISK, (diskID,))
+
+
+async def getFilesCanBeAddedToDiskAndRAM(diskID: int) -> List[int]:
+    return await queryIDs(Solution.FILES_CAN_BE_ADDED_TO_DISK_AND_RAM, (diskID,))
+
+
+async def isCompanyExclusive(diskID: int) -> bool:
+    conn = None
+    isExclusive = False
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        _, result = await conn.execute(Solution.COMPANY_EXCLUSIVE, args=(diskID,))
+        if result.rows:
+            isExclusive = result.rows[0][0]
+        await conn.commit()
+    except Exception as e:
+        isExclusive = False
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+        return isExclusive
+
+
+async def getConflictingDisks() -> List[int]:
+    return await queryIDs(Solution.CONFLICTING_DISKS, (0, None))
+
+
+# getConflictingDisks one batch at a time, like Solution.streamConflictingDisks
+async def streamConflictingDisks(batchSize: int = 1000) -> AsyncIterator[int]:
+    lastID = 0
+    while True:
+        conn = None
+        batch = []
+        try:
+            conn = await AsyncConnector.AsyncDBConnector.connect()
+            _, result = await conn.execute(Solution.CONFLICTING_DISKS, args=(lastID, batchSize))
+            batch = [x[0] for x in result.rows]
+            await conn.commit()
+        except Exception as e:
+            batch = []
+        finally:
+            if conn is not None:
+                await conn.close()
+        for diskID in batch:
+            yield diskID
+        if len(batch) < batchSize:
+            return
+        lastID = batch[-1]
+
+
+async def mostAvailableDisks() -> List[int]:
+    return await queryIDs(Solution.MOST_AVAILABLE_DISKS, None)
+
+
+async def getCloseFiles(fileID: int) -> List[int]:
+    return await queryIDs(Solution.CLOSE_FILES, (fileID,))
+
+
+# the ids in the first column of the statement's rows, [] if it fails. like the Solution.py queries it
+# returns, a first row with a NULL id means no rows unless emptyFirst is False
+async def queryIDs(statement, args: tuple, emptyFirst=True) -> List[int]:
+    conn = None
+    ids = []
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        _, result = await conn.execute(statement, args=args)
+        if emptyFirst and result.rows[0][0] == None:
+            ids = []
+        else:
+            ids = [x[0] for x in result.rows]
+        await conn.commit()
+    except Exception as e:
+        ids = []
+    finally:
+        if conn is not None:
+            await conn.close()
+        return ids
+
+
+# ========= BULK API ===========
+# the bulk functions of Solution.py, staged the same way. AsyncDBConnector.copy fills the staging tables
+# with multi-row INSERTs, a value that does not fit its column fails the chunk as COPY would
+
+async def addFiles(files: Iterable[File]) -> List[Status]:
+    return await bulkAdd(files, "files_staging", ["id", "type", "size_needed"],
+                         lambda file: (file.getFileID(), file.getType(), file.getSize()),
+                         Solution.ADD_STAGED_FILES, Solution.ADD_FILE)
+
+
+async def addDisks(disks: Iterable[Disk]) -> List[Status]:
+    return await bulkAdd(disks, "disks_staging", ["id", "company", "speed", "free_space", "cost"],
+                         lambda disk: (disk.getDiskID(), disk.getCompany(), disk.getSpeed(), disk.getFreeSpace(),
+                                       disk.getCost()),
+                         Solution.ADD_STAGED_DISKS, Solution.ADD_DISK)
+
+
+async def addRAMs(rams: Iterable[RAM]) -> List[Status]:
+    return await bulkAdd(rams, "rams_staging", ["id", "size", "company"],
+                         lambda ram: (ram.getRamID(), ram.getSize(), ram.getCompany()),
+                         Solution.ADD_STAGED_RAMS, Solution.ADD_RAM)
+
+
+# places all pairs in one transaction, like Solution.addFilesToDisk
+async def addFilesToDisk(placements: Iterable[Tuple[File, int]]) -> List[Status]:
+    statuses, rows = placementRows(placements)
+    if not rows:
+        return statuses
+
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        await conn.execute(Solution.PLACEMENTS_STAGING)
+        await conn.copy("placements_staging", ["seq", "file_id", "disk_id"], rows)
+        await conn.execute(Solution.LOCK_STAGED_DISKS)
+        _, result = await conn.execute(Solution.CLASSIFY_STAGED_PLACEMENTS)
+        placementStatuses(statuses, result.rows)
+        await conn.execute(Solution.PLACE_STAGED_FILES)
+        await conn.commit()
+        for seq, _, diskID in rows:
+            if statuses[seq] == Status.OK:
+                DISKS_CACHE.invalidate(diskID)
+    except DatabaseException.CHECK_VIOLATION:
+        await conn.rollback()
+        statuses = unplacedStatuses(statuses, Status.BAD_PARAMS)
+
+    except Exception as e:
+        if conn is not None:
+            await conn.rollback()
+        statuses = unplacedStatuses(statuses, Status.ERROR)
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return statuses
+
+
+# one object per requested id in the same order, File.badFile() for ids that do not exist
+async def getFilesByIDs(fileIDs: Iterable[int]) -> List[File]:
+    return await getManyByIDs(fileIDs, Solution.GET_FILES, createFile, File.badFile)
+
+
+async def getDisksByIDs(diskIDs: Iterable[int]) -> List[Disk]:
+    return await getManyByIDs(diskIDs, Solution.GET_DISKS, createDisk, Disk.badDisk)
+
+
+async def getRAMsByIDs(ramIDs: Iterable[int]) -> List[RAM]:
+    return await getManyByIDs(ramIDs, Solution.GET_RAMS, createRAM, RAM.badRAM)
+
+
+async def areCompaniesExclusive(diskIDs: Iterable[int]) -> List[bool]:
+    return await getManyByIDs(diskIDs, Solution.COMPANIES_EXCLUSIVE, lambda row: row[1], lambda: False)
+
+
+# ========= BULK AUX FUNCS ===========
+
+async def bulkAdd(items: Iterable, staging: str, columns: List[str], toRow, addStaged, addOne) -> List[Status]:
+    statuses = []
+    items = iter(items)
+    chunk = []
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        for chunk in chunks(items, Solution.BULK_CHUNK_SIZE):
+            statuses += await addChunk(conn, chunk, staging, columns, toRow, addStaged, addOne)
+    except Exception as e:
+        # the connection is gone, nothing else can be added
+        statuses += [Status.ERROR] * (len(chunk) + sum(1 for _ in items))
+    finally:
+        if conn is not None:
+            await conn.close()
+    return statuses
+
+
+async def addChunk(conn, chunk: list, staging: str, columns: List[str], toRow, addStaged, addOne) -> List[Status]:
+    statuses, rows = chunkRows(chunk, toRow)
+    try:
+        await conn.execute(Solution.STAGING_TABLES[staging])
+        await conn.copy(staging, ["seq"] + columns, rows)
+        _, result = await conn.execute(addStaged)
+        stagedStatuses(statuses, result.rows)
+        await conn.commit()
+    except Exception as e:
+        # values the staging table cannot hold, add the rows one by one to find the failing ones
+        await conn.rollback()
+        for row in rows:
+            statuses[row[0]] = await addInSavepoint(conn, addOne, row[1:])
+        await conn.commit()
+    return statuses
+
+
+async def addInSavepoint(conn, statement, row: tuple) -> Status:
+    await conn.execute("SAVEPOINT bulk_row")
+    try:
+        await conn.execute(statement, args=row)
+        ret = Status.OK
+    except Exception as e:
+        ret = addStatus(e)
+    if ret == Status.OK:
+        await conn.execute("RELEASE SAVEPOINT bulk_row")
+    else:
+        await conn.execute("ROLLBACK TO SAVEPOINT bulk_row")
+    return ret
+
+
+# fetches all ids with a single = ANY(array) query, like Solution.getManyByIDs
+async def getManyByIDs(ids: Iterable[int], statement, create, bad) -> list:
+    ids = list(ids)
+    found = {}
+    keys = lookupKeys(ids)
+    conn = None
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        if keys:
+            _, result = await conn.execute(statement, args=(keys,))
+            found = {row[0]: row for row in result.rows}
+        await conn.commit()
+    except Exception:
+        found = {}
+        if conn is not None:
+            await conn.rollback()
+
+    finally:
+        if conn is not None:
+            await conn.close()
+    return resultsByIDs(ids, found, create, bad)
+
+
+# ========= STREAMING API ===========
+# whole tables read on a cursor in one transaction, batchSize rows at a time, like the Solution.py streams
+
+async def streamFiles(batchSize: int = 1000) -> AsyncIterator[File]:
+    async for file in streamRows(Solution.ALL_FILES, (), createFile, batchSize):
+        yield file
+
+
+async def streamDisks(batchSize: int = 1000) -> AsyncIterator[Disk]:
+    async for disk in streamRows(Solution.ALL_DISKS, (), createDisk, batchSize):
+        yield disk
+
+
+async def streamRAMs(batchSize: int = 1000) -> AsyncIterator[RAM]:
+    async for ram in streamRows(Solution.ALL_RAMS, (), createRAM, batchSize):
+        yield ram
+
+
+# the files placed on the disk
+async def streamFilesOfDisk(diskID: int, batchSize: int = 1000) -> AsyncIterator[File]:
+    async for file in streamRows(Solution.FILES_OF_DISK, (diskID,), createFile, batchSize):
+        yield file
+
+
+async def streamRows(statement, args: tuple, create, batchSize: int) -> AsyncIterator:
+    conn = None
+    started = False
+    try:
+        conn = await AsyncConnector.AsyncDBConnector.connect()
+        async for row in conn.stream(statement, args=args, batchSize=batchSize):
+            started = True
+            yield create(row)
+        await conn.commit()
+    except Exception:
+        if started:
+            raise  # after the connection is closed below
+    finally:
+        if conn is not None:
+            await conn.close()
+
+
+# ========= BACKEND ===========
+# the in-memory engine does no I/O, its functions are called directly
+
+def asyncFunction(function):
+    @functools.wraps(function)
+    async def call(*args, **kwargs):
+        return function(*args, **kwargs)
+
+    return call
+
+
+def asyncStream(function):
+    @functools.wraps(function)
+    async def call(*args, **kwargs):
+        for item in function(*args, **kwargs):
+            yield item
+
+    return call
+
+
+if Solution.backendEngine() == 'memory':
+    import MemorySolution
+
+    for name in MemorySolution.API:
+        if name not in ("createTables", "clearTables", "dropTables", "tablesExist"):
+            wrap = asyncStream if name.startswith("stream") else asyncFunction
+            globals()[name] = wrap(getattr(MemorySolution, name))
@@ -0,0 +1,101 @@
+import itertools
+import random
+from types import SimpleNamespace
+from typing import Iterator, Tuple
+from Business.File import File
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+# a deterministic synthetic catalog of files, disks, RAMs and placements.
+# every part is drawn from its own random stream seeded by (seed, part), so a part can be generated again
+# (e.g. the placements without the files) and gives the same rows for the same seed and scale.
+# rows are generated lazily, a 10M catalog is never held in memory
+
+# file types and companies with their relative weights
+TYPES = [("mp3", 30), ("jpg", 25), ("wav", 10), ("png", 10), ("pdf", 10), ("mp4", 8), ("txt", 7)]
+COMPANIES = [("DELL", 30), ("HP", 25), ("Seagate", 15), ("WD", 15), ("Kingston", 10), ("Samsung", 5)]
+RAM_SIZES = [(4, 20), (8, 35), (16, 30), (32, 10), (64, 5)]
+
+# named scales, the number of files
+SCALES = {"1k": 1000, "10k": 10000, "100k": 100000, "1m": 1000000, "10m": 10000000}
+
+FILE_SIZE_LIMIT = 10 ** 6
+PLACED_FILES = 0.6   # files placed on some disk
+SECOND_DISK = 0.15   # placed files that are on a second disk too, those disks conflict
+PLACED_RAMS = 0.7    # RAMs placed on some disk
+HOT_DISKS = 1.25     # skew of the placements toward the low disk ids, 1 for none
+
+
+# "10k", "1m" or a plain number of files
+def parseScale(scale) -> int:
+    if isinstance(scale, int):
+        return scale
+    return SCALES.get(scale.strip().lower()) or int(scale)
+
+
+# the sizes of a catalog with the given number of files
+def catalog(scale, seed=236363) -> SimpleNamespace:
+    files = parseScale(scale)
+    if files < 1:
+        raise ValueError("A catalog needs at least one file")
+    return SimpleNamespace(seed=seed, files=files, disks=max(files // 100, 10), rams=max(files // 20, 10))
+
+
+def stream(spec: SimpleNamespace, part: str) -> random.Random:
+    return random.Random("{}-{}".format(spec.seed, part))
+
+
+def weighted(rand: random.Random, choices: list):
+    values, weights = zip(*choices)
+    return rand.choices(values, cum_weights=list(itertools.accumulate(weights)))[0]
+
+
+# the low disks are hot: disk 1 takes ~disks ** (1 - 1 / HOT_DISKS) times the average placements
+def hotDisk(rand: random.Random, disks: int) -> int:
+    return int(disks * rand.random() ** HOT_DISKS) + 1
+
+
+# sizes are log-normal, a median of ~20 with a long tail
+def files(spec: SimpleNamespace) -> Iterator[File]:
+    rand = stream(spec, "files")
+    for fileID in range(1, spec.files + 1):
+        size = min(int(rand.lognormvariate(3, 1.5)), FILE_SIZE_LIMIT)
+        yield File(fileID, weighted(rand, TYPES), size)
+
+
+# the free space is large enough for the hottest disk to take all its placements,
+# faster disks cost more
+def disks(spec: SimpleNamespace) -> Iterator[Disk]:
+    rand = stream(spec, "disks")
+    for diskID in range(1, spec.disks + 1):
+        speed = min(max(int(rand.triangular(1, 11, 5)), 1), 10)
+        yield Disk(diskID, weighted(rand, COMPANIES), speed, rand.randint(10 ** 8, 10 ** 9),
+                   speed * 2 + rand.randint(0, 5))
+
+
+def rams(spec: SimpleNamespace) -> Iterator[RAM]:
+    rand = stream(spec, "rams")
+    for ramID in range(1, spec.rams + 1):
+        yield RAM(ramID, weighted(rand, COMPANIES), weighted(rand, RAM_SIZES))
+
+
+# (file, diskID) pairs, the files hold only their id
+def filePlacements(spec: SimpleNamespace) -> Iterator[Tuple[File, int]]:
+    rand = stream(spec, "file-placements")
+    for fileID in range(1, spec.files + 1):
+        if rand.random() >= PLACED_FILES:
+            continue
+        diskID = hotDisk(rand, spec.disks)
+        yield File(fileID), diskID
+        if rand.random() < SECOND_DISK:
+            other = hotDisk(rand, spec.disks)
+            if other != diskID:
+                yield File(fileID), other
+
+
+# (ramID, diskID) pairs, a RAM is on one disk at most
+def ramPlacements(spec: SimpleNamespace) -> Iterator[Tuple[int, int]]:
+    rand = stream(spec, "ram-placements")
+    for ramID in range(1, spec.rams + 1):
+        if rand.random() < PLACED_RAMS:
+            yield ramID, hotDisk(rand, spec.disks)
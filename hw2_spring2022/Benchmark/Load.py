@@ -0,0 +1,235 @@
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from psycopg2 import errorcodes
+from types import SimpleNamespace
+import Solution
+import Utility.DBConnector as Connector
+from Utility.Status import Status
+from Business.File import File
+from Benchmark import Catalog, Runner
+from Benchmark.Timing import histogram, summarize
+
+# drives a read/write mix against the Solution.py API from many clients at once, the writes aimed at a few
+# hot disks so that the clients contend for the same Disks rows. reports the throughput, the latency histogram
+# and outcomes of every operation, the database errors (serialization failures, deadlocks, ...) and an
+# estimate of the time spent waiting for locks. loads a catalog first (see Catalog.py) unless --no-load:
+#   python -m Benchmark.Load [--clients 8] [--mode thread|process] [--duration 10]
+#                            [--mix getDiskByID=30,addFileToDisk=20,...] [--hot-disks 2] [--scale 10k]
+#                            [--seed N] [--no-load] [--keep] [--output FILE]
+
+DEFAULT_MIX = "getDiskByID=30,getFileByID=20,getFilesCanBeAddedToDisk=10,addFileToDisk=20,removeFileFromDisk=20"
+BATCH = 10  # placements per addFilesToDisk call
+
+
+def hotDisk(rand: random.Random, load: SimpleNamespace) -> int:
+    return rand.randint(1, load.hotDisks)
+
+
+def someFile(rand: random.Random, load: SimpleNamespace) -> File:
+    return File(rand.randint(1, load.spec.files))
+
+
+# the operations a mix can name, each makes one call with random arguments
+OPERATIONS = {
+    "getFileByID": lambda rand, load: Solution.getFileByID(rand.randint(1, load.spec.files)),
+    "getDiskByID": lambda rand, load: Solution.getDiskByID(hotDisk(rand, load)),
+    "getRAMByID": lambda rand, load: Solution.getRAMByID(rand.randint(1, load.spec.rams)),
+    "averageFileSizeOnDisk": lambda rand, load: Solution.averageFileSizeOnDisk(hotDisk(rand, load)),
+    "diskTotalRAM": lambda rand, load: Solution.diskTotalRAM(hotDisk(rand, load)),
+    "getFilesCanBeAddedToDisk": lambda rand, load: Solution.getFilesCanBeAddedToDisk(hotDisk(rand, load)),
+    "getFilesCanBeAddedToDiskAndRAM":
+        lambda rand, load: Solution.getFilesCanBeAddedToDiskAndRAM(hotDisk(rand, load)),
+    "isCompanyExclusive": lambda rand, load: Solution.isCompanyExclusive(hotDisk(rand, load)),
+    "getCloseFiles": lambda rand, load: Solution.getCloseFiles(rand.randint(1, load.spec.files)),
+    "getConflictingDisks": lambda rand, load: Solution.getConflictingDisks(),
+    "mostAvailableDisks": lambda rand, load: Solution.mostAvailableDisks(),
+    "addFileToDisk": lambda rand, load: Solution.addFileToDisk(someFile(rand, load), hotDisk(rand, load)),
+    "removeFileFromDisk": lambda rand, load: Solution.removeFileFromDisk(someFile(rand, load), hotDisk(rand, load)),
+    "addRAMToDisk": lambda rand, load: Solution.addRAMToDisk(rand.randint(1, load.spec.rams), hotDisk(rand, load)),
+    "removeRAMFromDisk":
+        lambda rand, load: Solution.removeRAMFromDisk(rand.randint(1, load.spec.rams), hotDisk(rand, load)),
+    "addFilesToDisk": lambda rand, load: Solution.addFilesToDisk([(someFile(rand, load), hotDisk(rand, load))
+                                                                  for _ in range(BATCH)]),
+}
+
+
+# "name=weight,..." into {name: weight}
+def parseMix(mix: str) -> dict:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError("Unknown operation " + name)
+        weights[name] = float(weight) if weight else 1.0
+    return weights
+
+
+# the outcome of a call: the names of the statuses it returned, or "returned" for the queries
+def outcomes(result) -> list:
+    if isinstance(result, Status):
+        return [result.name]
+    if isinstance(result, list) and result and all(isinstance(item, Status) for item in result):
+        return [item.name for item in result]
+    return ["returned"]
+
+
+# one client: calls operations picked by weight until the deadline, returns the latencies and outcomes per operation
+def client(seed: str, load: SimpleNamespace, mix: dict, deadline: float) -> dict:
+    rand = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    latencies = {name: [] for name in names}
+    results = {name: Counter() for name in names}
+    while time.monotonic() < deadline:
+        name = rand.choices(names, weights)[0]
+        start = time.perf_counter()
+        result = OPERATIONS[name](rand, load)
+        latencies[name].append(time.perf_counter() - start)
+        results[name].update(outcomes(result))
+    return {"latencies": latencies, "outcomes": results}
+
+
+# runs clients as threads of this process (a process of --mode process runs one).
+# returns what the clients returned and the database errors of this process while they ran
+def runClients(first: int, count: int, load: SimpleNamespace, mix: dict, duration: float) -> dict:
+    Connector.DBConnector.resetErrorStats()
+    deadline = time.monotonic() + duration
+    returned = [None] * count
+
+    def run(index: int):
+        returned[index] = client("{}-client-{}".format(load.spec.seed, first + index), load, mix, deadline)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"clients": returned, "errors": Connector.DBConnector.errorStats()}
+
+
+# samples how many sessions of the database wait for a lock, every interval seconds until stopped.
+# the lock wait estimate is the sum of waiting sessions times the time since the previous sample
+class LockMonitor(threading.Thread):
+    def __init__(self, interval=0.01):
+        super().__init__(name="LockMonitor", daemon=True)
+        self.interval = interval
+        self.samples = 0
+        self.waited = 0.0
+        self.maxWaiting = 0
+        self.__stopped = threading.Event()
+
+    def stop(self):
+        self.__stopped.set()
+        self.join()
+
+    def run(self):
+        conn = Connector.DBConnector(pooled=False)
+        try:
+            conn.connection.autocommit = True
+            previous = time.monotonic()
+            while not self.__stopped.wait(self.interval):
+                _, result = conn.execute("""SELECT COUNT(*) FROM pg_stat_activity
+                                            WHERE datname = current_database() AND wait_event_type = 'Lock'""")
+                now = time.monotonic()
+                waiting = result.rows[0][0]
+                self.samples += 1
+                self.waited += waiting * (now - previous)
+                self.maxWaiting = max(self.maxWaiting, waiting)
+                previous = now
+        finally:
+            conn.close()
+
+    def report(self) -> dict:
+        return {"seconds": round(self.waited, 3), "max_waiting": self.maxWaiting,
+                "samples": self.samples}
+
+
+# "serialization_failure" for 40001, the SQLSTATE itself if psycopg2 does not know it
+def errorName(code: str) -> str:
+    try:
+        return errorcodes.lookup(code).lower()
+    except KeyError:
+        return code
+
+
+# runs the clients in threads or processes for duration seconds and reports on them.
+# clients in threads share the pool of this process, it should have a connection for each (see main)
+def run(load: SimpleNamespace, mix: dict, clients: int, mode="thread", duration=10.0) -> dict:
+    monitor = LockMonitor() if Solution.backendEngine() != 'memory' else None
+    if monitor is not None:
+        monitor.start()
+    start = time.monotonic()
+    try:
+        if mode == "process":
+            # spawned processes start with no connections, pools or caches of this process
+            with multiprocessing.get_context("spawn").Pool(clients) as pool:
+                runs = pool.starmap(runClients, [(index, 1, load, mix, duration) for index in range(clients)])
+        else:
+            runs = [runClients(0, clients, load, mix, duration)]
+    finally:
+        elapsed = time.monotonic() - start
+        if monitor is not None:
+            monitor.stop()
+
+    operations, errors = {}, Counter()
+    for result in runs:
+        for code, count in result["errors"].items():
+            errors[errorName(code)] += count
+    returned = [returned for result in runs for returned in result["clients"]]
+    calls = 0
+    for name in mix:
+        latencies = [latency for client in returned for latency in client["latencies"][name]]
+        results = sum((client["outcomes"][name] for client in returned), Counter())
+        calls += len(latencies)
+        operations[name] = dict(summarize(latencies), histogram=histogram(latencies), outcomes=dict(results))
+    return {"clients": clients, "mode": mode, "duration": round(elapsed, 3), "hot_disks": load.hotDisks,
+            "mix": mix, "backend": Solution.backendEngine(), "throughput_per_s": round(calls / elapsed, 2),
+            "operations": operations, "database_errors": dict(errors),
+            "lock_wait": monitor.report() if monitor is not None else None}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Drive concurrent clients against the Solution.py API")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight,... (operations: {})".format(
+        ", ".join(OPERATIONS)))
+    parser.add_argument("--hot-disks", type=int, default=2, help="the writes go to disks 1..N")
+    parser.add_argument("--scale", default="10k", help="catalog size, see Benchmark.Runner")
+    parser.add_argument("--seed", type=int, default=236363)
+    parser.add_argument("--no-load", action="store_true", help="use the catalog already loaded with this scale")
+    parser.add_argument("--keep", action="store_true", help="keep the catalog instead of dropping the tables")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    options = parser.parse_args(argv)
+
+    load = SimpleNamespace(spec=Catalog.catalog(options.scale, options.seed), hotDisks=max(options.hot_disks, 1))
+    if options.mode == "thread":
+        Connector.DBConnector.configurePool(maxSize=max(options.clients, 1))
+    if not options.no_load:
+        Solution.dropTables()
+        Solution.createTables()
+        Runner.load(load.spec)
+    try:
+        report = run(load, parseMix(options.mix), max(options.clients, 1), options.mode, options.duration)
+    finally:
+        if not options.keep:
+            Solution.dropTables()
+
+    text = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, "w") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
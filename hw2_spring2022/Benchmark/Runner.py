@@ -0,0 +1,207 @@
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from types import SimpleNamespace
+import Solution
+import Utility.DBConnector as Connector
+from Utility.Status import Status
+from Business.File import File
+from Business.RAM import RAM
+from Business.Disk import Disk
+from Benchmark import Catalog
+from Benchmark.Timing import summarize, timeCalls
+
+# loads a synthetic catalog (see Catalog.py) and times every public function of Solution.py on it,
+# the report is JSON so runs can be compared. the Solution.py tables are dropped and created again,
+# run it against a scratch database:
+#   python -m Benchmark.Runner [--scale 10k] [--seed N] [--calls N] [--full-calls N] [--batch N]
+#                              [--output FILE] [--keep]
+
+
+# adds the catalog with the bulk API, returns the seconds and rows added of every part
+def load(spec: SimpleNamespace) -> dict:
+    report = {}
+
+    def timed(part: str, add):
+        start = time.perf_counter()
+        statuses = add()
+        report[part] = {"seconds": round(time.perf_counter() - start, 3),
+                        "rows": sum(1 for status in statuses if status == Status.OK)}
+
+    timed("files", lambda: Solution.addFiles(Catalog.files(spec)))
+    timed("disks", lambda: Solution.addDisks(Catalog.disks(spec)))
+    timed("rams", lambda: Solution.addRAMs(Catalog.rams(spec)))
+    # addFilesToDisk is one transaction, so it is given a chunk at a time
+    placements = Catalog.filePlacements(spec)
+    chunks = iter(lambda: list(itertools.islice(placements, Solution.BULK_CHUNK_SIZE)), [])
+    timed("file_placements", lambda: [status for chunk in chunks for status in Solution.addFilesToDisk(chunk)])
+    timed("ram_placements", lambda: [Solution.addRAMToDisk(ramID, diskID)
+                                     for ramID, diskID in Catalog.ramPlacements(spec)])
+    if Solution.backendEngine() != 'memory':
+        analyze()
+    return report
+
+
+def analyze():
+    conn = Connector.DBConnector()
+    try:
+        conn.connection.autocommit = True
+        conn.execute("ANALYZE")
+    finally:
+        conn.connection.autocommit = False
+        conn.close()
+
+
+# ids above the catalog, for the rows the benchmark adds and removes again
+class FreshIDs:
+    def __init__(self, spec: SimpleNamespace):
+        self.next = {"files": spec.files + 1, "disks": spec.disks + 1, "rams": spec.rams + 1}
+
+    def take(self, table: str, count: int) -> list:
+        first = self.next[table]
+        self.next[table] += count
+        return list(range(first, first + count))
+
+
+# whether a call did not do what it was asked to, for the calls that return a Status or a list of them
+def failed(result) -> bool:
+    if isinstance(result, list):
+        return any(isinstance(item, Status) and item != Status.OK for item in result)
+    return isinstance(result, Status) and result != Status.OK
+
+
+# times every public function, calls times each (fullCalls times for the ones reading whole tables,
+# batch items per call for the bulk ones). the catalog is left as it was loaded
+def benchmark(spec: SimpleNamespace, calls=200, fullCalls=5, batch=100) -> dict:
+    rand = random.Random("{}-benchmark".format(spec.seed))
+    fresh = FreshIDs(spec)
+    results = {}
+
+    def record(name: str, function, argsList: list, items=1):
+        latencies, outcomes = timeCalls(function, argsList)
+        results[name] = summarize(latencies, items)
+        results[name]["failed"] = sum(1 for outcome in outcomes if failed(outcome))
+
+    def some(table: str, count=calls) -> list:
+        return [(rand.randint(1, getattr(spec, table)),) for _ in range(count)]
+
+    def newFiles(count: int) -> list:
+        return [File(fileID, "mp3", 10) for fileID in fresh.take("files", count)]
+
+    def newDisks(count: int) -> list:
+        return [Disk(diskID, "DELL", 5, 10 ** 6, 10) for diskID in fresh.take("disks", count)]
+
+    def newRAMs(count: int) -> list:
+        return [RAM(ramID, "DELL", 8) for ramID in fresh.take("rams", count)]
+
+    # CRUD, every added row is deleted again
+    files, disks, rams = newFiles(calls), newDisks(calls), newRAMs(calls)
+    record("addFile", Solution.addFile, [(file,) for file in files])
+    record("getFileByID", Solution.getFileByID, some("files"))
+    record("deleteFile", Solution.deleteFile, [(file,) for file in files])
+    record("addDisk", Solution.addDisk, [(disk,) for disk in disks])
+    record("getDiskByID", Solution.getDiskByID, some("disks"))
+    record("deleteDisk", Solution.deleteDisk, [(disk.getDiskID(),) for disk in disks])
+    record("addRAM", Solution.addRAM, [(ram,) for ram in rams])
+    record("getRAMByID", Solution.getRAMByID, some("rams"))
+    record("deleteRAM", Solution.deleteRAM, [(ram.getRamID(),) for ram in rams])
+    pairs = list(zip(newDisks(calls), newFiles(calls)))
+    record("addDiskAndFile", Solution.addDiskAndFile, pairs)
+    for disk, file in pairs:
+        Solution.deleteFile(file)
+        Solution.deleteDisk(disk.getDiskID())
+
+    # placements of rows added for the purpose, on disks of the catalog
+    files, rams = newFiles(calls), newRAMs(calls)
+    Solution.addFiles(files)
+    Solution.addRAMs(rams)
+    filePairs = [(file, rand.randint(1, spec.disks)) for file in files]
+    ramPairs = [(ram.getRamID(), rand.randint(1, spec.disks)) for ram in rams]
+    record("addFileToDisk", Solution.addFileToDisk, filePairs)
+    record("removeFileFromDisk", Solution.removeFileFromDisk, filePairs)
+    record("addRAMToDisk", Solution.addRAMToDisk, ramPairs)
+    record("removeRAMFromDisk", Solution.removeRAMFromDisk, ramPairs)
+    chunks = [filePairs[i:i + batch] for i in range(0, len(filePairs), batch)]
+    record("addFilesToDisk", Solution.addFilesToDisk, [(chunk,) for chunk in chunks], batch)
+    for file, diskID in filePairs:
+        Solution.removeFileFromDisk(file, diskID)
+    for file in files:
+        Solution.deleteFile(file)
+    for ram in rams:
+        Solution.deleteRAM(ram.getRamID())
+
+    # queries
+    record("averageFileSizeOnDisk", Solution.averageFileSizeOnDisk, some("disks"))
+    record("diskTotalRAM", Solution.diskTotalRAM, some("disks"))
+    record("getCostForType", Solution.getCostForType,
+           [(Catalog.weighted(rand, Catalog.TYPES),) for _ in range(calls)])
+    record("getFilesCanBeAddedToDisk", Solution.getFilesCanBeAddedToDisk, some("disks"))
+    record("getFilesCanBeAddedToDiskAndRAM", Solution.getFilesCanBeAddedToDiskAndRAM, some("disks"))
+    record("isCompanyExclusive", Solution.isCompanyExclusive, some("disks"))
+    record("getCloseFiles", Solution.getCloseFiles, some("files"))
+    record("diskTotalRAMMismatches", Solution.diskTotalRAMMismatches, [()] * fullCalls)
+    record("getConflictingDisks", Solution.getConflictingDisks, [()] * fullCalls)
+    record("streamConflictingDisks", lambda: sum(1 for _ in Solution.streamConflictingDisks()), [()] * fullCalls)
+    record("mostAvailableDisks", Solution.mostAvailableDisks, [()] * fullCalls)
+    record("streamFilesOfDisk", lambda diskID: sum(1 for _ in Solution.streamFilesOfDisk(diskID)), some("disks"))
+    for name, stream in [("streamFiles", Solution.streamFiles), ("streamDisks", Solution.streamDisks),
+                         ("streamRAMs", Solution.streamRAMs)]:
+        record(name, lambda stream=stream: sum(1 for _ in stream()), [()] * fullCalls)
+
+    # bulk API, batch rows per call
+    batches = max(calls // batch, 1)
+    for name, table, getMany in [("getFilesByIDs", "files", Solution.getFilesByIDs),
+                                 ("getDisksByIDs", "disks", Solution.getDisksByIDs),
+                                 ("getRAMsByIDs", "rams", Solution.getRAMsByIDs),
+                                 ("areCompaniesExclusive", "disks", Solution.areCompaniesExclusive)]:
+        record(name, getMany, [([ids[0] for ids in some(table, batch)],) for _ in range(batches)], batch)
+    files = [newFiles(batch) for _ in range(batches)]
+    disks = [newDisks(batch) for _ in range(batches)]
+    rams = [newRAMs(batch) for _ in range(batches)]
+    record("addFiles", Solution.addFiles, [(chunk,) for chunk in files], batch)
+    record("addDisks", Solution.addDisks, [(chunk,) for chunk in disks], batch)
+    record("addRAMs", Solution.addRAMs, [(chunk,) for chunk in rams], batch)
+    for file in itertools.chain.from_iterable(files):
+        Solution.deleteFile(file)
+    for disk in itertools.chain.from_iterable(disks):
+        Solution.deleteDisk(disk.getDiskID())
+    for ram in itertools.chain.from_iterable(rams):
+        Solution.deleteRAM(ram.getRamID())
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Time the Solution.py API on a synthetic catalog")
+    parser.add_argument("--scale", default="10k", help="number of files: 1k, 10k, 100k, 1m, 10m or a number")
+    parser.add_argument("--seed", type=int, default=236363)
+    parser.add_argument("--calls", type=int, default=200, help="calls per function")
+    parser.add_argument("--full-calls", type=int, default=5, help="calls per function reading whole tables")
+    parser.add_argument("--batch", type=int, default=100, help="rows per call of the bulk functions")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--keep", action="store_true", help="keep the catalog instead of dropping the tables")
+    options = parser.parse_args(argv)
+
+    spec = Catalog.catalog(options.scale, options.seed)
+    Solution.dropTables()
+    Solution.createTables()
+    try:
+        report = {"catalog": vars(spec), "backend": Solution.backendEngine(), "load": load(spec),
+                  "functions": benchmark(spec, options.calls, options.full_calls, options.batch)}
+    finally:
+        if not options.keep:
+            Solution.dropTables()
+
+    text = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, "w") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
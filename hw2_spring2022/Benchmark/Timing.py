@@ -0,0 +1,54 @@
+import bisect
+import math
+import time
+
+# latency samples are in seconds, the summaries in milliseconds
+
+
+# nearest-rank percentile of samples sorted ascending
+def percentile(ordered: list, p: float) -> float:
+    if not ordered:
+        return None
+    return ordered[min(max(math.ceil(p / 100 * len(ordered)) - 1, 0), len(ordered) - 1)]
+
+
+# calls count, p50/p95/p99/mean/max latency and throughput (calls per second of the summed latencies).
+# items is the number of rows each call handles, for bulk calls
+def summarize(latencies: list, items=1) -> dict:
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    toMs = lambda seconds: None if seconds is None else round(seconds * 1000, 4)
+    summary = {"calls": len(ordered),
+               "p50_ms": toMs(percentile(ordered, 50)),
+               "p95_ms": toMs(percentile(ordered, 95)),
+               "p99_ms": toMs(percentile(ordered, 99)),
+               "mean_ms": toMs(total / len(ordered) if ordered else None),
+               "max_ms": toMs(ordered[-1] if ordered else None),
+               "throughput_per_s": round(len(ordered) / total, 2) if total > 0 else None}
+    if items != 1:
+        summary["items_per_s"] = round(len(ordered) * items / total, 2) if total > 0 else None
+    return summary
+
+
+# calls function once per argument tuple, returns the latencies and the results
+def timeCalls(function, argsList: list) -> (list, list):
+    latencies, results = [], []
+    for args in argsList:
+        start = time.perf_counter()
+        result = function(*args)
+        latencies.append(time.perf_counter() - start)
+        results.append(result)
+    return latencies, results
+
+
+# upper bounds (ms) of the latency histogram buckets, the last bucket takes everything slower
+HISTOGRAM_BOUNDS_MS = [0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+# calls per latency bucket, keyed "<=<bound>ms" and "><last bound>ms", empty buckets left out
+def histogram(latencies: list, bounds=HISTOGRAM_BOUNDS_MS) -> dict:
+    counts = [0] * (len(bounds) + 1)
+    for latency in latencies:
+        counts[bisect.bisect_left(bounds, latency * 1000)] += 1
+    labels = ["<={}ms".format(bound) for bound in bounds] + [">{}ms".format(bounds[-1])]
+    return {label: count for label, count in zip(labels, counts) if count}
@@ -0,0 +1,163 @@
+import argparse
+import random
+import sys
+from types import SimpleNamespace
+import Solution
+import Utility.DBConnector as Connector
+from Business.File import File
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+# runs EXPLAIN (ANALYZE, BUFFERS) on every Solution.py statement against a generated dataset and reports
+# the sequential scans left in their plans.
+# the Solution.py tables are dropped and created again, run it against a scratch database:
+#   python IndexAdvisor.py [--files N] [--disks N] [--rams N] [--keep]
+
+# the arguments of every statement, from the sample ids of the dataset (see loadDataset)
+STATEMENTS = [
+    (Solution.ADD_FILE, lambda s: (s.newFile, "wav", 1)),
+    (Solution.GET_FILE, lambda s: (s.file,)),
+    (Solution.FREE_SPACE_OF_DELETED_FILE, lambda s: (s.file,)),
+    (Solution.DELETE_FILE, lambda s: (s.file,)),
+    (Solution.ADD_DISK, lambda s: (s.newDisk, "DELL", 1, 10, 1)),
+    (Solution.GET_DISK, lambda s: (s.disk,)),
+    (Solution.DELETE_DISK, lambda s: (s.disk,)),
+    (Solution.ADD_RAM, lambda s: (s.newRam, 1, "Kingston")),
+    (Solution.GET_RAM, lambda s: (s.ram,)),
+    (Solution.DELETE_RAM, lambda s: (s.ram,)),
+    (Solution.TAKE_FILE_SPACE, lambda s: (s.freeFile, s.disk)),
+    (Solution.ADD_FILE_TO_DISK, lambda s: (s.freeFile, s.disk)),
+    (Solution.RETURN_FILE_SPACE, lambda s: (s.file, s.disk)),
+    (Solution.REMOVE_FILE_FROM_DISK, lambda s: (s.file, s.disk)),
+    (Solution.ADD_RAM_TO_DISK, lambda s: (s.freeRam, s.disk)),
+    (Solution.REMOVE_RAM_FROM_DISK, lambda s: (s.ram, s.disk)),
+    (Solution.AVERAGE_FILE_SIZE_ON_DISK, lambda s: (s.disk,)),
+    (Solution.DISK_TOTAL_RAM, lambda s: (s.disk,)),
+    (Solution.DISK_TOTAL_RAM_MISMATCHES, lambda s: ()),
+    (Solution.COST_FOR_TYPE, lambda s: ("wav",)),
+    (Solution.FILES_CAN_BE_ADDED_TO_DISK, lambda s: (s.disk,)),
+    (Solution.FILES_CAN_BE_ADDED_TO_DISK_AND_RAM, lambda s: (s.disk,)),
+    (Solution.COMPANY_EXCLUSIVE, lambda s: (s.disk,)),
+    (Solution.CONFLICTING_DISKS, lambda s: (0, None)),
+    (Solution.MOST_AVAILABLE_DISKS, lambda s: ()),
+    (Solution.CLOSE_FILES, lambda s: (s.file,)),
+    (Solution.GET_FILES, lambda s: ([s.file, s.freeFile],)),
+    (Solution.GET_DISKS, lambda s: ([s.disk, s.newDisk],)),
+    (Solution.GET_RAMS, lambda s: ([s.ram, s.freeRam],)),
+    (Solution.COMPANIES_EXCLUSIVE, lambda s: ([s.disk, s.newDisk],)),
+    (Solution.ALL_FILES, lambda s: ()),
+    (Solution.ALL_DISKS, lambda s: ()),
+    (Solution.ALL_RAMS, lambda s: ()),
+    (Solution.FILES_OF_DISK, lambda s: (s.disk,)),
+]
+
+# statements that read whole tables by design, their sequential scans are reported but not flagged
+EXPECTED_FULL_SCANS = {"disk_total_ram_mismatches", "conflicting_disks", "most_available_disks", "all_files",
+                       "all_disks", "all_rams"}
+
+
+# fills the tables with random files, disks and RAMs, half of the files and RAMs placed on disks.
+# returns the sample ids the statements are explained with: file and ram are on disk,
+# freeFile and freeRam are on no disk, new* are free ids
+def loadDataset(files: int, disks: int, rams: int, seed=236363) -> SimpleNamespace:
+    rand = random.Random(seed)
+    types = ["wav", "mp3", "jpg", "png", "txt"]
+    companies = ["DELL", "HP", "Kingston", "Samsung"]
+    fileObjects = [File(i, rand.choice(types), rand.randint(1, 100)) for i in range(1, files + 1)]
+    Solution.addFiles(fileObjects)
+    Solution.addDisks(Disk(i, rand.choice(companies), rand.randint(1, 10), 10 ** 8, rand.randint(1, 10))
+                      for i in range(1, disks + 1))
+    Solution.addRAMs(RAM(i, rand.choice(companies), rand.randint(1, 64)) for i in range(1, rams + 1))
+    Solution.addFilesToDisk((file, rand.randint(1, disks)) for file in fileObjects[:files // 2])
+    for ramID in range(1, rams // 2 + 1):
+        Solution.addRAMToDisk(ramID, rand.randint(1, disks))
+    Solution.addFileToDisk(fileObjects[0], 1)
+    Solution.addRAMToDisk(1, 1)
+
+    conn = Connector.DBConnector()
+    try:
+        conn.connection.autocommit = True
+        conn.execute("ANALYZE")
+    finally:
+        conn.connection.autocommit = False
+        conn.close()
+    return SimpleNamespace(file=1, freeFile=files, newFile=files + 1, disk=1, newDisk=disks + 1,
+                           ram=1, freeRam=rams, newRam=rams + 1)
+
+
+# the relations read by a sequential scan anywhere in an EXPLAIN (FORMAT JSON) plan,
+# scans that were never executed (e.g. under a false one-time filter) are left out
+def seqScans(plan: dict) -> list:
+    scans = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Actual Loops", 1) > 0:
+        scans.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        scans += seqScans(child)
+    return scans
+
+
+# EXPLAIN (ANALYZE, BUFFERS) every statement, each in a transaction that is rolled back, without counting
+# them in PreparedStatement.stats.
+# returns one report per statement: name, seqScans, expected, time (ms), buffers (shared blocks hit + read)
+# and error (None, or why the statement could not be explained)
+def advise(samples: SimpleNamespace, statements=STATEMENTS) -> list:
+    reports = []
+    conn = Connector.DBConnector()
+    try:
+        for statement, args in statements:
+            report = {"name": statement.name, "seqScans": [], "expected": statement.name in EXPECTED_FULL_SCANS,
+                      "time": None, "buffers": None, "error": None}
+            try:
+                query = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement.bind(conn.cursor, count=False)
+                _, result = conn.execute(query, args=args(samples))
+                explained = result.rows[0][0][0]
+                plan = explained["Plan"]
+                report["seqScans"] = seqScans(plan)
+                report["time"] = explained["Execution Time"]
+                report["buffers"] = plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+            except Exception as e:
+                report["error"] = str(e).strip()
+            finally:
+                conn.rollback()
+            reports.append(report)
+    finally:
+        conn.close()
+    return reports
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Report sequential scans in the plans of Solution.py statements")
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--disks", type=int, default=1000)
+    parser.add_argument("--rams", type=int, default=10000)
+    parser.add_argument("--keep", action="store_true", help="keep the dataset instead of dropping the tables")
+    options = parser.parse_args(argv)
+
+    Solution.dropTables()
+    Solution.createTables()
+    try:
+        reports = advise(loadDataset(options.files, options.disks, options.rams))
+    finally:
+        if not options.keep:
+            Solution.dropTables()
+
+    flagged = 0
+    for report in reports:
+        if report["error"] is not None:
+            flagged += 1
+            print("{:<36} ERROR {}".format(report["name"], report["error"]))
+            continue
+        note = ""
+        if report["seqScans"]:
+            note = "seq scan on " + ", ".join(report["seqScans"])
+            if report["expected"]:
+                note += " (expected)"
+            else:
+                flagged += 1
+        print("{:<36} {:>10.3f} ms {:>8} buffers  {}".format(report["name"], report["time"], report["buffers"], note))
+    print("{} statement(s) flagged".format(flagged))
+    return 1 if flagged else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
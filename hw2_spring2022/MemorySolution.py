@@ -0,0 +1,712 @@
+import bisect
+import heapq
+import re
+import threading
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, Iterable, Iterator, Tuple
+from Utility.Status import Status
+from Utility.Exceptions import DatabaseException
+from Business.File import File
+from Business.RAM import RAM
+from Business.Disk import Disk
+from SolutionCommon import INT_MIN, INT_MAX, isInteger, placementRows
+
+# an in-memory engine with the API and Status semantics of Solution.py, no database needed.
+# the tables are dicts keyed by id, the files are also kept sorted by size, and the placements are
+# adjacency sets both ways. the aggregates Solution.py keeps in summary tables are kept here as well.
+# arguments are converted the way PostgreSQL converts bound parameters (see toInteger/toText), and the
+# same constraint violations are raised, so every function maps them to a Status exactly like Solution.py.
+# selected for Solution.py by engine = memory in the [backend] section of database.ini
+
+# the functions Solution.py takes from this module when the memory engine is selected
+API = ["createTables", "clearTables", "dropTables", "tablesExist",
+       "addFile", "getFileByID", "deleteFile", "addDisk", "getDiskByID", "deleteDisk",
+       "addRAM", "getRAMByID", "deleteRAM", "addDiskAndFile", "addFileToDisk", "removeFileFromDisk",
+       "addRAMToDisk", "removeRAMFromDisk", "averageFileSizeOnDisk", "diskTotalRAM", "diskTotalRAMMismatches",
+       "getCostForType", "getFilesCanBeAddedToDisk", "getFilesCanBeAddedToDiskAndRAM", "isCompanyExclusive",
+       "getConflictingDisks", "streamConflictingDisks", "mostAvailableDisks", "getCloseFiles",
+       "addFiles", "addDisks", "addRAMs", "addFilesToDisk",
+       "getFilesByIDs", "getDisksByIDs", "getRAMsByIDs", "areCompaniesExclusive",
+       "streamFiles", "streamDisks", "streamRAMs", "streamFilesOfDisk"]
+
+
+class Tables:
+    def __init__(self):
+        self.files = {}  # id -> (type, size_needed)
+        self.filesBySize = []  # (size_needed, id), sorted
+        self.disks = {}  # id -> [company, speed, free_space, cost]
+        self.rams = {}  # id -> (company, size)
+        self.disksOfFile = {}  # file id -> disk ids
+        self.filesOfDisk = {}  # disk id -> file ids
+        self.disksOfRAM = {}  # ram id -> disk ids
+        self.ramsOfDisk = {}  # disk id -> ram ids
+        self.typeCost = {}  # type -> SUM(cost * size_needed) of its placements
+        self.diskFilesSize = {}  # disk id -> total size_needed of its files
+        self.diskRAMTotal = {}  # disk id -> total size of its RAMs
+
+
+_tables = None  # None while the tables are dropped
+_lock = threading.RLock()
+
+
+# ========= TABLES ===========
+def createTables():
+    global _tables
+    with _lock:
+        if _tables is None:
+            _tables = Tables()
+
+
+def clearTables():
+    global _tables
+    with _lock:
+        if _tables is not None:
+            _tables = Tables()
+
+
+def dropTables():
+    global _tables
+    with _lock:
+        _tables = None
+
+
+def tablesExist() -> bool:
+    return _tables is not None
+
+
+# ========= PARAMETERS ===========
+
+# an INTEGER parameter: whole numbers and strings of digits, numbers with a fraction are rounded half away
+# from zero. None is NULL. anything else, or a value out of the INTEGER range, is an error
+def toInteger(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise TypeError("boolean is not an integer")
+    if isinstance(value, int):
+        number = value
+    elif isinstance(value, (float, Decimal)):
+        number = int(Decimal(value).to_integral_value(rounding=ROUND_HALF_UP))
+    elif isinstance(value, str) and re.fullmatch(r"\s*[+-]?\d+\s*", value):
+        number = int(value)
+    else:
+        raise TypeError("invalid input for integer: " + repr(value))
+    return checkInteger(number)
+
+
+def checkInteger(number: int) -> int:
+    if not INT_MIN <= number <= INT_MAX:
+        raise OverflowError("integer out of range")
+    return number
+
+
+# a TEXT parameter: numbers and booleans are converted to their text, None is NULL
+def toText(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float, Decimal)):
+        return str(value)
+    raise TypeError("invalid input for text: " + repr(value))
+
+
+def tables() -> Tables:
+    if _tables is None:
+        raise DatabaseException.UNKNOWN_ERROR("the tables do not exist")
+    return _tables
+
+
+# ========= ROWS ===========
+# insert/delete helpers that raise the violations PostgreSQL would
+
+def insertFile(fileID, type, size):
+    fileID, type, size = toInteger(fileID), toText(type), toInteger(size)
+    t = tables()
+    if fileID is None or type is None or size is None:
+        raise DatabaseException.NOT_NULL_VIOLATION("Files")
+    if fileID <= 0 or size < 0:
+        raise DatabaseException.CHECK_VIOLATION("Files")
+    if fileID in t.files:
+        raise DatabaseException.UNIQUE_VIOLATION("Files")
+    t.files[fileID] = (type, size)
+    bisect.insort(t.filesBySize, (size, fileID))
+
+
+def insertDisk(diskID, company, speed, freeSpace, cost):
+    diskID, company, speed = toInteger(diskID), toText(company), toInteger(speed)
+    freeSpace, cost = toInteger(freeSpace), toInteger(cost)
+    t = tables()
+    if None in (diskID, company, speed, freeSpace, cost):
+        raise DatabaseException.NOT_NULL_VIOLATION("Disks")
+    if diskID <= 0 or speed <= 0 or freeSpace < 0 or cost <= 0:
+        raise DatabaseException.CHECK_VIOLATION("Disks")
+    if diskID in t.disks:
+        raise DatabaseException.UNIQUE_VIOLATION("Disks")
+    t.disks[diskID] = [company, speed, freeSpace, cost]
+
+
+def insertRAM(ramID, size, company):
+    ramID, size, company = toInteger(ramID), toInteger(size), toText(company)
+    t = tables()
+    if ramID is None or size is None or company is None:
+        raise DatabaseException.NOT_NULL_VIOLATION("RAMs")
+    if ramID <= 0 or size <= 0:
+        raise DatabaseException.CHECK_VIOLATION("RAMs")
+    if ramID in t.rams:
+        raise DatabaseException.UNIQUE_VIOLATION("RAMs")
+    t.rams[ramID] = (company, size)
+
+
+# adds the placement to the adjacency sets and aggregates, the free space is the caller's
+def place(fileID: int, diskID: int):
+    t = tables()
+    type, size = t.files[fileID]
+    t.disksOfFile.setdefault(fileID, set()).add(diskID)
+    t.filesOfDisk.setdefault(diskID, set()).add(fileID)
+    t.typeCost[type] = t.typeCost.get(type, 0) + t.disks[diskID][3] * size
+    t.diskFilesSize[diskID] = t.diskFilesSize.get(diskID, 0) + size
+
+
+def unplace(fileID: int, diskID: int):
+    t = tables()
+    type, size = t.files[fileID]
+    t.disksOfFile[fileID].discard(diskID)
+    t.filesOfDisk[diskID].discard(fileID)
+    t.typeCost[type] -= t.disks[diskID][3] * size
+    t.diskFilesSize[diskID] -= size
+
+
+# ========= CRUD API ===========
+def addFile(file: File) -> Status:
+    ret = Status.OK
+    try:
+        with _lock:
+            insertFile(file.getFileID(), file.getType(), file.getSize())
+    except DatabaseException.NOT_NULL_VIOLATION:
+        ret = Status.BAD_PARAMS
+
+    except DatabaseException.CHECK_VIOLATION:
+        ret = Status.BAD_PARAMS
+
+    except DatabaseException.UNIQUE_VIOLATION:
+        ret = Status.ALREADY_EXISTS
+
+    except Exception:
+        ret = Status.ERROR
+    return ret
+
+
+def getFileByID(fileID: int) -> File:
+    try:
+        with _lock:
+            fileID = toInteger(fileID)
+            row = tables().files.get(fileID)
+            if row is None:
+                return File.badFile()
+            return File(fileID, row[0], row[1])
+    except Exception:
+        return File.badFile()
+
+
+# like Solution.deleteFile, OK whether or not the file exists
+def deleteFile(file: File) -> Status:
+    ret = Status.OK
+    try:
+        with _lock:
+            fileID = toInteger(file.getFileID())
+            t = tables()
+            if fileID in t.files:
+                size = t.files[fileID][1]
+                disks = t.disksOfFile.get(fileID, set())
+                for diskID in disks:
+                    checkInteger(t.disks[diskID][2] + size)
+                for diskID in list(disks):
+                    t.disks[diskID][2] += size
+                    unplace(fileID, diskID)
+                t.disksOfFile.pop(fileID, None)
+                del t.files[fileID]
+                t.filesBySize.pop(bisect.bisect_left(t.filesBySize, (size, fileID)))
+    except Exception as e:
+        ret = Status.ERROR
+    return ret
+
+
+def addDisk(disk: Disk) -> Status:
+    ret = Status.OK
+    try:
+        with _lock:
+            insertDisk(disk.getDiskID(), disk.getCompany(), disk.getSpeed(), disk.getFreeSpace(), disk.getCost())
+    except DatabaseException.NOT_NULL_VIOLATION:
+        ret = Status.BAD_PARAMS
+
+    except DatabaseException.CHECK_VIOLATION:
+        ret = Status.BAD_PARAMS
+
+    except DatabaseException.UNIQUE_VIOLATION:
+        ret = Status.ALREADY_EXISTS
+
+    except Exception as e:
+        ret = Status.ERROR
+    return ret
+
+
+def getDiskByID(diskID: int) -> Disk:
+    try:
+        with _lock:
+            diskID = toInteger(diskID)
+            row = tables().disks.get(diskID)
+            if row is None:
+                return Disk.badDisk()
+            return Disk(diskID, *row)
+    except Exception as e:
+        return Disk.badDisk()
+
+
+# the placements of the disk go with it, the space of their files is not given back anywhere
+def deleteDisk(diskID: int) -> Status:
+    ret = Status.OK
+    try:
+        with _lock:
+            diskID = toInteger(diskID)
+            t = tables()
+            if diskID not in t.disks:
+                return Status.NOT_EXISTS
+            for fileID in list(t.filesOfDisk.get(diskID, set())):
+                unplace(fileID, diskID)
+            for ramID in t.ramsOfDisk.pop(diskID, set()):
+                t.disksOfRAM[ramID].discard(diskID)
+            t.filesOfDisk.pop(diskID, None)
+            t.diskFilesSize.pop(diskID, None)
+            t.diskRAMTotal.pop(diskID, None)
+            del t.disks[diskID]
+    except Exception as e:
+        ret = Status.ERROR
+    return ret
+
+
+def addRAM(ram: RAM) -> Status:
+    ret = Status.OK
+    try:
+        with _lock:
+            insertRAM(ram.getRamID(), ram.getSize(), ram.getCompany())
+    except DatabaseException.NOT_NULL_VIOLATION:
+        ret = Status.BAD_PARAMS
+
+    except DatabaseException.CHECK_VIOLATION:
+        ret = Status.BAD_PARAMS
+
+    except DatabaseException.UNIQUE_VIOLATION:
+        ret = Status.ALREADY_EXISTS
+
+    except Exception as e:
+        ret = Status.ERROR
+    return ret
+
+
+def getRAMByID(ramID: int) -> RAM:
+    try:
+        with _lock:
+            ramID = toInteger(ramID)
+            row = tables().rams.get(ramID)
+            if row is None:
+                return RAM.badRAM()
+            return RAM(ramID, *row)
+    except Exception:
+        return RAM.badRAM()
+
+
+def deleteRAM(ramID: int) -> Status:
+    ret = Status.OK
+    try:
+        with _lock:
+            ramID = toInteger(ramID)
+            t = tables()
+            if ramID not in t.rams:
+                return Status.NOT_EXISTS
+            size = t.rams[ramID][1]
+            for diskID in t.disksOfRAM.pop(ramID, set()):
+                t.ramsOfDisk[diskID].discard(ramID)
+                t.diskRAMTotal[diskID] -= size
+            del t.rams[ramID]
+    except Exception:
+        ret = Status.ERROR
+    return ret
+
+
+# both rows or neither, any violation but a duplicate id is an ERROR
+def addDiskAndFile(disk: Disk, file: File) -> Status:
+    ret = Status.OK
+    try:
+        with _lock:
+            insertFile(file.getFileID(), file.getType(), file.getSize())
+            try:
+                insertDisk(disk.getDiskID(), disk.getCompany(), disk.getSpeed(), disk.getFreeSpace(),
+                           disk.getCost())
+            except Exception:
+                t = tables()
+                fileID = toInteger(file.getFileID())
+                t.filesBySize.remove((t.files.pop(fileID)[1], fileID))
+                raise
+    except DatabaseException.UNIQUE_VIOLATION:
+        ret = Status.ALREADY_EXISTS
+
+    except Exception as e:
+        ret = Status.ERROR
+    return ret
+
+
+# checked in the order PostgreSQL checks them: the free space of the disk, NOT NULL, a duplicate
+# placement and last the existence of the file and the disk
+def addFileToDisk(file: File, diskID: int) -> Status:
+    ret = Status.OK
+    try:
+        with _lock:
+            fileID, diskID = toInteger(file.getFileID()), toInteger(diskID)
+            t = tables()
+            size = t.files[fileID][1] if fileID in t.files else 0
+            if diskID in t.disks and t.disks[diskID][2] - size < 0:
+                raise DatabaseException.CHECK_VIOLATION("Disks")
+            if fileID is None or diskID is None:
+                raise DatabaseException.NOT_NULL_VIOLATION("FilesOfDisk")
+            if fileID in t.filesOfDisk.get(diskID, set()):
+                raise DatabaseException.UNIQUE_VIOLATION("FilesOfDisk")
+            if fileID not in t.files or diskID not in t.disks:
+                raise DatabaseException.FOREIGN_KEY_VIOLATION("FilesOfDisk")
+            t.disks[diskID][2] -= size
+            place(fileID, diskID)
+    except DatabaseException.NOT_NULL_VIOLATION as e:
+        ret = Status.BAD_PARAMS
+
+    except DatabaseException.CHECK_VIOLATION as e:
+        ret = Status.BAD_PARAMS
+
+    except DatabaseException.UNIQUE_VIOLATION as e:
+        ret = Status.ALREADY_EXISTS
+
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        ret = Status.NOT_EXISTS
+
+    except Exception as e:
+        ret = Status.ERROR
+    return ret
+
+
+# like Solution.removeFileFromDisk, OK whether or not the file is on the disk
+def removeFileFromDisk(file: File, diskID: int) -> Status:
+    ret = Status.OK
+    try:
+        with _lock:
+            fileID, diskID = toInteger(file.getFileID()), toInteger(diskID)
+            t = tables()
+            if fileID in t.filesOfDisk.get(diskID, set()):
+                t.disks[diskID][2] = checkInteger(t.disks[diskID][2] + t.files[fileID][1])
+                unplace(fileID, diskID)
+    except Exception as e:
+        ret = Status.ERROR
+    return ret
+
+
+# a NULL id is an ERROR here, as in Solution.addRAMToDisk
+def addRAMToDisk(ramID: int, diskID: int) -> Status:
+    ret = Status.OK
+    try:
+        with _lock:
+            ramID, diskID = toInteger(ramID), toInteger(diskID)
+            t = tables()
+            if ramID is None or diskID is None:
+                raise DatabaseException.NOT_NULL_VIOLATION("RAMsOfDisk")
+            if ramID in t.ramsOfDisk.get(diskID, set()):
+                raise DatabaseException.UNIQUE_VIOLATION("RAMsOfDisk")
+            if ramID not in t.rams or diskID not in t.disks:
+                raise DatabaseException.FOREIGN_KEY_VIOLATION("RAMsOfDisk")
+            t.disksOfRAM.setdefault(ramID, set()).add(diskID)
+            t.ramsOfDisk.setdefault(diskID, set()).add(ramID)
+            t.diskRAMTotal[diskID] = t.diskRAMTotal.get(diskID, 0) + t.rams[ramID][1]
+    except DatabaseException.UNIQUE_VIOLATION:
+        ret = Status.ALREADY_EXISTS
+
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        ret = Status.NOT_EXISTS
+
+    except Exception as e:
+        ret = Status.ERROR
+    return ret
+
+
+def removeRAMFromDisk(ramID: int, diskID: int) -> Status:
+    ret = Status.OK
+    try:
+        with _lock:
+            ramID, diskID = toInteger(ramID), toInteger(diskID)
+            t = tables()
+            if ramID not in t.ramsOfDisk.get(diskID, set()):
+                return Status.NOT_EXISTS
+            t.ramsOfDisk[diskID].discard(ramID)
+            t.disksOfRAM[ramID].discard(diskID)
+            t.diskRAMTotal[diskID] -= t.rams[ramID][1]
+    except Exception:
+        ret = Status.ERROR
+    return ret
+
+
+def averageFileSizeOnDisk(diskID: int) -> float:
+    try:
+        with _lock:
+            diskID = toInteger(diskID)
+            t = tables()
+            count = len(t.filesOfDisk.get(diskID, ()))
+            if count == 0:
+                return 0
+            return t.diskFilesSize[diskID] / count
+    except Exception as e:
+        return -1
+
+
+# -1 for a disk without RAMs, as in Solution.diskTotalRAM
+def diskTotalRAM(diskID: int) -> int:
+    try:
+        with _lock:
+            diskID = toInteger(diskID)
+            total = tables().diskRAMTotal.get(diskID, 0)
+            return total if total > 0 else -1
+    except Exception as e:
+        return -1
+
+
+# the totals are kept by the same code that changes the placements, there is no second source to disagree with
+def diskTotalRAMMismatches() -> List[int]:
+    return []
+
+
+def getCostForType(type: str) -> int:
+    try:
+        if not isinstance(type, str):
+            raise TypeError("type should be a string")
+        with _lock:
+            return tables().typeCost.get(type, 0)
+    except Exception as e:
+        return -1
+
+
+# the files that fit are a prefix of filesBySize
+def getFilesCanBeAddedToDisk(diskID: int) -> List[int]:
+    try:
+        with _lock:
+            diskID = toInteger(diskID)
+            t = tables()
+            if diskID not in t.disks:
+                return []
+            return heapq.nlargest(5, fittingFiles(t, t.disks[diskID][2]))
+    except Exception as e:
+        return []
+
+
+def getFilesCanBeAddedToDiskAndRAM(diskID: int) -> List[int]:
+    try:
+        with _lock:
+            diskID = toInteger(diskID)
+            t = tables()
+            total = t.diskRAMTotal.get(diskID, 0)
+            if diskID not in t.disks or total <= 0:
+                return []
+            return heapq.nsmallest(5, fittingFiles(t, min(t.disks[diskID][2], total)))
+    except Exception as e:
+        return []
+
+
+def isCompanyExclusive(diskID: int) -> bool:
+    try:
+        with _lock:
+            return companyExclusive(tables(), toInteger(diskID))
+    except Exception as e:
+        return False
+
+
+def getConflictingDisks() -> List[int]:
+    try:
+        with _lock:
+            t = tables()
+            return sorted({diskID for disks in t.disksOfFile.values() if len(disks) > 1 for diskID in disks})
+    except Exception as e:
+        return []
+
+
+def streamConflictingDisks(batchSize: int = 1000) -> Iterator[int]:
+    yield from getConflictingDisks()
+
+
+# the number of files that fit in a disk is the length of the prefix of filesBySize
+def mostAvailableDisks() -> List[int]:
+    try:
+        with _lock:
+            t = tables()
+            ranked = []
+            for diskID, (_, speed, freeSpace, _) in t.disks.items():
+                count = bisect.bisect_right(t.filesBySize, (freeSpace, INT_MAX))
+                if count > 0:
+                    ranked.append((-count, -speed, diskID))
+            return [diskID for _, _, diskID in heapq.nsmallest(5, ranked)]
+    except Exception as e:
+        return []
+
+
+# a file on no disk is close to every other file
+def getCloseFiles(fileID: int) -> List[int]:
+    try:
+        with _lock:
+            fileID = toInteger(fileID)
+            t = tables()
+            if fileID not in t.files:
+                return []
+            disks = t.disksOfFile.get(fileID, set())
+            if not disks:
+                return heapq.nsmallest(10, (other for other in t.files if other != fileID))
+            shared = {}
+            for diskID in disks:
+                for other in t.filesOfDisk[diskID]:
+                    shared[other] = shared.get(other, 0) + 1
+            return heapq.nsmallest(10, (other for other, count in shared.items()
+                                        if other != fileID and count * 2 >= len(disks)))
+    except Exception as e:
+        return []
+
+
+# ========= BULK API ===========
+# each item gets the Status its single add would, as with Solution.py
+
+def addFiles(files: Iterable[File]) -> List[Status]:
+    return [addFile(file) for file in files]
+
+
+def addDisks(disks: Iterable[Disk]) -> List[Status]:
+    return [addDisk(disk) for disk in disks]
+
+
+def addRAMs(rams: Iterable[RAM]) -> List[Status]:
+    return [addRAM(ram) for ram in rams]
+
+
+# all pairs or none, as in Solution.addFilesToDisk: a pair that is not (File, int or None) is ERROR,
+# and if a disk runs out of space every pair that would have been placed is BAD_PARAMS
+def addFilesToDisk(placements: Iterable[Tuple[File, int]]) -> List[Status]:
+    statuses, rows = placementRows(placements)
+    if not rows:
+        return statuses
+
+    try:
+        with _lock:
+            t = tables()
+            seen = set()
+            taken = {}
+            for seq, fileID, diskID in rows:
+                if fileID is None or diskID is None:
+                    statuses[seq] = Status.BAD_PARAMS
+                elif fileID not in t.files or diskID not in t.disks:
+                    statuses[seq] = Status.NOT_EXISTS
+                elif fileID in t.filesOfDisk.get(diskID, set()) or (fileID, diskID) in seen:
+                    statuses[seq] = Status.ALREADY_EXISTS
+                else:
+                    statuses[seq] = Status.OK
+                    taken[diskID] = taken.get(diskID, 0) + t.files[fileID][1]
+                seen.add((fileID, diskID))
+            if any(t.disks[diskID][2] < size for diskID, size in taken.items()):
+                return [Status.BAD_PARAMS if status == Status.OK else status for status in statuses]
+            for seq, fileID, diskID in rows:
+                if statuses[seq] == Status.OK:
+                    place(fileID, diskID)
+            for diskID, size in taken.items():
+                t.disks[diskID][2] -= size
+    except Exception as e:
+        statuses = [Status.ERROR if status == Status.OK else status for status in statuses]
+    return statuses
+
+
+# one object per requested id in the same order, File.badFile() for ids that do not exist
+def getFilesByIDs(fileIDs: Iterable[int]) -> List[File]:
+    return getManyByIDs(fileIDs, lambda t, key: File(key, *t.files[key]) if key in t.files else None, File.badFile)
+
+
+def getDisksByIDs(diskIDs: Iterable[int]) -> List[Disk]:
+    return getManyByIDs(diskIDs, lambda t, key: Disk(key, *t.disks[key]) if key in t.disks else None, Disk.badDisk)
+
+
+def getRAMsByIDs(ramIDs: Iterable[int]) -> List[RAM]:
+    return getManyByIDs(ramIDs, lambda t, key: RAM(key, *t.rams[key]) if key in t.rams else None, RAM.badRAM)
+
+
+def areCompaniesExclusive(diskIDs: Iterable[int]) -> List[bool]:
+    return getManyByIDs(diskIDs, lambda t, key: companyExclusive(t, key) if key in t.disks else None, lambda: False)
+
+
+# ========= STREAMING API ===========
+# the rows are copied under the lock and yielded after it, ordered by id
+
+def streamFiles(batchSize: int = 1000) -> Iterator[File]:
+    return streamRows(lambda t: [File(fileID, *row) for fileID, row in sorted(t.files.items())])
+
+
+def streamDisks(batchSize: int = 1000) -> Iterator[Disk]:
+    return streamRows(lambda t: [Disk(diskID, *row) for diskID, row in sorted(t.disks.items())])
+
+
+def streamRAMs(batchSize: int = 1000) -> Iterator[RAM]:
+    return streamRows(lambda t: [RAM(ramID, *row) for ramID, row in sorted(t.rams.items())])
+
+
+# Solution.py streams with the parameters written into the query (see PreparedStatement.inline),
+# so the disk id is compared as a literal: a number with a fraction matches nothing and a boolean is an error
+def streamFilesOfDisk(diskID: int, batchSize: int = 1000) -> Iterator[File]:
+    def rows(t: Tables) -> list:
+        if diskID is None or isinstance(diskID, bool):
+            raise TypeError("no integer disk id")
+        key = diskID
+        if isinstance(diskID, (float, Decimal)):
+            key = int(diskID) if diskID == int(diskID) else None
+        elif not isinstance(diskID, int):
+            key = toInteger(diskID)
+        return [File(fileID, *t.files[fileID]) for fileID in sorted(t.filesOfDisk.get(key, ()))]
+
+    return streamRows(rows)
+
+
+def streamRows(read) -> Iterator:
+    try:
+        with _lock:
+            rows = read(tables())
+    except Exception:
+        rows = []
+    yield from rows
+
+
+# ========= AUX FUNCS ===========
+
+# the ids of the files whose size is at most space
+def fittingFiles(t: Tables, space: int) -> Iterator[int]:
+    end = bisect.bisect_right(t.filesBySize, (space, INT_MAX))
+    return (fileID for _, fileID in t.filesBySize[:end])
+
+
+def companyExclusive(t: Tables, diskID: int) -> bool:
+    if diskID not in t.disks:
+        return False
+    company = t.disks[diskID][0]
+    return all(t.rams[ramID][0] == company for ramID in t.ramsOfDisk.get(diskID, ()))
+
+
+# ids that are not integers are never found, as in Solution.getManyByIDs.
+# lookup returns the result for an id, or None for an id that does not exist
+def getManyByIDs(ids: Iterable[int], lookup, bad) -> list:
+    ids = list(ids)
+    found = {}
+    try:
+        with _lock:
+            t = tables()
+            keys = {key for key in ids if isInteger(key)}
+            for key in keys:
+                item = lookup(t, key)
+                if item is not None:
+                    found[key] = item
+    except Exception:
+        found = {}
+    return [found[key] if isInteger(key) and key in found else bad() for key in ids]
@@ -1,11 +1,14 @@
-from typing import List
+from typing import List, Iterable, Iterator, Tuple
+import os
 import Utility.DBConnector as Connector
+import Utility.Cache as Cache
 from Utility.Status import Status
 from Utility.Exceptions import DatabaseException
 from Business.File import File
 from Business.RAM import RAM
 from Business.Disk import Disk
-from psycopg2 import sql
+from SolutionCommon import createDisk, createFile, createRAM, lookupKeys, resultsByIDs, chunks, chunkRows, \
+    stagedStatuses, addStatus, placementRows, placementStatuses, unplacedStatuses
 
 
 def createTables():
@@ -52,84 +55,310 @@ def createTables():
                     PRIMARY KEY(RAM_id, Disk_id));
                     """)
 
-        conn.execute("""CREATE TABLE DisksCheck(
-                    id INTEGER NOT NULL REFERENCES Disks(id) ON DELETE CASCADE,
-                    PRIMARY KEY(id));
+        # === indexes ====
+        # the primary keys cover lookups by id, FilesOfDisk by File_id and RAMsOfDisk by RAM_id.
+        # files that fit in a given free space are a range of FilesSize (which covers the file ids too),
+        # the files and RAMs of a disk, and the cascades of deleteDisk, are ranges of the *Disk indexes
+        conn.execute("CREATE INDEX FilesSize ON Files(size_needed, id)")
+        conn.execute("CREATE INDEX FilesOfDiskDisk ON FilesOfDisk(Disk_id, File_id)")
+        conn.execute("CREATE INDEX RAMsOfDiskDisk ON RAMsOfDisk(Disk_id, RAM_id)")
+
+        # === co-location counts ====
+        # FileDisksCount holds the number of disks of every file that is on a disk, SharedDisksCount the number
+        # of disks every pair of files shares (both directions, pairs sharing no disk have no row).
+        # both are kept up to date by a BEFORE trigger on FilesOfDisk, which sees the rows an earlier row of
+        # the same statement added or removed, so a cascade that deletes all the files of a disk is counted right
+
+        conn.execute("""CREATE TABLE FileDisksCount(
+                    file_id INTEGER PRIMARY KEY,
+                    disks_count INTEGER NOT NULL);
                     """)
 
-        # === views ====
+        conn.execute("""CREATE TABLE SharedDisksCount(
+                    file_id INTEGER NOT NULL,
+                    shared_file_id INTEGER NOT NULL,
+                    shared_count INTEGER NOT NULL,
+                    PRIMARY KEY(file_id, shared_file_id));
+                    """)
+        conn.execute("CREATE INDEX SharedDisksCountSharedFile ON SharedDisksCount(shared_file_id)")
+
+        conn.execute("""CREATE OR REPLACE FUNCTION count_shared_disks() RETURNS TRIGGER AS $$
+                        BEGIN
+                            IF TG_OP = 'INSERT' THEN
+                                INSERT INTO FileDisksCount(file_id, disks_count)
+                                VALUES (NEW.File_id, 1)
+                                ON CONFLICT (file_id) DO UPDATE SET disks_count = FileDisksCount.disks_count + 1;
+
+                                INSERT INTO SharedDisksCount(file_id, shared_file_id, shared_count)
+                                SELECT pair.file_id, pair.shared_file_id, 1
+                                FROM FilesOfDisk,
+                                     LATERAL (VALUES (NEW.File_id, FilesOfDisk.File_id),
+                                                     (FilesOfDisk.File_id, NEW.File_id)) AS pair(file_id, shared_file_id)
+                                WHERE FilesOfDisk.Disk_id = NEW.Disk_id AND FilesOfDisk.File_id != NEW.File_id
+                                ON CONFLICT (file_id, shared_file_id)
+                                DO UPDATE SET shared_count = SharedDisksCount.shared_count + 1;
+                                RETURN NEW;
+                            END IF;
+
+                            DELETE FROM FileDisksCount WHERE file_id = OLD.File_id AND disks_count = 1;
+                            IF NOT FOUND THEN
+                                UPDATE FileDisksCount SET disks_count = disks_count - 1 WHERE file_id = OLD.File_id;
+                            END IF;
+
+                            WITH neighbours AS (
+                                SELECT File_id FROM FilesOfDisk
+                                WHERE Disk_id = OLD.Disk_id AND File_id != OLD.File_id)
+                            UPDATE SharedDisksCount
+                            SET shared_count = shared_count - 1
+                            WHERE (file_id = OLD.File_id AND shared_file_id IN (SELECT File_id FROM neighbours))
+                               OR (shared_file_id = OLD.File_id AND file_id IN (SELECT File_id FROM neighbours));
+                            DELETE FROM SharedDisksCount
+                            WHERE shared_count = 0 AND (file_id = OLD.File_id OR shared_file_id = OLD.File_id);
+                            RETURN OLD;
+                        END;
+                        $$ LANGUAGE plpgsql;
+                        """)
+        conn.execute("""CREATE TRIGGER FilesOfDiskSharedDisks
+                        BEFORE INSERT OR DELETE ON FilesOfDisk
+                        FOR EACH ROW EXECUTE PROCEDURE count_shared_disks();
+                        """)
 
-        conn.execute("""CREATE VIEW RAMSizeOFDisk AS
-                        SELECT RAMsOfDisk.Disk_id, SUM(RAMs.size) as totalRAMSize
-                        FROM  RAMs, RAMsOfDisk
-                        WHERE RAMs.id = RAMsOfDisk.RAM_id
-                        GROUP BY RAMsOfDisk.Disk_id;
+        # === RAM totals ====
+        # DiskRAMTotal holds the total size of the RAMs on every disk that ever had one, kept up to date by
+        # triggers on RAMsOfDisk (add/remove) and on RAMs (delete/resize). a RAM that is deleted is taken off
+        # its disks by the RAMs trigger, so the RAMsOfDisk rows its deletion cascades to are skipped
+
+        conn.execute("""CREATE TABLE DiskRAMTotal(
+                    disk_id INTEGER PRIMARY KEY REFERENCES Disks(id) ON DELETE CASCADE,
+                    total_ram INTEGER NOT NULL);
+                    """)
+
+        conn.execute("""CREATE OR REPLACE FUNCTION sum_ram_of_disk() RETURNS TRIGGER AS $$
+                        DECLARE
+                            ram_size INTEGER;
+                        BEGIN
+                            IF TG_OP = 'INSERT' THEN
+                                SELECT size INTO ram_size FROM RAMs WHERE id = NEW.RAM_id;
+                                INSERT INTO DiskRAMTotal(disk_id, total_ram)
+                                VALUES (NEW.Disk_id, ram_size)
+                                ON CONFLICT (disk_id) DO UPDATE SET total_ram = DiskRAMTotal.total_ram + ram_size;
+                            ELSE
+                                SELECT size INTO ram_size FROM RAMs WHERE id = OLD.RAM_id;
+                                IF FOUND THEN
+                                    UPDATE DiskRAMTotal SET total_ram = total_ram - ram_size WHERE disk_id = OLD.Disk_id;
+                                END IF;
+                            END IF;
+                            RETURN NULL;
+                        END;
+                        $$ LANGUAGE plpgsql;
+                        """)
+        conn.execute("""CREATE TRIGGER RAMsOfDiskTotal
+                        AFTER INSERT OR DELETE ON RAMsOfDisk
+                        FOR EACH ROW EXECUTE PROCEDURE sum_ram_of_disk();
                         """)
 
-        conn.execute("""CREATE VIEW PotentialFilesForDisk AS
-                        SELECT DISTINCT Disks.id as Disk_id, Files.id AS File_id
-                        FROM Disks, Files
-                        WHERE Files.size_needed <= Disks.free_space;
+        conn.execute("""CREATE OR REPLACE FUNCTION sum_ram_of_disks() RETURNS TRIGGER AS $$
+                        BEGIN
+                            UPDATE DiskRAMTotal
+                            SET total_ram = total_ram - OLD.size + (CASE WHEN TG_OP = 'DELETE' THEN 0 ELSE NEW.size END)
+                            WHERE disk_id IN (SELECT Disk_id FROM RAMsOfDisk WHERE RAM_id = OLD.id);
+                            IF TG_OP = 'DELETE' THEN
+                                RETURN OLD;
+                            END IF;
+                            RETURN NEW;
+                        END;
+                        $$ LANGUAGE plpgsql;
+                        """)
+        conn.execute("""CREATE TRIGGER RAMsTotal
+                        BEFORE DELETE OR UPDATE OF size ON RAMs
+                        FOR EACH ROW EXECUTE PROCEDURE sum_ram_of_disks();
                         """)
-        conn.execute("""CREATE VIEW FilesWithCommonDisks AS
-                        SELECT DISTINCT FOD1.file_id AS file_id1, FOD2.file_id AS file_id2, FOD1.disk_id AS disk_id 
-                        FROM FilesOFDisk AS FOD1, FilesOFDisk AS FOD2
-                        WHERE (FOD1.disk_id = FOD2.disk_id
-                               AND FOD1.file_id != FOD2.file_id)
-                        ORDER BY file_id1 ASC;  
+
+        # === placement aggregates ====
+        # TypeCost holds SUM(cost * size) over the placements of every file type, DiskFilesSize the number and
+        # total size of the files on every disk. a placement is counted by the FilesOfDisk trigger, unless its
+        # file or disk is the one being deleted: then the Files/Disks trigger already took off all its placements
+
+        conn.execute("""CREATE TABLE TypeCost(
+                    type TEXT PRIMARY KEY,
+                    total_cost BIGINT NOT NULL);
+                    """)
+
+        conn.execute("""CREATE TABLE DiskFilesSize(
+                    disk_id INTEGER PRIMARY KEY REFERENCES Disks(id) ON DELETE CASCADE,
+                    files_count INTEGER NOT NULL,
+                    total_size BIGINT NOT NULL);
+                    """)
+
+        conn.execute("""CREATE OR REPLACE FUNCTION sum_files_of_disk() RETURNS TRIGGER AS $$
+                        DECLARE
+                            changed RECORD;
+                            sign INTEGER;
+                            file_type TEXT;
+                            file_size INTEGER;
+                            disk_cost INTEGER;
+                        BEGIN
+                            IF TG_OP = 'INSERT' THEN
+                                changed := NEW;
+                                sign := 1;
+                            ELSE
+                                changed := OLD;
+                                sign := -1;
+                            END IF;
+                            SELECT type, size_needed INTO file_type, file_size FROM Files WHERE id = changed.File_id;
+                            IF NOT FOUND THEN
+                                RETURN NULL;
+                            END IF;
+                            SELECT cost INTO disk_cost FROM Disks WHERE id = changed.Disk_id;
+                            IF NOT FOUND THEN
+                                RETURN NULL;
+                            END IF;
+
+                            INSERT INTO TypeCost(type, total_cost)
+                            VALUES (file_type, sign * disk_cost::BIGINT * file_size)
+                            ON CONFLICT (type) DO UPDATE SET total_cost = TypeCost.total_cost + EXCLUDED.total_cost;
+                            INSERT INTO DiskFilesSize(disk_id, files_count, total_size)
+                            VALUES (changed.Disk_id, sign, sign * file_size)
+                            ON CONFLICT (disk_id) DO UPDATE
+                            SET files_count = DiskFilesSize.files_count + EXCLUDED.files_count,
+                                total_size = DiskFilesSize.total_size + EXCLUDED.total_size;
+                            RETURN NULL;
+                        END;
+                        $$ LANGUAGE plpgsql;
                         """)
-        conn.execute("""CREATE VIEW CommonDisksCount AS
-                        SELECT FilesWithCommonDisks.file_id1 as file_id, FilesWithCommonDisks.file_id2 as shared_file_id, COUNT(FilesWithCommonDisks.disk_id) as sharedDisksCount
-                        FROM FilesWithCommonDisks
-                        GROUP BY FilesWithCommonDisks.file_id1, FilesWithCommonDisks.file_id2
-                        ORDER BY file_id ASC  
+        conn.execute("""CREATE TRIGGER FilesOfDiskAggregates
+                        AFTER INSERT OR DELETE ON FilesOfDisk
+                        FOR EACH ROW EXECUTE PROCEDURE sum_files_of_disk();
                         """)
 
-        conn.execute("""CREATE VIEW CommonVSTotalDisks AS
-                        SELECT CommonDisksCount.file_id, CommonDisksCount.shared_file_id, CommonDisksCount.shareddiskscount,  count(filesOfDisk.disk_id) as totalDisks
-                        FROM CommonDisksCount, filesOfDisk
-                        WHERE CommonDisksCount.file_id = filesOfDisk.file_id
-                        GROUP BY CommonDisksCount.file_id, CommonDisksCount.shared_file_id, CommonDisksCount.shareddiskscount  
+        conn.execute("""CREATE OR REPLACE FUNCTION subtract_deleted_file() RETURNS TRIGGER AS $$
+                        BEGIN
+                            UPDATE TypeCost
+                            SET total_cost = total_cost - (SELECT COALESCE(SUM(Disks.cost::BIGINT * OLD.size_needed), 0)
+                                                           FROM FilesOfDisk, Disks
+                                                           WHERE FilesOfDisk.File_id = OLD.id
+                                                               AND Disks.id = FilesOfDisk.Disk_id)
+                            WHERE type = OLD.type;
+                            UPDATE DiskFilesSize
+                            SET files_count = files_count - 1, total_size = total_size - OLD.size_needed
+                            WHERE disk_id IN (SELECT Disk_id FROM FilesOfDisk WHERE File_id = OLD.id);
+                            RETURN OLD;
+                        END;
+                        $$ LANGUAGE plpgsql;
+                        """)
+        conn.execute("""CREATE TRIGGER FilesAggregates
+                        BEFORE DELETE ON Files
+                        FOR EACH ROW EXECUTE PROCEDURE subtract_deleted_file();
                         """)
 
-        # close files union with empty way close files (files not on disks are close to every file)
-        conn.execute("""CREATE VIEW isCloseFiles AS
-						SELECT file_id, shared_file_id, (shareddiskscount *2 >= totalDisks) as isClose
-                        FROM CommonVSTotalDisks
+        # the DiskFilesSize row of a deleted disk is deleted by its foreign key
+        conn.execute("""CREATE OR REPLACE FUNCTION subtract_deleted_disk() RETURNS TRIGGER AS $$
+                        BEGIN
+                            UPDATE TypeCost
+                            SET total_cost = TypeCost.total_cost - removed.cost
+                            FROM (SELECT Files.type, SUM(OLD.cost::BIGINT * Files.size_needed) AS cost
+                                  FROM FilesOfDisk, Files
+                                  WHERE FilesOfDisk.Disk_id = OLD.id
+                                      AND Files.id = FilesOfDisk.File_id
+                                  GROUP BY Files.type) AS removed
+                            WHERE TypeCost.type = removed.type;
+                            RETURN OLD;
+                        END;
+                        $$ LANGUAGE plpgsql;
+                        """)
+        conn.execute("""CREATE TRIGGER DisksAggregates
+                        BEFORE DELETE ON Disks
+                        FOR EACH ROW EXECUTE PROCEDURE subtract_deleted_disk();
+                        """)
 
-						UNION 
+        # === cache invalidation ====
+        # every change that can make a cached File/Disk/RAM stale is announced as "<table>:<id>" on the
+        # cache_invalidation channel, so other processes can evict it (see Utility/Cache.py).
+        # a truncated table is announced as "<table>:*"
+
+        conn.execute("""CREATE OR REPLACE FUNCTION notify_cache_invalidation() RETURNS TRIGGER AS $$
+                        DECLARE
+                            changed RECORD;
+                        BEGIN
+                            IF TG_OP = 'TRUNCATE' THEN
+                                PERFORM pg_notify('cache_invalidation', TG_TABLE_NAME || ':*');
+                                RETURN NULL;
+                            END IF;
+                            IF TG_OP = 'DELETE' THEN
+                                changed := OLD;
+                            ELSE
+                                changed := NEW;
+                            END IF;
+                            IF TG_TABLE_NAME IN ('filesofdisk', 'ramsofdisk') THEN
+                                PERFORM pg_notify('cache_invalidation', 'disks:' || changed.Disk_id);
+                            ELSE
+                                PERFORM pg_notify('cache_invalidation', TG_TABLE_NAME || ':' || changed.id);
+                            END IF;
+                            RETURN NULL;
+                        END;
+                        $$ LANGUAGE plpgsql;
+                        """)
+        # an INSERT into Files/Disks/RAMs cannot make a cached row stale, only rows that existed are cached
+        for table in ["Files", "Disks", "RAMs"]:
+            conn.execute("""CREATE TRIGGER {table}CacheInvalidation
+                            AFTER UPDATE OR DELETE ON {table}
+                            FOR EACH ROW EXECUTE PROCEDURE notify_cache_invalidation();
+                            """.format(table=table))
+            # clearTables truncates, which fires no row trigger
+            conn.execute("""CREATE TRIGGER {table}CacheTruncate
+                            AFTER TRUNCATE ON {table}
+                            FOR EACH STATEMENT EXECUTE PROCEDURE notify_cache_invalidation();
+                            """.format(table=table))
+        for table in ["FilesOfDisk", "RAMsOfDisk"]:
+            conn.execute("""CREATE TRIGGER {table}CacheInvalidation
+                            AFTER INSERT OR DELETE ON {table}
+                            FOR EACH ROW EXECUTE PROCEDURE notify_cache_invalidation();
+                            """.format(table=table))
+
+        # === views ====
 
-						(SELECT F1.id as file_id, F2.id as shared_file_id, true as isClose
-						FROM FILES F1, FILES F2
-						WHERE (F1.id not in (SELECT file_id from FilesOfDisk) AND F1.id != F2.id))
+        # only used to check DiskRAMTotal, see diskTotalRAMMismatches
 
+        conn.execute("""CREATE VIEW RAMSizeOFDisk AS
+                        SELECT RAMsOfDisk.Disk_id, SUM(RAMs.size) as totalRAMSize
+                        FROM  RAMs, RAMsOfDisk
+                        WHERE RAMs.id = RAMsOfDisk.RAM_id
+                        GROUP BY RAMsOfDisk.Disk_id;
                         """)
 
         conn.commit()
     except Exception as e:
         print(e)
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+        Cache.clearAll()
+
+
+# every table createTables makes, the aggregate tables included
+TABLES = ["Files", "Disks", "RAMs", "FilesOfDisk", "RAMsOfDisk", "FileDisksCount", "SharedDisksCount", "DiskRAMTotal",
+          "TypeCost", "DiskFilesSize"]
 
 
 def clearTables():
     conn = None
     try:
         conn = Connector.DBConnector()
-        conn.execute("DELETE FROM Files")
-        conn.execute("DELETE FROM Disks")
-        conn.execute("DELETE FROM RAMs")
-        conn.execute("DELETE FROM FilesOfDisk")
-        conn.execute("DELETE FROM RAMsOfDisk")
-        conn.execute("DELETE FROM DisksCheck")
+        # one statement for all the tables. TRUNCATE skips the row triggers, so the aggregate tables are
+        # emptied with the tables they are kept for
+        conn.execute("TRUNCATE " + ", ".join(TABLES) + " RESTART IDENTITY CASCADE")
 
         conn.commit()
     except Exception as e:
         print(e)
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+        Cache.clearAll()
 
 
 def dropTables():
@@ -137,40 +366,246 @@ def dropTables():
     try:
         conn = Connector.DBConnector()
         conn.execute("DROP VIEW IF EXISTS RAMSizeOFDisk CASCADE")
-        conn.execute("DROP VIEW IF EXISTS PotentialFilesForDisk CASCADE")
-        conn.execute("DROP VIEW IF EXISTS FilesWithCommonDisks CASCADE")
-        conn.execute("DROP VIEW IF EXISTS CommonDisksCount CASCADE")
-        conn.execute("DROP VIEW IF EXISTS CommonVSTotalDisks CASCADE")
-        conn.execute("DROP VIEW IF EXISTS isCloseFiles CASCADE")
 
         conn.execute("DROP TABLE IF EXISTS Files CASCADE")
         conn.execute("DROP TABLE IF EXISTS Disks CASCADE")
         conn.execute("DROP TABLE IF EXISTS RAMs CASCADE")
         conn.execute("DROP TABLE IF EXISTS FilesOfDisk CASCADE")
         conn.execute("DROP TABLE IF EXISTS RAMsOfDisk CASCADE")
-        conn.execute("DROP TABLE IF EXISTS DisksCheck CASCADE")
+        conn.execute("DROP TABLE IF EXISTS FileDisksCount CASCADE")
+        conn.execute("DROP TABLE IF EXISTS SharedDisksCount CASCADE")
+        conn.execute("DROP TABLE IF EXISTS DiskRAMTotal CASCADE")
+        conn.execute("DROP TABLE IF EXISTS TypeCost CASCADE")
+        conn.execute("DROP TABLE IF EXISTS DiskFilesSize CASCADE")
+
+        conn.execute("DROP FUNCTION IF EXISTS notify_cache_invalidation() CASCADE")
+        conn.execute("DROP FUNCTION IF EXISTS count_shared_disks() CASCADE")
+        conn.execute("DROP FUNCTION IF EXISTS sum_ram_of_disk() CASCADE")
+        conn.execute("DROP FUNCTION IF EXISTS sum_ram_of_disks() CASCADE")
+        conn.execute("DROP FUNCTION IF EXISTS sum_files_of_disk() CASCADE")
+        conn.execute("DROP FUNCTION IF EXISTS subtract_deleted_file() CASCADE")
+        conn.execute("DROP FUNCTION IF EXISTS subtract_deleted_disk() CASCADE")
 
         conn.commit()
     except Exception as e:
         print(e)
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+        Cache.clearAll()
 
 
-# ========= AUX FUNCS ===========
+# whether all the tables exist (in the current search_path), e.g. to create them only once for many tests
+def tablesExist() -> bool:
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        _, result = conn.execute("SELECT bool_and(to_regclass(name) IS NOT NULL) FROM unnest(%s::TEXT[]) AS name",
+                                 args=(TABLES,))
+        return result.rows[0][0]
+    except Exception as e:
+        print(e)
+        return False
+    finally:
+        if conn is not None:
+            conn.close()
+
 
-def createDisk(query_result: tuple) -> Disk:
-    return Disk(diskID=query_result[0], company=query_result[1], speed=query_result[2], free_space=query_result[3],
-                cost=query_result[4])
+# ========= CACHES ===========
+# rows served by the getters, invalidated by the mutators that change them (see Utility/Cache.py)
 
+FILES_CACHE = Cache.getCache("files")
+DISKS_CACHE = Cache.getCache("disks")
+RAMS_CACHE = Cache.getCache("rams")
 
-def createFile(query_result: tuple) -> Disk:
-    return File(fileID=query_result[0], type=query_result[1], size=query_result[2])
 
+# ========= PREPARED STATEMENTS ===========
+# every CRUD/analytics query is prepared once per pooled connection and executed with bound parameters
 
-def createRAM(query_result: tuple) -> Disk:
-    return RAM(ramID=query_result[0], company=query_result[1], size=query_result[2])
+ADD_FILE = Connector.PreparedStatement("add_file", """
+                            INSERT INTO Files(id, type, size_needed)
+                            VALUES($1, $2, $3)
+                            """)
+GET_FILE = Connector.PreparedStatement("get_file", """
+                            SELECT id, type, size_needed
+                            FROM Files
+                            WHERE id = $1
+                            """)
+FREE_SPACE_OF_DELETED_FILE = Connector.PreparedStatement("free_space_of_deleted_file", """
+                            UPDATE Disks
+                            SET free_space = Disks.free_space + Files.size_needed
+                            FROM FilesOfDisk, Files
+                            WHERE Disks.id = FilesOfDisk.Disk_id
+                                AND FilesOfDisk.File_id = Files.id
+                                AND Files.id = $1
+                            RETURNING Disks.id
+                            """)
+DELETE_FILE = Connector.PreparedStatement("delete_file", """
+                            DELETE FROM Files
+                            WHERE id = $1
+                            """)
+ADD_DISK = Connector.PreparedStatement("add_disk", """
+                            INSERT INTO Disks(id, company, speed, free_space, cost)
+                            VALUES($1, $2, $3, $4, $5)
+                            """)
+GET_DISK = Connector.PreparedStatement("get_disk", """
+                            SELECT id, company, speed, free_space, cost
+                            FROM Disks
+                            WHERE id = $1
+                            """)
+DELETE_DISK = Connector.PreparedStatement("delete_disk", """
+                            DELETE FROM Disks
+                            WHERE id = $1
+                            """)
+ADD_RAM = Connector.PreparedStatement("add_ram", """
+                            INSERT INTO RAMs(id, size, company)
+                            VALUES($1, $2, $3)
+                            """)
+GET_RAM = Connector.PreparedStatement("get_ram", """
+                            SELECT id, company, size
+                            FROM RAMs
+                            WHERE id = $1
+                            """)
+DELETE_RAM = Connector.PreparedStatement("delete_ram", """
+                            DELETE FROM RAMs
+                            WHERE id = $1
+                            """)
+TAKE_FILE_SPACE = Connector.PreparedStatement("take_file_space", """
+                            UPDATE Disks
+                            SET free_space = Disks.free_space -
+                                COALESCE((SELECT Files.size_needed
+                                FROM Files
+                                WHERE Files.id = $1), 0)
+                            WHERE Disks.id = $2
+                            """)
+ADD_FILE_TO_DISK = Connector.PreparedStatement("add_file_to_disk", """
+                            INSERT INTO FilesOfDisk(File_id, Disk_id)
+                            VALUES($1, $2)
+                            """)
+RETURN_FILE_SPACE = Connector.PreparedStatement("return_file_space", """
+                            UPDATE Disks
+                            SET free_space = Disks.free_space + Files.size_needed
+                            FROM FilesOfDisk, Files
+                            WHERE Disks.id = $2
+                                AND FilesOfDisk.Disk_id = Disks.id
+                                AND FilesOfDisk.File_id = Files.id
+                                AND Files.id = $1
+                            """)
+REMOVE_FILE_FROM_DISK = Connector.PreparedStatement("remove_file_from_disk", """
+                            DELETE FROM FilesOfDisk
+                            WHERE File_id = $1 AND Disk_id = $2
+                            """)
+ADD_RAM_TO_DISK = Connector.PreparedStatement("add_ram_to_disk", """
+                            INSERT INTO RAMsOfDisk(RAM_id, Disk_id)
+                            VALUES($1, $2)
+                            """)
+REMOVE_RAM_FROM_DISK = Connector.PreparedStatement("remove_ram_from_disk", """
+                            DELETE FROM RAMsOfDisk
+                            WHERE RAM_id = $1 AND Disk_id = $2
+                            """)
+AVERAGE_FILE_SIZE_ON_DISK = Connector.PreparedStatement("average_file_size_on_disk", """
+                            SELECT (SELECT total_size::NUMERIC / files_count
+                                    FROM DiskFilesSize
+                                    WHERE disk_id = $1 AND files_count > 0)
+                            """)
+# a disk without RAMs has no row, as it had none in RAMSizeOFDisk
+DISK_TOTAL_RAM = Connector.PreparedStatement("disk_total_ram", """
+                            SELECT total_ram
+                            FROM DiskRAMTotal
+                            WHERE disk_id = $1 AND total_ram > 0
+                            """)
+DISK_TOTAL_RAM_MISMATCHES = Connector.PreparedStatement("disk_total_ram_mismatches", """
+                            SELECT COALESCE(DiskRAMTotal.disk_id, RAMSizeOFDisk.Disk_id) AS disk_id
+                            FROM DiskRAMTotal FULL JOIN RAMSizeOFDisk ON DiskRAMTotal.disk_id = RAMSizeOFDisk.Disk_id
+                            WHERE COALESCE(DiskRAMTotal.total_ram, 0) != COALESCE(RAMSizeOFDisk.totalRAMSize, 0)
+                            ORDER BY disk_id ASC
+                            """)
+COST_FOR_TYPE = Connector.PreparedStatement("cost_for_type", """
+                            SELECT (SELECT total_cost FROM TypeCost WHERE type = $1)
+                            """)
+FILES_CAN_BE_ADDED_TO_DISK = Connector.PreparedStatement("files_can_be_added_to_disk", """
+                            SELECT Files.id
+                            FROM Files
+                            WHERE Files.size_needed <= (SELECT free_space FROM Disks WHERE id = $1)
+                            ORDER BY Files.id DESC
+                            LIMIT 5
+                            """)
+FILES_CAN_BE_ADDED_TO_DISK_AND_RAM = Connector.PreparedStatement("files_can_be_added_to_disk_and_ram", """
+                            SELECT Files.id
+                            FROM Files
+                            WHERE Files.size_needed <= (SELECT LEAST(Disks.free_space, DiskRAMTotal.total_ram)
+                                                        FROM Disks, DiskRAMTotal
+                                                        WHERE Disks.id = $1 AND DiskRAMTotal.disk_id = $1
+                                                            AND DiskRAMTotal.total_ram > 0)
+                            ORDER BY Files.id ASC
+                            LIMIT 5
+                            """)
+# no row for a disk that does not exist
+COMPANY_EXCLUSIVE = Connector.PreparedStatement("company_exclusive", """
+                            SELECT NOT EXISTS (SELECT 1
+                                               FROM RAMsOfDisk, RAMs
+                                               WHERE RAMsOfDisk.Disk_id = Disks.id
+                                                   AND RAMs.id = RAMsOfDisk.RAM_id
+                                                   AND RAMs.company != Disks.company)
+                            FROM Disks
+                            WHERE Disks.id = $1
+                            """)
+# the disks holding a file that is on more than one disk (FileDisksCount counts each file's disks),
+# after disk $1, at most $2 of them (NULL for all)
+CONFLICTING_DISKS = Connector.PreparedStatement("conflicting_disks", """
+                            SELECT Disks.id
+                            FROM Disks
+                            WHERE Disks.id > $1
+                                AND EXISTS (SELECT 1
+                                            FROM FilesOfDisk, FileDisksCount
+                                            WHERE FilesOfDisk.Disk_id = Disks.id
+                                                AND FileDisksCount.file_id = FilesOfDisk.File_id
+                                                AND FileDisksCount.disks_count > 1)
+                            ORDER BY Disks.id ASC
+                            LIMIT $2
+                            """)
+# files and disks are sorted together by size and free space, a file before a disk of the same value,
+# so the running count of files at a disk is the number of files that fit in it.
+# disks no file fits in are not ranked
+MOST_AVAILABLE_DISKS = Connector.PreparedStatement("most_available_disks", """
+                            SELECT disk_id
+                            FROM (SELECT id AS disk_id, speed, kind,
+                                         COUNT(*) FILTER (WHERE kind = 0)
+                                             OVER (ORDER BY value, kind ROWS UNBOUNDED PRECEDING) AS filesCount
+                                  FROM (SELECT size_needed AS value, 0 AS kind, NULL::INTEGER AS id, NULL::INTEGER AS speed
+                                        FROM Files
+                                        UNION ALL
+                                        SELECT free_space, 1, id, speed
+                                        FROM Disks) AS sizes
+                                  ) AS counted
+                            WHERE kind = 1 AND filesCount > 0
+                            ORDER BY filesCount DESC, speed DESC, disk_id ASC
+                            LIMIT 5
+                            """)
+# a file on no disk is close to every other file
+CLOSE_FILES = Connector.PreparedStatement("close_files", """
+                            SELECT shared_file_id
+                            FROM ((SELECT SharedDisksCount.shared_file_id
+                                   FROM SharedDisksCount, FileDisksCount
+                                   WHERE SharedDisksCount.file_id = $1
+                                       AND FileDisksCount.file_id = $1
+                                       AND SharedDisksCount.shared_count * 2 >= FileDisksCount.disks_count
+                                   ORDER BY SharedDisksCount.shared_file_id ASC
+                                   LIMIT 10)
+                                  UNION ALL
+                                  (SELECT Files.id
+                                   FROM Files
+                                   WHERE Files.id != $1
+                                       AND EXISTS (SELECT 1 FROM Files WHERE id = $1)
+                                       AND NOT EXISTS (SELECT 1 FROM FileDisksCount WHERE file_id = $1)
+                                   ORDER BY Files.id ASC
+                                   LIMIT 10)
+                                  ) AS close
+                            ORDER BY shared_file_id ASC
+                            LIMIT 10
+                            """)
 
 
 # ========= CRUD API ===========
@@ -179,11 +614,7 @@ def addFile(file: File) -> Status:
     ret = Status.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(""" INSERT INTO Files(id, type, size_needed) 
-                            VALUES({id}, {type} ,{size});
-                            """).format(id=sql.Literal(file.getFileID()), type=sql.Literal(file.getType()),
-                                        size=sql.Literal(file.getSize()))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.execute(ADD_FILE, args=(file.getFileID(), file.getType(), file.getSize()))
         conn.commit()
     except DatabaseException.NOT_NULL_VIOLATION:
         ret = Status.BAD_PARAMS
@@ -199,60 +630,60 @@ def addFile(file: File) -> Status:
 
     except Exception:
         ret = Status.ERROR
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ret
 
 
 def getFileByID(fileID: int) -> File:
+    row = FILES_CACHE.get(fileID)
+    if row is not None:
+        return createFile(row)
+    token = FILES_CACHE.token()
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""SELECT *
-                           FROM Files
-                           WHERE id = {id};
-                           """).format(id=sql.Literal(fileID))
-        rows_effected, result = conn.execute(query)
+        rows_effected, result = conn.execute(GET_FILE, args=(fileID,))
         if rows_effected == 0:
             file = File.badFile()
         else:
             file = createFile(result.rows[0])
+            FILES_CACHE.put(fileID, result.rows[0], token)
         conn.commit()
     except Exception:
         file = File.badFile()
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return file
 
 
-def deleteFile(file: File) -> Status:  # todo: adjust free space
+def deleteFile(file: File) -> Status:
     conn = None
     ret = Status.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""BEGIN;
-                            UPDATE Disks
-                            set free_space = Disks.free_space + 
-                            COALESCE ((SELECT Files.size_needed 
-                                        FROM FilesOfDisk, Files
-                                         WHERE Disks.id = FilesOfDisk.Disk_id
-                                                AND FilesOfDisk.File_id = Files.id 
-                                                AND Files.id = {fileID}), 0);
-                            DELETE FROM Files WHERE id=({fileID});
-
-                            """).format(fileID=sql.Literal(file.getFileID()))
-        rows_effected, _ = conn.execute(query)
+        _, disks = conn.execute(FREE_SPACE_OF_DELETED_FILE, args=(file.getFileID(),))
+        rows_effected, _ = conn.execute(DELETE_FILE, args=(file.getFileID(),))
         conn.commit()
+        FILES_CACHE.invalidate(file.getFileID())
+        for row in disks.rows:
+            DISKS_CACHE.invalidate(row[0])
     except Exception as e:
         ret = Status.ERROR
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ret
 
 
@@ -261,13 +692,8 @@ def addDisk(disk: Disk) -> Status:
     ret = Status.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(""" INSERT INTO Disks(id, company, speed, free_space, cost) 
-                            VALUES ({id}, {company}, {speed}, {free_space}, {cost});
-                            """).format(id=sql.Literal(disk.getDiskID()), company=sql.Literal(disk.getCompany()),
-                                        speed=sql.Literal(disk.getSpeed()), free_space=sql.Literal(disk.getFreeSpace()),
-                                        cost=sql.Literal(disk.getCost()))
-
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.execute(ADD_DISK, args=(disk.getDiskID(), disk.getCompany(), disk.getSpeed(),
+                                                        disk.getFreeSpace(), disk.getCost()))
         conn.commit()
     except DatabaseException.NOT_NULL_VIOLATION:
         ret = Status.BAD_PARAMS
@@ -284,34 +710,37 @@ def addDisk(disk: Disk) -> Status:
     except Exception as e:
         print(e)
         ret = Status.ERROR
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ret
 
 
 def getDiskByID(diskID: int) -> Disk:
+    row = DISKS_CACHE.get(diskID)
+    if row is not None:
+        return createDisk(row)
+    token = DISKS_CACHE.token()
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""
-                           SELECT *
-                           FROM Disks
-                           WHERE id = {id};
-
-                           """).format(id=sql.Literal(diskID))
-        rows_effected, result = conn.execute(query)
+        rows_effected, result = conn.execute(GET_DISK, args=(diskID,))
         if rows_effected == 0:
             disk = Disk.badDisk()
         else:
             disk = createDisk(result.rows[0])
+            DISKS_CACHE.put(diskID, result.rows[0], token)
     except Exception as e:
         disk = Disk.badDisk()
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return disk
 
 
@@ -320,18 +749,18 @@ def deleteDisk(diskID: int) -> Status:
     ret = Status.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""DELETE FROM Disks
-                            WHERE Disks.id={id};
-                            """).format(id=sql.Literal(diskID))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.execute(DELETE_DISK, args=(diskID,))
         if rows_effected == 0:
             ret = Status.NOT_EXISTS
         conn.commit()
+        DISKS_CACHE.invalidate(diskID)
     except Exception as e:
         ret = Status.ERROR
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ret
 
 
@@ -340,12 +769,7 @@ def addRAM(ram: RAM) -> Status:
     ret = Status.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""BEGIN;
-                            INSERT INTO RAMS(id, size, company) 
-                            VALUES({id}, {RAMSize}, {company});
-                            """).format(id=sql.Literal(ram.getRamID()), RAMSize=sql.Literal(ram.getSize()),
-                                        company=sql.Literal(ram.getCompany()))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.execute(ADD_RAM, args=(ram.getRamID(), ram.getSize(), ram.getCompany()))
         conn.commit()
     except DatabaseException.NOT_NULL_VIOLATION:
         ret = Status.BAD_PARAMS
@@ -361,33 +785,38 @@ def addRAM(ram: RAM) -> Status:
 
     except Exception as e:
         ret = Status.ERROR
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ret
 
 
 def getRAMByID(ramID: int) -> RAM:
+    row = RAMS_CACHE.get(ramID)
+    if row is not None:
+        return createRAM(row)
+    token = RAMS_CACHE.token()
     conn = None
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""SELECT *
-                           FROM RAMs
-                           WHERE id = {id}
-                           """).format(id=sql.Literal(ramID))
-        rows_effected, result = conn.execute(query)
+        rows_effected, result = conn.execute(GET_RAM, args=(ramID,))
         if rows_effected == 0:
             ram = RAM.badRAM()
         else:
             ram = createRAM(result.rows[0])
+            RAMS_CACHE.put(ramID, result.rows[0], token)
         conn.commit()
     except Exception:
         ram = RAM.badRAM()
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ram
 
 
@@ -396,20 +825,20 @@ def deleteRAM(ramID: int) -> Status:
     ret = Status.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""DELETE FROM RAMs
-                            WHERE id={id};
-                             """).format(id=sql.Literal(ramID))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.execute(DELETE_RAM, args=(ramID,))
         if rows_effected == 0:
             ret = Status.NOT_EXISTS
         conn.commit()
+        RAMS_CACHE.invalidate(ramID)
 
     except Exception:
         ret = Status.ERROR
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ret
 
 
@@ -418,20 +847,9 @@ def addDiskAndFile(disk: Disk, file: File) -> Status:
     ret = Status.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""BEGIN;
-                            INSERT INTO Files(id, type, size_needed)
-                            VALUES({fileID}, {fileType} ,{fileSize});
-                            INSERT INTO Disks(id, company, speed, free_space,cost)
-                            VALUES({diskID}, {diskCompany}, {diskSpeed}, {diskFreeSpace}, {diskCost});
-                            """).format(fileID=sql.Literal(file.getFileID()),
-                                        fileType=sql.Literal(file.getType()),
-                                        fileSize=sql.Literal(file.getSize()),
-                                        diskID=sql.Literal(disk.getDiskID()),
-                                        diskCompany=sql.Literal(disk.getCompany()),
-                                        diskSpeed=sql.Literal(disk.getSpeed()),
-                                        diskFreeSpace=sql.Literal(disk.getFreeSpace()),
-                                        diskCost=sql.Literal(disk.getCost()))
-        rows_effected, _ = conn.execute(query)
+        conn.execute(ADD_FILE, args=(file.getFileID(), file.getType(), file.getSize()))
+        rows_effected, _ = conn.execute(ADD_DISK, args=(disk.getDiskID(), disk.getCompany(), disk.getSpeed(),
+                                                        disk.getFreeSpace(), disk.getCost()))
         conn.commit()
     except DatabaseException.UNIQUE_VIOLATION:
         ret = Status.ALREADY_EXISTS
@@ -439,10 +857,12 @@ def addDiskAndFile(disk: Disk, file: File) -> Status:
 
     except Exception as e:
         ret = Status.ERROR
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ret
 
 
@@ -451,19 +871,10 @@ def addFileToDisk(file: File, diskID: int) -> Status:
     ret = Status.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""BEGIN;
-                            UPDATE Disks
-                            set free_space = Disks.free_space - 
-                                COALESCE((SELECT Files.size_needed
-                                FROM Files
-                                WHERE Files.id = {file_ID}), 0)
-                            WHERE Disks.id = {disk_ID};
-
-                            INSERT INTO FilesOfDisk(File_id, Disk_id)
-                            VALUES ({file_ID}, {disk_ID});
-                            """).format(disk_ID=sql.Literal(diskID), file_ID=sql.Literal(file.getFileID()))
-        rows_effected, _ = conn.execute(query)
+        conn.execute(TAKE_FILE_SPACE, args=(file.getFileID(), diskID))
+        rows_effected, _ = conn.execute(ADD_FILE_TO_DISK, args=(file.getFileID(), diskID))
         conn.commit()
+        DISKS_CACHE.invalidate(diskID)
         if rows_effected == 0:
             ret = Status.NOT_EXISTS
 
@@ -485,10 +896,12 @@ def addFileToDisk(file: File, diskID: int) -> Status:
 
     except Exception as e:
         ret = Status.ERROR
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ret
 
 
@@ -497,27 +910,18 @@ def removeFileFromDisk(file: File, diskID: int) -> Status:
     ret = Status.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""BEGIN;
-                            UPDATE Disks
-                            set free_space = Disks.free_space + 
-                            COALESCE ((SELECT Files.size_needed 
-                                        FROM FilesOfDisk, Files
-                                         WHERE {disk_id} = FilesOfDisk.Disk_id
-                                                AND FilesOfDisk.File_id = Files.id 
-                                                AND Files.id = {file_id}), 0)
-                            WHERE Disks.id = {disk_id};
-                            DELETE 
-                            FROM FilesOfDisk 
-                            WHERE FilesOfDisk.File_id={file_id};
-                            """).format(disk_id=sql.Literal(diskID), file_id=sql.Literal(file.getFileID()))
-        rows_effected, _ = conn.execute(query)
+        conn.execute(RETURN_FILE_SPACE, args=(file.getFileID(), diskID))
+        rows_effected, _ = conn.execute(REMOVE_FILE_FROM_DISK, args=(file.getFileID(), diskID))
         conn.commit()
+        DISKS_CACHE.invalidate(diskID)
     except Exception as e:
         ret = Status.ERROR
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ret
 
 
@@ -526,11 +930,7 @@ def addRAMToDisk(ramID: int, diskID: int) -> Status:
     ret = Status.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""BEGIN;
-                            INSERT INTO RAMsOfDisk(RAM_id, Disk_id)
-                            VALUES ({ram_id}, {disk_id});
-                            """).format(ram_id=sql.Literal(ramID), disk_id=sql.Literal(diskID))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.execute(ADD_RAM_TO_DISK, args=(ramID, diskID))
         if rows_effected == 0:
             ret = Status.NOT_EXISTS
         conn.commit()
@@ -544,10 +944,12 @@ def addRAMToDisk(ramID: int, diskID: int) -> Status:
 
     except Exception as e:
         ret = Status.ERROR
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ret
 
 
@@ -556,20 +958,18 @@ def removeRAMFromDisk(ramID: int, diskID: int) -> Status:
     ret = Status.OK
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""BEGIN;
-                            DELETE FROM RAMsOfDisk
-                            WHERE RAM_id={ram_id} and Disk_id={disk_id};
-                            """).format(ram_id=sql.Literal(ramID), disk_id=sql.Literal(diskID))
-        rows_effected, _ = conn.execute(query)
+        rows_effected, _ = conn.execute(REMOVE_RAM_FROM_DISK, args=(ramID, diskID))
         if rows_effected == 0:
             ret = Status.NOT_EXISTS
         conn.commit()
     except Exception:
         ret = Status.ERROR
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
     return ret
 
 
@@ -578,15 +978,7 @@ def averageFileSizeOnDisk(diskID: int) -> float:
     average = 0
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""
-                        BEGIN;
-                        SELECT AVG(Files.size_needed)
-                        FROM Files, FilesOfDisk
-                        WHERE Files.id = FilesOfDisk.File_id
-                            AND FilesOfDisk.Disk_id = {disk_id};
-
-                        """).format(disk_id=sql.Literal(diskID))
-        _, result = conn.execute(query)
+        _, result = conn.execute(AVERAGE_FILE_SIZE_ON_DISK, args=(diskID,))
         if result.rows[0][0] == None:
             average = 0
         else:
@@ -595,7 +987,8 @@ def averageFileSizeOnDisk(diskID: int) -> float:
     except Exception as e:
         average = -1
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
         return average
 
 
@@ -604,13 +997,7 @@ def diskTotalRAM(diskID: int) -> int:
     total = 0
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""
-                        BEGIN;
-                        SELECT totalRAMSize
-                        FROM RAMSizeOFDisk
-                        WHERE RAMSizeOFDisk.Disk_id = {disk_id};
-                        """).format(disk_id=sql.Literal(diskID))
-        _, result = conn.execute(query)
+        _, result = conn.execute(DISK_TOTAL_RAM, args=(diskID,))
         if result.rows[0][0] == None:
             total = 0
         else:
@@ -618,26 +1005,40 @@ def diskTotalRAM(diskID: int) -> int:
         conn.commit()
     except Exception as e:
         total = -1
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
         return total
 
 
+# the disks whose stored RAM total disagrees with the RAMSizeOFDisk aggregate, should always be empty
+def diskTotalRAMMismatches() -> List[int]:
+    conn = None
+    mismatches = []
+    try:
+        conn = Connector.DBConnector()
+        _, result = conn.execute(DISK_TOTAL_RAM_MISMATCHES)
+        mismatches = [x[0] for x in result.rows]
+        conn.commit()
+    except Exception as e:
+        mismatches = []
+    finally:
+        if conn is not None:
+            conn.close()
+        return mismatches
+
+
 def getCostForType(type: str) -> int:
     conn = None
     cost = 0
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""
-                         BEGIN;
-                         SELECT SUM(Disks.cost * Files.size_needed)
-                         FROM Disks, Files, FilesOfDisk
-                         WHERE Disks.id = FilesOfDisk.Disk_id
-                             AND FilesOfDisk.File_id = Files.id
-                             AND Files.type = {type};
-                         """).format(type=sql.Literal(type))
-        _, result = conn.execute(query)
+        # a bound parameter would be coerced to TEXT, while the type must already be a string
+        if not isinstance(type, str):
+            raise TypeError("type should be a string")
+        _, result = conn.execute(COST_FOR_TYPE, args=(type,))
         if result.rows[0][0] == None:
             cost = 0
         else:
@@ -646,7 +1047,8 @@ def getCostForType(type: str) -> int:
     except Exception as e:
         cost = -1
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
         return cost
 
 
@@ -655,15 +1057,7 @@ def getFilesCanBeAddedToDisk(diskID: int) -> List[int]:
     fileIDsList = []
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""
-                             BEGIN;
-                             SELECT DISTINCT potentialFilesForDisk.file_id AS id
-                             FROM potentialFilesForDisk
-                             WHERE (potentialFilesForDisk.disk_id = {disk_id})
-                             ORDER BY id DESC
-                             LIMIT 5;  
-                             """).format(disk_id=sql.Literal(diskID))
-        _, result = conn.execute(query)
+        _, result = conn.execute(FILES_CAN_BE_ADDED_TO_DISK, args=(diskID,))
         if result.rows[0][0] == None:
             fileIDsList = []
         else:
@@ -672,7 +1066,8 @@ def getFilesCanBeAddedToDisk(diskID: int) -> List[int]:
     except Exception as e:
         fileIDsList = []
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
         return fileIDsList
 
 
@@ -681,17 +1076,7 @@ def getFilesCanBeAddedToDiskAndRAM(diskID: int) -> List[int]:
     fileIDsList = []
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""BEGIN;
-                             SELECT DISTINCT Files.id AS id
-                             FROM Disks, Files, RAMSizeOFDisk
-                             WHERE (Files.size_needed <= Disks.free_space
-                                    AND Disks.id = {disk_id})
-                                AND (Files.size_needed <= RAMSizeOFDisk.totalRAMSize
-                                    AND RAMSizeOFDisk.Disk_id = {disk_id})
-                             ORDER BY id ASC
-                             LIMIT 5;      
-                             """).format(disk_id=sql.Literal(diskID))
-        _, result = conn.execute(query)
+        _, result = conn.execute(FILES_CAN_BE_ADDED_TO_DISK_AND_RAM, args=(diskID,))
         if result.rows[0][0] == None:
             fileIDsList = []
         else:
@@ -700,7 +1085,8 @@ def getFilesCanBeAddedToDiskAndRAM(diskID: int) -> List[int]:
     except Exception as e:
         fileIDsList = []
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
         return fileIDsList
 
 
@@ -709,30 +1095,18 @@ def isCompanyExclusive(diskID: int) -> bool:
     isExclusive = False
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""
-                             BEGIN;
-                             INSERT INTO DisksCheck(id)
-                             VALUES({disk_id});
-                             DELETE FROM DisksCheck WHERE id=({disk_id});
-                             SELECT DISTINCT RAMs.company
-                             FROM Disks, RAMSOFDisk, RAMs
-                             WHERE (Disks.id = RAMSOFDisk.Disk_id
-                                    AND Disks.id = {disk_id}                            
-                                    AND RAMSOFDisk.RAM_id = RAMs.id
-                                    AND RAMs.company != Disks.company);
-                             """).format(disk_id=sql.Literal(diskID))
-        rows_effected, result = conn.execute(query)
-        if rows_effected == 0:
-            isExclusive = True
-        else:
-            isExclusive = False
+        _, result = conn.execute(COMPANY_EXCLUSIVE, args=(diskID,))
+        if result.rows:
+            isExclusive = result.rows[0][0]
         conn.commit()
     except Exception as e:
         isExclusive = False
-        conn.rollback()
+        if conn is not None:
+            conn.rollback()
 
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
         return isExclusive
 
 
@@ -741,14 +1115,7 @@ def getConflictingDisks() -> List[int]:
     conflictingDisks = []
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""BEGIN;
-                             SELECT DISTINCT FOD1.disk_id AS id
-                             FROM FilesOFDisk AS FOD1, FilesOFDisk AS FOD2
-                             WHERE (FOD1.disk_id != FOD2.disk_id
-                                    AND FOD1.file_id = FOD2.file_id)
-                             ORDER BY id ASC;  
-                             """)
-        _, result = conn.execute(query)
+        _, result = conn.execute(CONFLICTING_DISKS, args=(0, None))
         if result.rows[0][0] == None:
             conflictingDisks = []
         else:
@@ -757,24 +1124,40 @@ def getConflictingDisks() -> List[int]:
     except Exception as e:
         conflictingDisks = []
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
         return conflictingDisks
 
 
+# getConflictingDisks one batch at a time, each batch read in its own short transaction after the last id
+# of the one before, so a large catalog is never held in memory or in one snapshot
+def streamConflictingDisks(batchSize: int = 1000) -> Iterator[int]:
+    lastID = 0
+    while True:
+        conn = None
+        batch = []
+        try:
+            conn = Connector.DBConnector()
+            _, result = conn.execute(CONFLICTING_DISKS, args=(lastID, batchSize))
+            batch = [x[0] for x in result.rows]
+            conn.commit()
+        except Exception as e:
+            batch = []
+        finally:
+            if conn is not None:
+                conn.close()
+        yield from batch
+        if len(batch) < batchSize:
+            return
+        lastID = batch[-1]
+
+
 def mostAvailableDisks() -> List[int]:
     conn = None
     availableDisks = []
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL("""BEGIN;
-                             SELECT potentialFilesForDisk.disk_id AS disk_id, COUNT(potentialFilesForDisk.file_id) as filesCount, Disks.speed
-                             FROM potentialFilesForDisk, Disks
-                             WHERE (potentialFilesForDisk.disk_id = Disks.id)
-                             GROUP BY potentialFilesForDisk.disk_id, Disks.speed
-                             ORDER BY filesCount DESC, speed DESC, disk_id ASC
-                             LIMIT 5;
-                             """)
-        _, result = conn.execute(query)
+        _, result = conn.execute(MOST_AVAILABLE_DISKS)
         if result.rows[0][0] == None:
             availableDisks = []
         else:
@@ -783,7 +1166,8 @@ def mostAvailableDisks() -> List[int]:
     except Exception as e:
         availableDisks = []
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
         return availableDisks
 
 
@@ -792,15 +1176,7 @@ def getCloseFiles(fileID: int) -> List[int]:
     closeFiles = []
     try:
         conn = Connector.DBConnector()
-        query = sql.SQL(""" BEGIN;
-                            SELECT shared_file_id
-                            FROM isclosefiles
-                            WHERE isClose = true
-                                    AND file_id = {file_id}
-                            ORDER BY shared_file_id ASC
-                            LIMIT 10;
-                             """).format(file_id=sql.Literal(fileID))
-        _, result = conn.execute(query)
+        _, result = conn.execute(CLOSE_FILES, args=(fileID,))
         if result.rows[0][0] == None:
             closeFiles = []
         else:
@@ -809,7 +1185,385 @@ def getCloseFiles(fileID: int) -> List[int]:
     except Exception as e:
         closeFiles = []
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
         return closeFiles
 
     return []
+
+
+# ========= BULK API ===========
+# items are streamed to a session-local staging table with COPY, BULK_CHUNK_SIZE at a time,
+# and moved to the real table by one INSERT ... SELECT per chunk.
+# each chunk is committed on its own, like a run of single adds would be
+
+BULK_CHUNK_SIZE = 10000
+
+STAGING_TABLES = {
+    "files_staging": """CREATE TEMP TABLE IF NOT EXISTS files_staging(
+                    seq INTEGER, id INTEGER, type TEXT, size_needed INTEGER)
+                    ON COMMIT DELETE ROWS""",
+    "disks_staging": """CREATE TEMP TABLE IF NOT EXISTS disks_staging(
+                    seq INTEGER, id INTEGER, company TEXT, speed INTEGER, free_space INTEGER, cost INTEGER)
+                    ON COMMIT DELETE ROWS""",
+    "rams_staging": """CREATE TEMP TABLE IF NOT EXISTS rams_staging(
+                    seq INTEGER, id INTEGER, size INTEGER, company TEXT)
+                    ON COMMIT DELETE ROWS""",
+}
+
+# the valid rows (same NOT NULL and CHECK rules as the tables) are inserted, first occurrence of each id wins.
+# returns for each staged row whether it was valid and whether it was added
+ADD_STAGED_FILES = Connector.PreparedStatement("add_staged_files", """
+                            WITH valid AS (
+                                SELECT DISTINCT ON (id) seq, id, type, size_needed
+                                FROM files_staging
+                                WHERE (id > 0 AND type IS NOT NULL AND size_needed >= 0) IS TRUE
+                                ORDER BY id, seq),
+                            added AS (
+                                INSERT INTO Files(id, type, size_needed)
+                                SELECT id, type, size_needed FROM valid
+                                ON CONFLICT (id) DO NOTHING
+                                RETURNING id)
+                            SELECT seq, (id > 0 AND type IS NOT NULL AND size_needed >= 0) IS TRUE AS is_valid,
+                                seq IN (SELECT valid.seq FROM valid, added WHERE valid.id = added.id) AS is_added
+                            FROM files_staging
+                            """)
+ADD_STAGED_DISKS = Connector.PreparedStatement("add_staged_disks", """
+                            WITH valid AS (
+                                SELECT DISTINCT ON (id) seq, id, company, speed, free_space, cost
+                                FROM disks_staging
+                                WHERE (id > 0 AND company IS NOT NULL AND speed > 0 AND free_space >= 0
+                                       AND cost > 0) IS TRUE
+                                ORDER BY id, seq),
+                            added AS (
+                                INSERT INTO Disks(id, company, speed, free_space, cost)
+                                SELECT id, company, speed, free_space, cost FROM valid
+                                ON CONFLICT (id) DO NOTHING
+                                RETURNING id)
+                            SELECT seq, (id > 0 AND company IS NOT NULL AND speed > 0 AND free_space >= 0
+                                         AND cost > 0) IS TRUE AS is_valid,
+                                seq IN (SELECT valid.seq FROM valid, added WHERE valid.id = added.id) AS is_added
+                            FROM disks_staging
+                            """)
+ADD_STAGED_RAMS = Connector.PreparedStatement("add_staged_rams", """
+                            WITH valid AS (
+                                SELECT DISTINCT ON (id) seq, id, company, size
+                                FROM rams_staging
+                                WHERE (id > 0 AND company IS NOT NULL AND size > 0) IS TRUE
+                                ORDER BY id, seq),
+                            added AS (
+                                INSERT INTO RAMs(id, company, size)
+                                SELECT id, company, size FROM valid
+                                ON CONFLICT (id) DO NOTHING
+                                RETURNING id)
+                            SELECT seq, (id > 0 AND company IS NOT NULL AND size > 0) IS TRUE AS is_valid,
+                                seq IN (SELECT valid.seq FROM valid, added WHERE valid.id = added.id) AS is_added
+                            FROM rams_staging
+                            """)
+
+
+def addFiles(files: Iterable[File]) -> List[Status]:
+    return bulkAdd(files, "files_staging", ["id", "type", "size_needed"],
+                   lambda file: (file.getFileID(), file.getType(), file.getSize()),
+                   ADD_STAGED_FILES, ADD_FILE)
+
+
+def addDisks(disks: Iterable[Disk]) -> List[Status]:
+    return bulkAdd(disks, "disks_staging", ["id", "company", "speed", "free_space", "cost"],
+                   lambda disk: (disk.getDiskID(), disk.getCompany(), disk.getSpeed(), disk.getFreeSpace(),
+                                 disk.getCost()),
+                   ADD_STAGED_DISKS, ADD_DISK)
+
+
+def addRAMs(rams: Iterable[RAM]) -> List[Status]:
+    return bulkAdd(rams, "rams_staging", ["id", "size", "company"],
+                   lambda ram: (ram.getRamID(), ram.getSize(), ram.getCompany()),
+                   ADD_STAGED_RAMS, ADD_RAM)
+
+
+PLACEMENTS_STAGING = """CREATE TEMP TABLE IF NOT EXISTS placements_staging(
+                    seq INTEGER, file_id INTEGER, disk_id INTEGER, status TEXT)
+                    ON COMMIT DELETE ROWS"""
+
+# lock the target disks in id order, placements on them wait for (or are waited by) this batch
+LOCK_STAGED_DISKS = Connector.PreparedStatement("lock_staged_disks", """
+                            SELECT Disks.id
+                            FROM Disks
+                            WHERE Disks.id IN (SELECT disk_id FROM placements_staging)
+                            ORDER BY Disks.id
+                            FOR UPDATE
+                            """)
+# the status each pair would get from addFileToDisk, a pair repeated in the batch is ALREADY_EXISTS
+CLASSIFY_STAGED_PLACEMENTS = Connector.PreparedStatement("classify_staged_placements", """
+                            UPDATE placements_staging
+                            SET status = classified.status
+                            FROM (SELECT staged.seq,
+                                    CASE WHEN staged.file_id IS NULL OR staged.disk_id IS NULL THEN 'BAD_PARAMS'
+                                         WHEN Files.id IS NULL OR Disks.id IS NULL THEN 'NOT_EXISTS'
+                                         WHEN FilesOfDisk.File_id IS NOT NULL
+                                              OR ROW_NUMBER() OVER (PARTITION BY staged.file_id, staged.disk_id
+                                                                    ORDER BY staged.seq) > 1 THEN 'ALREADY_EXISTS'
+                                         ELSE 'OK' END AS status
+                                  FROM placements_staging AS staged
+                                  LEFT JOIN Files ON Files.id = staged.file_id
+                                  LEFT JOIN Disks ON Disks.id = staged.disk_id
+                                  LEFT JOIN FilesOfDisk ON FilesOfDisk.File_id = staged.file_id
+                                                       AND FilesOfDisk.Disk_id = staged.disk_id) AS classified
+                            WHERE placements_staging.seq = classified.seq
+                            RETURNING placements_staging.seq, placements_staging.status
+                            """)
+# place every OK pair and take the total size of its files from each disk in one UPDATE,
+# the CHECK(free_space >= 0) then holds for the batch as a whole
+PLACE_STAGED_FILES = Connector.PreparedStatement("place_staged_files", """
+                            WITH placed AS (
+                                INSERT INTO FilesOfDisk(File_id, Disk_id)
+                                SELECT file_id, disk_id
+                                FROM placements_staging
+                                WHERE status = 'OK'
+                                RETURNING File_id, Disk_id)
+                            UPDATE Disks
+                            SET free_space = Disks.free_space - taken.size
+                            FROM (SELECT placed.Disk_id, SUM(Files.size_needed) AS size
+                                  FROM placed, Files
+                                  WHERE Files.id = placed.File_id
+                                  GROUP BY placed.Disk_id) AS taken
+                            WHERE Disks.id = taken.Disk_id
+                            """)
+
+
+# places all pairs in one transaction, if a disk runs out of space none of the pairs is placed
+# and every pair that would have been placed is BAD_PARAMS
+def addFilesToDisk(placements: Iterable[Tuple[File, int]]) -> List[Status]:
+    statuses, rows = placementRows(placements)
+    if not rows:
+        return statuses
+
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        conn.execute(PLACEMENTS_STAGING)
+        conn.copy("placements_staging", ["seq", "file_id", "disk_id"], rows)
+        conn.execute(LOCK_STAGED_DISKS)
+        _, result = conn.execute(CLASSIFY_STAGED_PLACEMENTS)
+        placementStatuses(statuses, result.rows)
+        conn.execute(PLACE_STAGED_FILES)
+        conn.commit()
+        for seq, _, diskID in rows:
+            if statuses[seq] == Status.OK:
+                DISKS_CACHE.invalidate(diskID)
+    except DatabaseException.CHECK_VIOLATION:
+        conn.rollback()
+        statuses = unplacedStatuses(statuses, Status.BAD_PARAMS)
+
+    except Exception as e:
+        if conn is not None:
+            conn.rollback()
+        statuses = unplacedStatuses(statuses, Status.ERROR)
+
+    finally:
+        if conn is not None:
+            conn.close()
+    return statuses
+
+
+GET_FILES = Connector.PreparedStatement("get_files", """
+                            SELECT id, type, size_needed
+                            FROM Files
+                            WHERE id = ANY($1)
+                            """)
+GET_DISKS = Connector.PreparedStatement("get_disks", """
+                            SELECT id, company, speed, free_space, cost
+                            FROM Disks
+                            WHERE id = ANY($1)
+                            """)
+GET_RAMS = Connector.PreparedStatement("get_rams", """
+                            SELECT id, company, size
+                            FROM RAMs
+                            WHERE id = ANY($1)
+                            """)
+COMPANIES_EXCLUSIVE = Connector.PreparedStatement("companies_exclusive", """
+                            SELECT Disks.id,
+                                   NOT EXISTS (SELECT 1
+                                               FROM RAMsOfDisk, RAMs
+                                               WHERE RAMsOfDisk.Disk_id = Disks.id
+                                                   AND RAMs.id = RAMsOfDisk.RAM_id
+                                                   AND RAMs.company != Disks.company)
+                            FROM Disks
+                            WHERE Disks.id = ANY($1)
+                            """)
+
+
+# one object per requested id in the same order, File.badFile() for ids that do not exist
+def getFilesByIDs(fileIDs: Iterable[int]) -> List[File]:
+    return getManyByIDs(fileIDs, GET_FILES, createFile, File.badFile)
+
+
+def getDisksByIDs(diskIDs: Iterable[int]) -> List[Disk]:
+    return getManyByIDs(diskIDs, GET_DISKS, createDisk, Disk.badDisk)
+
+
+def getRAMsByIDs(ramIDs: Iterable[int]) -> List[RAM]:
+    return getManyByIDs(ramIDs, GET_RAMS, createRAM, RAM.badRAM)
+
+
+# isCompanyExclusive of every disk in one read-only query, in the same order (False for disks that do not exist)
+def areCompaniesExclusive(diskIDs: Iterable[int]) -> List[bool]:
+    return getManyByIDs(diskIDs, COMPANIES_EXCLUSIVE, lambda row: row[1], lambda: False)
+
+
+# ========= BULK AUX FUNCS ===========
+
+# addOne is the single-row INSERT used when a chunk cannot be copied, it takes the columns in the same order
+def bulkAdd(items: Iterable, staging: str, columns: List[str], toRow, addStaged, addOne) -> List[Status]:
+    statuses = []
+    items = iter(items)
+    chunk = []
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        for chunk in chunks(items, BULK_CHUNK_SIZE):
+            statuses += addChunk(conn, chunk, staging, columns, toRow, addStaged, addOne)
+    except Exception as e:
+        # the connection is gone, nothing else can be added
+        statuses += [Status.ERROR] * (len(chunk) + sum(1 for _ in items))
+    finally:
+        if conn is not None:
+            conn.close()
+    return statuses
+
+
+def addChunk(conn, chunk: list, staging: str, columns: List[str], toRow, addStaged, addOne) -> List[Status]:
+    statuses, rows = chunkRows(chunk, toRow)
+    try:
+        conn.execute(STAGING_TABLES[staging])
+        conn.copy(staging, ["seq"] + columns, rows)
+        _, result = conn.execute(addStaged)
+        stagedStatuses(statuses, result.rows)
+        conn.commit()
+    except Exception as e:
+        # values COPY cannot parse, add the rows one by one to find the failing ones
+        conn.rollback()
+        for row in rows:
+            statuses[row[0]] = addInSavepoint(conn, addOne, row[1:])
+        conn.commit()
+    return statuses
+
+
+def addInSavepoint(conn, statement, row: tuple) -> Status:
+    conn.execute("SAVEPOINT bulk_row")
+    try:
+        conn.execute(statement, args=row)
+        ret = Status.OK
+    except Exception as e:
+        ret = addStatus(e)
+    if ret == Status.OK:
+        conn.execute("RELEASE SAVEPOINT bulk_row")
+    else:
+        conn.execute("ROLLBACK TO SAVEPOINT bulk_row")
+    return ret
+
+
+# fetches all ids with a single = ANY(array) query, ids that are not isInteger (bools, out of range,
+# unhashable) are never found
+def getManyByIDs(ids: Iterable[int], statement, create, bad) -> list:
+    ids = list(ids)
+    found = {}
+    keys = lookupKeys(ids)
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        if keys:
+            _, result = conn.execute(statement, args=(keys,))
+            found = {row[0]: row for row in result.rows}
+        conn.commit()
+    except Exception:
+        found = {}
+        if conn is not None:
+            conn.rollback()
+
+    finally:
+        if conn is not None:
+            conn.close()
+    return resultsByIDs(ids, found, create, bad)
+
+
+# ========= STREAMING API ===========
+# whole tables read on a server-side cursor in one transaction, batchSize rows at a time, so an export
+# runs in bounded memory. the rows are ordered by id. a stream that fails before its first row is empty,
+# like the getters, one that fails after it raises the error so it is never taken for the whole table
+
+ALL_FILES = Connector.PreparedStatement("all_files", """
+                            SELECT id, type, size_needed
+                            FROM Files
+                            ORDER BY id
+                            """)
+ALL_DISKS = Connector.PreparedStatement("all_disks", """
+                            SELECT id, company, speed, free_space, cost
+                            FROM Disks
+                            ORDER BY id
+                            """)
+ALL_RAMS = Connector.PreparedStatement("all_rams", """
+                            SELECT id, company, size
+                            FROM RAMs
+                            ORDER BY id
+                            """)
+FILES_OF_DISK = Connector.PreparedStatement("files_of_disk", """
+                            SELECT Files.id, Files.type, Files.size_needed
+                            FROM FilesOfDisk, Files
+                            WHERE FilesOfDisk.Disk_id = $1 AND Files.id = FilesOfDisk.File_id
+                            ORDER BY Files.id
+                            """)
+
+
+def streamFiles(batchSize: int = 1000) -> Iterator[File]:
+    return streamRows(ALL_FILES, (), createFile, batchSize)
+
+
+def streamDisks(batchSize: int = 1000) -> Iterator[Disk]:
+    return streamRows(ALL_DISKS, (), createDisk, batchSize)
+
+
+def streamRAMs(batchSize: int = 1000) -> Iterator[RAM]:
+    return streamRows(ALL_RAMS, (), createRAM, batchSize)
+
+
+# the files placed on the disk
+def streamFilesOfDisk(diskID: int, batchSize: int = 1000) -> Iterator[File]:
+    return streamRows(FILES_OF_DISK, (diskID,), createFile, batchSize)
+
+
+def streamRows(statement, args: tuple, create, batchSize: int) -> Iterator:
+    conn = None
+    started = False
+    try:
+        conn = Connector.DBConnector()
+        for row in conn.stream(statement, args=args, batchSize=batchSize):
+            started = True
+            yield create(row)
+        conn.commit()
+    except Exception:
+        if started:
+            raise  # after the connection is closed below
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+# ========= BACKEND ===========
+# engine = memory in the [backend] section of database.ini (or SOLUTION_BACKEND=memory in the environment)
+# replaces the API above by the in-memory engine of MemorySolution.py, which needs no database
+
+def backendEngine() -> str:
+    engine = os.environ.get("SOLUTION_BACKEND")
+    if engine is None:
+        try:
+            engine = Connector.DBConnector.config('backend').get('engine', 'postgresql')
+        except DatabaseException.database_ini_ERROR:
+            engine = 'postgresql'
+    return engine.strip().lower()
+
+
+if backendEngine() == 'memory':
+    import MemorySolution
+
+    globals().update({name: getattr(MemorySolution, name) for name in MemorySolution.API})
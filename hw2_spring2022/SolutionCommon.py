@@ -0,0 +1,119 @@
+import itertools
+from typing import List, Iterable, Iterator, Tuple
+from Utility.Status import Status
+from Utility.Exceptions import DatabaseException
+from Business.File import File
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+# the parts of the API that do no I/O, shared by Solution.py and its asyncio mirror AsyncSolution.py:
+# objects built from rows, the ids the tables can hold and the rows and statuses of the bulk functions.
+# the two modules only differ in how they talk to the database
+
+
+# ========= ROWS ===========
+
+def createDisk(query_result: tuple) -> Disk:
+    return Disk(diskID=query_result[0], company=query_result[1], speed=query_result[2], free_space=query_result[3],
+                cost=query_result[4])
+
+
+def createFile(query_result: tuple) -> File:
+    return File(fileID=query_result[0], type=query_result[1], size=query_result[2])
+
+
+def createRAM(query_result: tuple) -> RAM:
+    return RAM(ramID=query_result[0], company=query_result[1], size=query_result[2])
+
+
+# ========= IDS ===========
+
+INT_MIN = -2 ** 31
+INT_MAX = 2 ** 31 - 1
+
+
+# an id the tables can hold: an int (not a bool) in the INTEGER range. a batch checks its ids with it up front,
+# so a bad id fails its own item instead of the whole batch
+def isInteger(value) -> bool:
+    return type(value) is int and INT_MIN <= value <= INT_MAX
+
+
+# the ids of a getManyByIDs to look up, each once
+def lookupKeys(ids: list) -> list:
+    return list({key for key in ids if isInteger(key)})
+
+
+# one result per requested id in the same order, found maps the ids that exist to their row
+def resultsByIDs(ids: list, found: dict, create, bad) -> list:
+    return [create(found[key]) if isInteger(key) and key in found else bad() for key in ids]
+
+
+# ========= BULK ===========
+
+# the items in lists of size, the last one may be shorter
+def chunks(items: Iterator, size: int) -> Iterator[list]:
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# the staging rows (seq, columns...) of a chunk and a status per item, ERROR until the rows are added
+def chunkRows(chunk: list, toRow) -> (List[Status], list):
+    statuses = [Status.ERROR] * len(chunk)
+    rows = []
+    for seq, item in enumerate(chunk):
+        try:
+            rows.append((seq,) + toRow(item))
+        except Exception:
+            pass  # not an object of the right kind, stays ERROR
+    return statuses, rows
+
+
+# the statuses of the (seq, is_valid, is_added) rows of an ADD_STAGED_* statement
+def stagedStatuses(statuses: List[Status], result: list):
+    for seq, isValid, isAdded in result:
+        if isAdded:
+            statuses[seq] = Status.OK
+        elif isValid:
+            statuses[seq] = Status.ALREADY_EXISTS
+        else:
+            statuses[seq] = Status.BAD_PARAMS
+
+
+# the status of a row the single-row INSERT of a chunk failed to add
+def addStatus(error: Exception) -> Status:
+    if isinstance(error, (DatabaseException.NOT_NULL_VIOLATION, DatabaseException.CHECK_VIOLATION)):
+        return Status.BAD_PARAMS
+    if isinstance(error, DatabaseException.UNIQUE_VIOLATION):
+        return Status.ALREADY_EXISTS
+    return Status.ERROR
+
+
+# the staging rows (seq, file id, disk id) of addFilesToDisk and a status per placement,
+# ERROR for those that are not (file, diskID) pairs of ids the tables can hold
+def placementRows(placements: Iterable[Tuple[File, int]]) -> (List[Status], list):
+    statuses = []
+    rows = []
+    for seq, placement in enumerate(placements):
+        statuses.append(Status.ERROR)
+        try:
+            file, diskID = placement
+            fileID = file.getFileID()
+        except Exception:
+            continue  # not a (file, diskID) pair, stays ERROR
+        if all(value is None or isInteger(value) for value in (fileID, diskID)):
+            rows.append((seq, fileID, diskID))
+    return statuses, rows
+
+
+# the statuses of the (seq, status) rows of CLASSIFY_STAGED_PLACEMENTS
+def placementStatuses(statuses: List[Status], result: list):
+    for seq, status in result:
+        statuses[seq] = Status[status]
+
+
+# the statuses once the placements were rolled back, every pair that would have been placed gets status
+def unplacedStatuses(statuses: List[Status], status: Status) -> List[Status]:
+    return [status if placed == Status.OK else placed for placed in statuses]
@@ -0,0 +1,58 @@
+import random
+import unittest
+import Solution
+from Utility.Status import Status
+from Tests.abstractTest import AbstractTest
+from Business.File import File
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    def test_random_against_join(self) -> None:
+        rand = random.Random(236363)
+        files, disks, placements = {}, {}, set()
+        for _ in range(300):
+            fileID, diskID = rand.randint(1, 12), rand.randint(1, 5)
+            action = rand.random()
+            if action < 0.15 and fileID not in files:
+                files[fileID] = (rand.choice(["wav", "mp3", "jpg"]), rand.randint(0, 20))
+                self.assertEqual(Status.OK, Solution.addFile(File(fileID, files[fileID][0], files[fileID][1])))
+            elif action < 0.25 and diskID not in disks:
+                disks[diskID] = rand.randint(1, 9)
+                self.assertEqual(Status.OK, Solution.addDisk(Disk(diskID, "DELL", 1, 1000, disks[diskID])))
+            elif action < 0.65:
+                if fileID in files and Solution.addFileToDisk(File(fileID, *files[fileID]), diskID) == Status.OK:
+                    placements.add((fileID, diskID))
+            elif action < 0.85:
+                if fileID in files:
+                    Solution.removeFileFromDisk(File(fileID, *files[fileID]), diskID)
+                    placements.discard((fileID, diskID))
+            elif action < 0.93 and fileID in files:
+                self.assertEqual(Status.OK, Solution.deleteFile(File(fileID, *files[fileID])))
+                del files[fileID]
+                placements = {(f, d) for f, d in placements if f != fileID}
+            elif diskID in disks:
+                self.assertEqual(Status.OK, Solution.deleteDisk(diskID))
+                del disks[diskID]
+                placements = {(f, d) for f, d in placements if d != diskID}
+
+            for type in ["wav", "mp3", "jpg"]:
+                cost = sum(disks[d] * files[f][1] for f, d in placements if files[f][0] == type)
+                self.assertEqual(cost, Solution.getCostForType(type), type)
+            for diskID in range(1, 6):
+                sizes = [files[f][1] for f, d in placements if d == diskID]
+                average = sum(sizes) / len(sizes) if sizes else 0
+                self.assertEqual(round(average, 6), round(float(Solution.averageFileSizeOnDisk(diskID)), 6))
+
+    def test_clear_tables(self) -> None:
+        self.assertEqual(Status.OK, Solution.addDiskAndFile(Disk(1, "DELL", 1, 100, 3), File(1, "wav", 4)))
+        self.assertEqual(Status.OK, Solution.addFileToDisk(File(1, "wav", 4), 1), "Should work")
+        self.assertEqual(12, Solution.getCostForType("wav"), "Should work")
+        Solution.clearTables()
+        self.assertEqual(0, Solution.getCostForType("wav"), "cleared")
+        self.assertEqual(0, Solution.averageFileSizeOnDisk(1), "cleared")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
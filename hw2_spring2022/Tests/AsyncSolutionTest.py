@@ -0,0 +1,132 @@
+import asyncio
+import inspect
+import random
+import unittest
+import psycopg2
+import AsyncSolution
+import MemorySolution
+import Solution
+from Utility.AsyncDBConnector import AsyncDBConnector
+from Utility.DBConnector import PreparedStatement
+from Utility.Status import Status
+from Tests.abstractTest import AbstractTest
+from Tests import MemorySolutionTest
+from Business.File import File
+from Business.Disk import Disk
+from Business.RAM import RAM
+
+
+async def result(value):
+    if inspect.isasyncgen(value):
+        return [item async for item in value]
+    return await value
+
+
+class Test(AbstractTest):
+    def test_api(self) -> None:
+        for name in MemorySolution.API:
+            function = getattr(AsyncSolution, name)
+            self.assertTrue(inspect.iscoroutinefunction(function) or inspect.isasyncgenfunction(function), name)
+
+    # the same random calls on Solution.py and on AsyncSolution.py give the same results, bad arguments included
+    def test_same_results(self) -> None:
+        calls = [MemorySolutionTest.Test.randomCall(self, random.Random(seed)) for seed in range(300)]
+        calls += [("addDisks", ([Disk(7, "HP", 1, 5, 1), Disk("SIX", "HP", 1, 5, 1), Disk(8, None, 1, 5, 1)],)),
+                  ("addRAMs", ([RAM(7, "HP", 4), RAM(7, "HP", 4), RAM(8, "HP", "4")],)),
+                  ("getDisksByIDs", ([7, 8, 1, "2", True, 2 ** 40, [7]],)), ("getRAMsByIDs", ([7, 8, 1],)),
+                  ("streamDisks", ()), ("streamRAMs", ()), ("streamConflictingDisks", (2,)),
+                  ("diskTotalRAMMismatches", ())]
+        normalize = MemorySolutionTest.Test.normalize
+        expected = [normalize(getattr(Solution, name)(*args)) for name, args in calls]
+        Solution.clearTables()
+
+        async def run():
+            return [normalize(await result(getattr(AsyncSolution, name)(*args))) for name, args in calls]
+
+        actual = asyncio.run(run())
+        for (name, args), want, got in zip(calls, expected, actual):
+            self.assertEqual(want, got, name)
+
+    def test_concurrent_calls(self) -> None:
+        self.assertEqual(Status.OK, Solution.addDisk(Disk(1, "DELL", 10, 100, 10)), "Should work")
+        self.assertEqual([Status.OK] * 50, Solution.addFiles([File(fileID, "wav", 1) for fileID in range(1, 51)]))
+
+        async def run():
+            AsyncDBConnector.configurePool(maxSize=3)
+            try:
+                placed = await asyncio.gather(*[AsyncSolution.addFileToDisk(File(fileID, "wav", 1), 1)
+                                                for fileID in range(1, 51)])
+                disks = await asyncio.gather(*[AsyncSolution.getDiskByID(1) for _ in range(100)])
+                self.assertTrue(AsyncDBConnector.getPool().size() <= 3)
+                return placed, disks
+            finally:
+                AsyncDBConnector.configurePool(maxSize=10)
+
+        placed, disks = asyncio.run(run())
+        self.assertEqual([Status.OK] * 50, placed)
+        self.assertEqual({50}, {disk.getFreeSpace() for disk in disks})
+        self.assertEqual(list(range(1, 51)), [file.getFileID() for file in Solution.streamFilesOfDisk(1)])
+
+    @unittest.skipIf(Solution.backendEngine() == 'memory', "the in-memory engine does no I/O")
+    def test_cancelled_call(self) -> None:
+        async def run():
+            conn = await AsyncDBConnector.connect()
+            task = asyncio.ensure_future(conn.execute("SELECT pg_sleep(5)"))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            await conn.close()
+            self.assertEqual(0, AsyncDBConnector.getPool().size(), "the interrupted connection is discarded")
+            return await AsyncSolution.getFileByID(1)
+
+        self.assertEqual(None, asyncio.run(run()).getFileID())
+
+
+    # a call that can not get a connection fails like any other database error
+    @unittest.skipIf(Solution.backendEngine() == 'memory', "the in-memory engine has no pool")
+    def test_exhausted_solution(self) -> None:
+        async def run():
+            AsyncDBConnector.configurePool(maxSize=1, timeout=0.2)
+            held = await AsyncDBConnector.connect()
+            try:
+                self.assertEqual(Status.ERROR, await AsyncSolution.addFile(File(1, "wav", 1)))
+                self.assertEqual(Status.ERROR, await AsyncSolution.addFileToDisk(File(1, "wav", 1), 1))
+                self.assertEqual(Status.ERROR, await AsyncSolution.deleteDisk(1))
+                self.assertEqual(None, (await AsyncSolution.getFileByID(1)).getFileID())
+                self.assertEqual(None, (await AsyncSolution.getDiskByID(1)).getDiskID())
+                self.assertEqual(-1, await AsyncSolution.averageFileSizeOnDisk(1))
+                self.assertEqual([], await AsyncSolution.getConflictingDisks())
+                self.assertEqual([], await result(AsyncSolution.streamConflictingDisks()))
+                self.assertEqual([], await result(AsyncSolution.streamFiles()))
+                self.assertEqual([None], [file.getFileID() for file in await AsyncSolution.getFilesByIDs([1])])
+                self.assertEqual([Status.ERROR], await AsyncSolution.addFilesToDisk([(File(1, "wav", 1), 1)]))
+                self.assertEqual([Status.ERROR], await AsyncSolution.addDisks([Disk(1, "DELL", 1, 1, 1)]))
+            finally:
+                await held.close()
+                AsyncDBConnector.configurePool(maxSize=10, timeout=30.0)
+
+        asyncio.run(run())
+
+    @unittest.skipIf(Solution.backendEngine() == 'memory', "the in-memory engine does no I/O")
+    def test_stream_fails_midway(self) -> None:
+        failing = PreparedStatement("async_stream_fails_midway", """
+                                    SELECT i, 'wav', 10 / (3 - i) FROM generate_series(1, 5) AS i
+                                    """)
+
+        async def run():
+            ids = []
+            with self.assertRaises(psycopg2.DataError):  # division by zero on the third row, not a short stream
+                async for file in AsyncSolution.streamRows(failing, (), Solution.createFile, 1):
+                    ids.append(file.getFileID())
+            self.assertEqual([1, 2], ids)
+            self.assertEqual(0, AsyncDBConnector.getPool().size() - AsyncDBConnector.getPool().idle(),
+                             "the connection was given back")
+            return [file.getFileID() async for file in AsyncSolution.streamFilesOfDisk("SIX")]
+
+        self.assertEqual([], asyncio.run(run()), "a stream that fails before its first row is empty")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
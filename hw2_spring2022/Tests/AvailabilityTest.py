@@ -0,0 +1,78 @@
+import random
+import unittest
+import Solution
+from Utility.Status import Status
+from Tests.abstractTest import AbstractTest
+from Business.File import File
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    def test_random_against_cross_join(self) -> None:
+        rand = random.Random(236363)
+        files = {fileID: rand.randint(0, 30) for fileID in range(1, 40)}
+        disks = {diskID: (rand.randint(0, 30), rand.randint(1, 4)) for diskID in range(1, 15)}
+        for fileID, size in files.items():
+            self.assertEqual(Status.OK, Solution.addFile(File(fileID, "wav", size)), "Should work")
+        for diskID, (freeSpace, speed) in disks.items():
+            self.assertEqual(Status.OK, Solution.addDisk(Disk(diskID, "DELL", speed, freeSpace, 10)), "Should work")
+
+        for diskID, (freeSpace, _) in disks.items():
+            fitting = sorted((fileID for fileID, size in files.items() if size <= freeSpace), reverse=True)
+            self.assertEqual(fitting[:5], Solution.getFilesCanBeAddedToDisk(diskID), "disk " + str(diskID))
+        self.assertEqual([], Solution.getFilesCanBeAddedToDisk(15), "NO Disk ID 15")
+
+        counts = {diskID: sum(1 for size in files.values() if size <= freeSpace)
+                  for diskID, (freeSpace, _) in disks.items()}
+        ranked = sorted((diskID for diskID in disks if counts[diskID] > 0),
+                        key=lambda diskID: (-counts[diskID], -disks[diskID][1], diskID))
+        self.assertEqual(ranked[:5], Solution.mostAvailableDisks(), "Should work")
+
+    def test_equal_sizes(self) -> None:
+        self.assertEqual(Status.OK, Solution.addDisk(Disk(1, "DELL", 1, 5, 10)), "Should work")
+        self.assertEqual(Status.OK, Solution.addDisk(Disk(2, "DELL", 2, 4, 10)), "Should work")
+        self.assertEqual(Status.OK, Solution.addDisk(Disk(3, "DELL", 3, 0, 10)), "Should work")
+        self.assertEqual([], Solution.mostAvailableDisks(), "no files")
+        self.assertEqual(Status.OK, Solution.addFile(File(1, "wav", 5)), "Should work")
+        self.assertEqual(Status.OK, Solution.addFile(File(2, "wav", 5)), "Should work")
+        self.assertEqual([1], Solution.mostAvailableDisks(), "a file of exactly the free space fits")
+        self.assertEqual([2, 1], Solution.getFilesCanBeAddedToDisk(1), "Should work")
+        self.assertEqual(Status.OK, Solution.addFile(File(3, "wav", 0)), "Should work")
+        self.assertEqual([1, 3, 2], Solution.mostAvailableDisks(), "empty file fits every disk, ties by speed")
+
+    def test_ram_totals(self) -> None:
+        rand = random.Random(236363)
+        rams, placements = {}, set()
+        for diskID in range(1, 5):
+            self.assertEqual(Status.OK, Solution.addDisk(Disk(diskID, "DELL", 1, 20, 10)), "Should work")
+        self.assertEqual(Status.OK, Solution.addFile(File(1, "wav", 0)), "Should work")
+        for _ in range(200):
+            ramID, diskID = rand.randint(1, 8), rand.randint(1, 4)
+            action = rand.random()
+            if action < 0.3 and ramID not in rams:
+                rams[ramID] = rand.randint(1, 10)
+                self.assertEqual(Status.OK, Solution.addRAM(RAM(ramID, "Kingston", rams[ramID])), "Should work")
+            elif action < 0.7:
+                if Solution.addRAMToDisk(ramID, diskID) == Status.OK:
+                    placements.add((ramID, diskID))
+            elif action < 0.9:
+                Solution.removeRAMFromDisk(ramID, diskID)
+                placements.discard((ramID, diskID))
+            elif ramID in rams:
+                self.assertEqual(Status.OK, Solution.deleteRAM(ramID), "Should work")
+                del rams[ramID]
+                placements = {(r, d) for r, d in placements if r != ramID}
+        self.assertEqual([], Solution.diskTotalRAMMismatches(), "stored totals match the view")
+        for diskID in range(1, 5):
+            total = sum(rams[ramID] for ramID, d in placements if d == diskID)
+            self.assertEqual(total if total > 0 else -1, Solution.diskTotalRAM(diskID), "disk " + str(diskID))
+            self.assertEqual([1] if total > 0 else [], Solution.getFilesCanBeAddedToDiskAndRAM(diskID),
+                             "disk " + str(diskID))
+        self.assertEqual(Status.OK, Solution.deleteDisk(1), "Should work")
+        self.assertEqual([], Solution.diskTotalRAMMismatches(), "stored totals match the view")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,70 @@
+import unittest
+import Solution
+import MemorySolution
+from types import SimpleNamespace
+from Utility.DBConnector import DBConnector
+from Utility.Status import Status
+from Tests.abstractTest import AbstractTest
+from Business.File import File
+from Benchmark import Catalog, Load, Runner
+from Benchmark.Timing import histogram, percentile
+
+
+class Test(AbstractTest):
+    def test_catalog(self) -> None:
+        spec = Catalog.catalog("1k", seed=1)
+        rows = lambda spec: [(file.getFileID(), file.getType(), file.getSize()) for file in Catalog.files(spec)]
+        self.assertEqual(rows(spec), rows(Catalog.catalog(1000, seed=1)), "same seed, same rows")
+        self.assertNotEqual(rows(spec), rows(Catalog.catalog(1000, seed=2)), "other seed")
+        self.assertEqual(1000, len(rows(spec)))
+        pairs = [(file.getFileID(), diskID) for file, diskID in Catalog.filePlacements(spec)]
+        self.assertEqual(len(pairs), len(set(pairs)), "a file is placed on a disk once")
+        self.assertTrue(all(1 <= diskID <= spec.disks for _, diskID in pairs))
+        self.assertEqual(10000000, Catalog.catalog("10M").files)
+
+    def test_percentile(self) -> None:
+        self.assertEqual(None, percentile([], 50))
+        self.assertEqual(50, percentile(list(range(1, 101)), 50))
+        self.assertEqual(99, percentile(list(range(1, 101)), 99))
+        self.assertEqual(7, percentile([7], 99))
+
+    def test_benchmark(self) -> None:
+        spec = Catalog.catalog(300)
+        load = Runner.load(spec)
+        self.assertEqual(300, load["files"]["rows"])
+        results = Runner.benchmark(spec, calls=10, fullCalls=2, batch=5)
+        tables = {"createTables", "clearTables", "dropTables", "tablesExist"}
+        self.assertEqual(set(MemorySolution.API) - tables, set(results), "every public function is timed")
+        for name, result in results.items():
+            self.assertEqual(0, result["failed"], name)
+            self.assertTrue(result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"], name)
+        self.assertEqual(None, Solution.getFileByID(spec.files + 1).getFileID(), "added rows are removed")
+        self.assertEqual(None, Solution.getDiskByID(spec.disks + 1).getDiskID(), "added rows are removed")
+
+    def test_histogram(self) -> None:
+        self.assertEqual({"<=0.1ms": 1, "<=1ms": 2, ">5000ms": 1}, histogram([0.00005, 0.0006, 0.001, 6]))
+
+    def test_load(self) -> None:
+        load = SimpleNamespace(spec=Catalog.catalog(200), hotDisks=2)
+        Runner.load(load.spec)
+        mix = Load.parseMix("getDiskByID=2,addFileToDisk,removeFileFromDisk,addFilesToDisk")
+        self.assertRaises(ValueError, Load.parseMix, "dropTables=1")
+        report = Load.run(load, mix, clients=3, duration=0.5)
+        self.assertEqual(set(mix), set(report["operations"]))
+        self.assertTrue(report["throughput_per_s"] > 0)
+        for name, operation in report["operations"].items():
+            self.assertEqual(operation["calls"], sum(operation["histogram"].values()), name)
+        self.assertNotIn("ERROR", report["operations"]["addFileToDisk"]["outcomes"])
+
+    @unittest.skipIf(Solution.backendEngine() == 'memory', "counts errors of the database")
+    def test_error_stats(self) -> None:
+        DBConnector.resetErrorStats()
+        self.assertEqual(Status.OK, Solution.addFile(File(1, "wav", 1)), "Should work")
+        self.assertEqual(Status.ALREADY_EXISTS, Solution.addFile(File(1, "wav", 1)), "ID 1 already exists")
+        self.assertEqual({"23505": 1}, DBConnector.errorStats())
+        self.assertEqual("unique_violation", Load.errorName("23505"))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,108 @@
+import unittest
+import Solution
+from Utility.Status import Status
+from Tests.abstractTest import AbstractTest
+from Business.File import File
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    def test_addFiles(self) -> None:
+        self.assertEqual(Status.OK, Solution.addFile(File(1, "wav", 10)), "Should work")
+        statuses = Solution.addFiles([File(1, "wav", 10), File(2, "wav", 10), File(2, "mp4", 5),
+                                      File(3, "wav", -1), File(3, "wav", 1), File(None, "wav", 1),
+                                      File(4, None, 1), "file5"])
+        self.assertEqual([Status.ALREADY_EXISTS, Status.OK, Status.ALREADY_EXISTS, Status.BAD_PARAMS, Status.OK,
+                          Status.BAD_PARAMS, Status.BAD_PARAMS, Status.ERROR], statuses)
+        self.assertEqual("wav", Solution.getFileByID(2).getType(), "first occurrence wins")
+        self.assertEqual(1, Solution.getFileByID(3).getSize(), "Should work")
+        self.assertEqual(None, Solution.getFileByID(4).getFileID(), "NO File ID 4")
+
+    def test_addFiles_stream(self) -> None:
+        count = Solution.BULK_CHUNK_SIZE * 2 + 7
+        statuses = Solution.addFiles(File(i, "t\tab\\\n", i % 100) for i in range(1, count + 1))
+        self.assertEqual([Status.OK] * count, statuses)
+        self.assertEqual("t\tab\\\n", Solution.getFileByID(count).getType(), "special characters survive COPY")
+
+    def test_addFiles_fallback(self) -> None:
+        statuses = Solution.addFiles([File(1, "wav", 10), File(2, "wav", "big"), File(1, "wav", 10),
+                                      File(3, "wav", -3)])
+        self.assertEqual([Status.OK, Status.ERROR, Status.ALREADY_EXISTS, Status.BAD_PARAMS], statuses)
+
+    def test_addDisks(self) -> None:
+        statuses = Solution.addDisks([Disk(1, "DELL", 10, 10, 10), Disk(2, "DELL", 0, 10, 10),
+                                      Disk(3, "DELL", 10, 0, 10), Disk(1, "DELL", 10, 10, 10)])
+        self.assertEqual([Status.OK, Status.BAD_PARAMS, Status.OK, Status.ALREADY_EXISTS], statuses)
+        self.assertEqual(0, Solution.getDiskByID(3).getFreeSpace(), "Should work")
+
+    def test_addRAMs(self) -> None:
+        statuses = Solution.addRAMs([RAM(1, "Kingston", 10), RAM(2, "Kingston", 0), RAM(1, "Kingston", 10)])
+        self.assertEqual([Status.OK, Status.BAD_PARAMS, Status.ALREADY_EXISTS], statuses)
+        self.assertEqual("Kingston", Solution.getRAMByID(1).getCompany(), "Should work")
+        self.assertEqual([], Solution.addRAMs([]), "nothing to add")
+
+    def test_addFilesToDisk(self) -> None:
+        self.assertEqual([Status.OK] * 4, Solution.addFiles([File(1, "wav", 1), File(2, "wav", 2),
+                                                             File(3, "wav", 3), File(4, "mp4", 4)]))
+        self.assertEqual([Status.OK] * 2, Solution.addDisks([Disk(1, "DELL", 10, 10, 10),
+                                                             Disk(2, "DELL", 10, 5, 10)]))
+        self.assertEqual(Status.OK, Solution.addFileToDisk(File(4, "mp4", 4), 1), "Should work")
+        statuses = Solution.addFilesToDisk([(File(1, "wav", 1), 1), (File(2, "wav", 2), 1), (File(4, "mp4", 4), 1),
+                                            (File(5, "wav", 5), 1), (File(1, "wav", 1), 3), (File(1, "wav", 1), 1),
+                                            (File(None, "wav", 1), 1), (File(3, "wav", 3), 2), ("file3", 2)])
+        self.assertEqual([Status.OK, Status.OK, Status.ALREADY_EXISTS, Status.NOT_EXISTS, Status.NOT_EXISTS,
+                          Status.ALREADY_EXISTS, Status.BAD_PARAMS, Status.OK, Status.ERROR], statuses)
+        self.assertEqual(3, Solution.getDiskByID(1).getFreeSpace(), "10 - 4 - (1 + 2)")
+        self.assertEqual(2, Solution.getDiskByID(2).getFreeSpace(), "5 - 3")
+        self.assertEqual(2.33, round(float(Solution.averageFileSizeOnDisk(1)), 2), "files 1, 2, 4")
+
+    def test_addFilesToDisk_atomic(self) -> None:
+        Solution.addFiles([File(1, "wav", 4), File(2, "wav", 4), File(3, "wav", 4)])
+        Solution.addDisks([Disk(1, "DELL", 10, 10, 10), Disk(2, "DELL", 10, 10, 10)])
+        statuses = Solution.addFilesToDisk([(File(1, "wav", 4), 1), (File(2, "wav", 4), 1), (File(3, "wav", 4), 1),
+                                            (File(1, "wav", 4), 2), (File(1, "wav", 4), 7)])
+        self.assertEqual([Status.BAD_PARAMS] * 4 + [Status.NOT_EXISTS], statuses, "disk 1 needs 12")
+        self.assertEqual(10, Solution.getDiskByID(1).getFreeSpace(), "nothing placed")
+        self.assertEqual(10, Solution.getDiskByID(2).getFreeSpace(), "nothing placed")
+        self.assertEqual([], Solution.addFilesToDisk([]), "nothing to place")
+
+    def test_addFilesToDisk_bad_ids(self) -> None:
+        Solution.addFiles([File(1, "wav", 1), File(2, "wav", 2)])
+        Solution.addDisks([Disk(1, "DELL", 10, 10, 10)])
+        placements = [(File(1, "wav", 1), 1), (File(True, "wav", 1), 1), (File(2 ** 40, "wav", 1), 1),
+                      (File(2, "wav", 2), 2 ** 40), (File(2, "wav", 2), True), (File(2, "wav", 2), 1)]
+        single = [Solution.addFileToDisk(file, diskID) for file, diskID in placements[1:5]]
+        self.assertEqual([Status.ERROR] * 4, single, "not an INTEGER")
+        statuses = Solution.addFilesToDisk(placements)
+        self.assertEqual([Status.OK] + single + [Status.OK], statuses, "only the bad pairs fail")
+        self.assertEqual(7, Solution.getDiskByID(1).getFreeSpace(), "10 - (1 + 2)")
+
+    def test_getByIDs(self) -> None:
+        Solution.addFiles([File(1, "wav", 1), File(2, "mp4", 2)])
+        Solution.addDisks([Disk(1, "DELL", 10, 10, 10)])
+        Solution.addRAMs([RAM(1, "Kingston", 10)])
+        files = Solution.getFilesByIDs([2, 3, 1, 2, "SIX"])
+        self.assertEqual([2, None, 1, 2, None], [file.getFileID() for file in files])
+        self.assertEqual("mp4", files[0].getType(), "Should work")
+        self.assertEqual([None, 1], [disk.getDiskID() for disk in Solution.getDisksByIDs([2, 1])])
+        self.assertEqual([1], [ram.getRamID() for ram in Solution.getRAMsByIDs(iter([1]))])
+        self.assertEqual([], Solution.getFilesByIDs([]), "nothing to get")
+        files = Solution.getFilesByIDs([1, 2 ** 40, True, [1], -2 ** 31 - 1, 2])
+        self.assertEqual([1, None, None, None, None, 2], [file.getFileID() for file in files],
+                         "ids that are not INTEGERs are not found, the others are")
+        self.assertEqual([True, False], Solution.areCompaniesExclusive([1, 2 ** 40]))
+
+    def test_areCompaniesExclusive(self) -> None:
+        Solution.addDisks([Disk(1, "DELL", 10, 10, 10), Disk(2, "HP", 10, 10, 10), Disk(3, "DELL", 10, 10, 10)])
+        Solution.addRAMs([RAM(1, "DELL", 10), RAM(2, "HP", 10)])
+        self.assertEqual(Status.OK, Solution.addRAMToDisk(1, 1), "Should work")
+        self.assertEqual(Status.OK, Solution.addRAMToDisk(1, 2), "Should work")
+        self.assertEqual(Status.OK, Solution.addRAMToDisk(2, 2), "Should work")
+        self.assertEqual([True, False, True, False, False], Solution.areCompaniesExclusive([1, 2, 3, 4, "SIX"]))
+        self.assertEqual([Solution.isCompanyExclusive(i) for i in range(5)], Solution.areCompaniesExclusive(range(5)))
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
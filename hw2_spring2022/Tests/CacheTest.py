@@ -0,0 +1,117 @@
+import time
+import unittest
+import Solution
+import Utility.Cache as Cache
+from Utility.DBConnector import DBConnector
+from Utility.Status import Status
+from Tests.abstractTest import AbstractTest
+from Business.File import File
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+@unittest.skipIf(Solution.backendEngine() == 'memory', "caches the rows of the database")
+class Test(AbstractTest):
+    # before each test, setUp is executed
+    def setUp(self) -> None:
+        Cache.configure(enabled=True, maxEntries=100, maxBytes=None, ttl=None, listen=False)
+        super().setUp()
+        Solution.FILES_CACHE.resetStats()
+        Solution.DISKS_CACHE.resetStats()
+
+    # after each test, tearDown is executed
+    def tearDown(self) -> None:
+        super().tearDown()
+        Cache.configure(enabled=False)
+
+    def test_read_through(self) -> None:
+        self.assertEqual(Status.OK, Solution.addFile(File(1, "wav", 10)), "Should work")
+        self.assertEqual(None, Solution.getFileByID(2).getFileID(), "NO File ID 2")
+        for _ in range(3):
+            self.assertEqual(10, Solution.getFileByID(1).getSize(), "Should work")
+        stats = Solution.FILES_CACHE.stats()
+        self.assertEqual(2, stats["hits"])
+        self.assertEqual(2, stats["misses"], "one for the missing file, one for the first read")
+        self.assertEqual(1, stats["entries"])
+
+    def test_invalidation(self) -> None:
+        self.assertEqual(Status.OK, Solution.addDiskAndFile(Disk(1, "DELL", 10, 10, 10), File(1, "wav", 4)))
+        self.assertEqual(10, Solution.getDiskByID(1).getFreeSpace(), "Should work")
+        self.assertEqual(Status.OK, Solution.addFileToDisk(File(1, "wav", 4), 1), "Should work")
+        self.assertEqual(6, Solution.getDiskByID(1).getFreeSpace(), "placement invalidates the disk")
+        self.assertEqual(Status.OK, Solution.removeFileFromDisk(File(1, "wav", 4), 1), "Should work")
+        self.assertEqual(10, Solution.getDiskByID(1).getFreeSpace(), "removal invalidates the disk")
+        self.assertEqual([Status.OK], Solution.addFilesToDisk([(File(1, "wav", 4), 1)]), "Should work")
+        self.assertEqual(6, Solution.getDiskByID(1).getFreeSpace(), "batch placement invalidates the disk")
+        self.assertEqual(4, Solution.getFileByID(1).getSize(), "Should work")
+        self.assertEqual(Status.OK, Solution.deleteFile(File(1, "wav", 4)), "Should work")
+        self.assertEqual(None, Solution.getFileByID(1).getFileID(), "deleted file is not served")
+        self.assertEqual(10, Solution.getDiskByID(1).getFreeSpace(), "deleting the file frees the disk")
+        self.assertEqual(Status.OK, Solution.deleteDisk(1), "Should work")
+        self.assertEqual(None, Solution.getDiskByID(1).getDiskID(), "deleted disk is not served")
+        self.assertEqual(Status.OK, Solution.addRAM(RAM(1, "Kingston", 10)), "Should work")
+        self.assertEqual(1, Solution.getRAMByID(1).getRamID(), "Should work")
+        self.assertEqual(Status.OK, Solution.deleteRAM(1), "Should work")
+        self.assertEqual(None, Solution.getRAMByID(1).getRamID(), "deleted ram is not served")
+
+    def test_bounds(self) -> None:
+        cache = Cache.ObjectCache(enabled=True, maxEntries=2)
+        for key in range(3):
+            cache.put(key, (key, "wav", 10))
+        self.assertEqual(None, cache.get(0), "least recently used is evicted")
+        self.assertEqual(1, cache.stats()["evictions"])
+        cache = Cache.ObjectCache(enabled=True, maxBytes=1)
+        cache.put(1, (1, "wav", 10))
+        self.assertEqual(0, cache.stats()["entries"], "larger than the memory bound")
+        cache = Cache.ObjectCache(enabled=True, ttl=0)
+        cache.put(1, (1, "wav", 10))
+        self.assertEqual(None, cache.get(1), "expired")
+
+    def test_stale_read(self) -> None:
+        cache = Cache.ObjectCache(enabled=True)
+        token = cache.token()
+        cache.invalidate(1)
+        cache.put(1, (1, "wav", 10), token)
+        self.assertEqual(None, cache.get(1), "row read before the invalidation is not cached")
+
+    def test_remote_invalidation(self) -> None:
+        Cache.configure(listen=True)
+        self.assertTrue(Cache.listener().ready.wait(5), "listener should start")
+        self.assertEqual(Status.OK, Solution.addDisk(Disk(1, "DELL", 10, 10, 10)), "Should work")
+        self.assertEqual(10, Solution.getDiskByID(1).getFreeSpace(), "Should work")
+        # another process changes the disk behind this process' back
+        conn = DBConnector(pooled=False)
+        try:
+            conn.execute("UPDATE Disks SET free_space = 3 WHERE id = 1")
+            conn.commit()
+        finally:
+            conn.close()
+        deadline = time.monotonic() + 5
+        while Solution.getDiskByID(1).getFreeSpace() != 3 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(3, Solution.getDiskByID(1).getFreeSpace(), "notification evicts the cached disk")
+        Cache.configure(listen=False)
+        self.assertEqual(None, Cache.listener(), "listener should stop")
+
+    def test_remote_truncate(self) -> None:
+        Cache.configure(listen=True)
+        self.assertTrue(Cache.listener().ready.wait(5), "listener should start")
+        self.assertEqual(Status.OK, Solution.addFile(File(1, "wav", 10)), "Should work")
+        self.assertEqual(10, Solution.getFileByID(1).getSize(), "Should work")
+        # another process empties the tables, TRUNCATE fires no row trigger
+        conn = DBConnector(pooled=False)
+        try:
+            conn.execute("TRUNCATE Files CASCADE")
+            conn.commit()
+        finally:
+            conn.close()
+        deadline = time.monotonic() + 5
+        while Solution.getFileByID(1).getFileID() is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(None, Solution.getFileByID(1).getFileID(), "notification clears the cached files")
+        Cache.configure(listen=False)
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
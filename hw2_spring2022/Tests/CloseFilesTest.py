@@ -0,0 +1,92 @@
+import random
+import unittest
+import Solution
+from Utility.Status import Status
+from Tests.abstractTest import AbstractTest
+from Business.File import File
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    # getCloseFiles as the isCloseFiles view defined it, computed from the placements
+    @staticmethod
+    def expectedCloseFiles(fileID: int, files: set, placements: set) -> list:
+        if fileID not in files:
+            return []
+        disks = {disk for file, disk in placements if file == fileID}
+        if not disks:
+            return sorted(files - {fileID})[:10]
+        close = []
+        for other in sorted(files - {fileID}):
+            shared = len({disk for file, disk in placements if file == other} & disks)
+            if shared > 0 and shared * 2 >= len(disks):
+                close.append(other)
+        return close[:10]
+
+    def test_cascades(self) -> None:
+        for diskID in range(1, 4):
+            self.assertEqual(Status.OK, Solution.addDisk(Disk(diskID, "DELL", 10, 100, 10)), "Should work")
+        for fileID in range(1, 5):
+            self.assertEqual(Status.OK, Solution.addFile(File(fileID, "wav", 1)), "Should work")
+        for fileID, diskID in [(1, 1), (2, 1), (3, 1), (1, 2), (2, 2), (1, 3), (4, 3)]:
+            self.assertEqual(Status.OK, Solution.addFileToDisk(File(fileID, "wav", 1), diskID), "Should work")
+        self.assertEqual([2], Solution.getCloseFiles(1), "shares 2 of 3 disks")
+        self.assertEqual([1, 2], Solution.getCloseFiles(3), "Should work")
+        self.assertEqual(Status.OK, Solution.deleteDisk(1), "deletes three placements at once")
+        self.assertEqual([2, 4], Solution.getCloseFiles(1), "shares 1 of 2 disks")
+        self.assertEqual([1, 2, 4], Solution.getCloseFiles(3), "on no disk now")
+        self.assertEqual(Status.OK, Solution.deleteFile(File(2, "wav", 1)), "Should work")
+        self.assertEqual([4], Solution.getCloseFiles(1), "Should work")
+        self.assertEqual([], Solution.getCloseFiles(2), "deleted file has no close files")
+
+    def test_random_against_view(self) -> None:
+        rand = random.Random(236363)
+        files, placements = set(), set()
+        for diskID in range(1, 7):
+            self.assertEqual(Status.OK, Solution.addDisk(Disk(diskID, "DELL", 10, 1000, 10)), "Should work")
+        for fileID in range(1, 16):
+            self.assertEqual(Status.OK, Solution.addFile(File(fileID, "wav", 1)), "Should work")
+            files.add(fileID)
+        for _ in range(150):
+            fileID, diskID = rand.randint(1, 15), rand.randint(1, 6)
+            action = rand.random()
+            if action < 0.6:
+                if Solution.addFileToDisk(File(fileID, "wav", 1), diskID) == Status.OK:
+                    placements.add((fileID, diskID))
+            elif action < 0.9:
+                Solution.removeFileFromDisk(File(fileID, "wav", 1), diskID)
+                placements.discard((fileID, diskID))
+            elif fileID in files:
+                self.assertEqual(Status.OK, Solution.deleteFile(File(fileID, "wav", 1)), "Should work")
+                files.discard(fileID)
+                placements = {(f, d) for f, d in placements if f != fileID}
+                self.assertEqual(Status.OK, Solution.addFile(File(fileID, "wav", 1)), "Should work")
+                files.add(fileID)
+        for fileID in range(1, 17):
+            self.assertEqual(Test.expectedCloseFiles(fileID, files, placements), Solution.getCloseFiles(fileID),
+                             "file " + str(fileID))
+
+    def test_conflicting_disks(self) -> None:
+        rand = random.Random(236363)
+        placements = set()
+        for diskID in range(1, 21):
+            self.assertEqual(Status.OK, Solution.addDisk(Disk(diskID, "DELL", 10, 1000, 10)), "Should work")
+        for fileID in range(1, 31):
+            self.assertEqual(Status.OK, Solution.addFile(File(fileID, "wav", 1)), "Should work")
+        for _ in range(40):
+            fileID, diskID = rand.randint(1, 30), rand.randint(1, 20)
+            if Solution.addFileToDisk(File(fileID, "wav", 1), diskID) == Status.OK:
+                placements.add((fileID, diskID))
+        replicas = {}
+        for fileID, diskID in placements:
+            replicas.setdefault(fileID, set()).add(diskID)
+        expected = sorted({diskID for disks in replicas.values() if len(disks) > 1 for diskID in disks})
+        self.assertTrue(0 < len(expected) < 20, "some but not all disks conflict")
+        self.assertEqual(expected, Solution.getConflictingDisks(), "Should work")
+        self.assertEqual(expected, list(Solution.streamConflictingDisks(batchSize=2)), "in batches of 2")
+        self.assertEqual(expected, list(Solution.streamConflictingDisks(batchSize=len(expected))), "one full batch")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
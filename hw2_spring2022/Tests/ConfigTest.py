@@ -0,0 +1,45 @@
+import os
+import unittest
+from unittest import mock
+from Utility.DBConnector import DBConnector
+from Utility.Exceptions import DatabaseException
+
+
+class Test(unittest.TestCase):
+    # after each test, tearDown is executed
+    def tearDown(self) -> None:
+        DBConnector.reloadConfig()
+
+    def test_memoized(self) -> None:
+        DBConnector.config()
+        with mock.patch('Utility.DBConnector.ConfigParser') as parser:
+            self.assertEqual(DBConnector.config(), DBConnector.config())
+            parser.assert_not_called()
+
+    def test_copy(self) -> None:
+        DBConnector.config()['host'] = 'elsewhere'
+        self.assertNotEqual('elsewhere', DBConnector.config()['host'], "callers get their own copy")
+
+    def test_env_override(self) -> None:
+        DBConnector.config()
+        with mock.patch.dict(os.environ, {'PGHOST': 'db.example', 'PGPORT': '6543'}):
+            self.assertNotEqual('db.example', DBConnector.config()['host'], "cached before the override")
+            DBConnector.reloadConfig()
+            params = DBConnector.config()
+        self.assertEqual('db.example', params['host'])
+        self.assertEqual('6543', params['port'])
+
+    def test_schema(self) -> None:
+        with mock.patch.dict(os.environ, {'PGSCHEMA': 'worker_1'}):
+            DBConnector.reloadConfig()
+            params = DBConnector.config()
+        self.assertNotIn('schema', params, "not a connection parameter")
+        self.assertIn('-c search_path=worker_1', params['options'])
+        with mock.patch.dict(os.environ, {'PGSCHEMA': 'worker; DROP'}):
+            DBConnector.reloadConfig()
+            self.assertRaises(DatabaseException.database_ini_ERROR, DBConnector.config)
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
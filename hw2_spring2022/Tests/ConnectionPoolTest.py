@@ -0,0 +1,82 @@
+import unittest
+import Solution
+from Utility.DBConnector import DBConnector, ConnectionPool
+from Utility.Exceptions import DatabaseException
+from Utility.Status import Status
+from Business.File import File
+from Business.Disk import Disk
+
+
+class Test(unittest.TestCase):
+    # before each test, setUp is executed
+    def setUp(self) -> None:
+        self.pool = ConnectionPool(DBConnector.config(), minSize=1, maxSize=2, timeout=0.1)
+
+    # after each test, tearDown is executed
+    def tearDown(self) -> None:
+        self.pool.close()
+
+    def test_reuse(self) -> None:
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        self.assertIs(connection, self.pool.acquire(), "idle connection should be handed out again")
+
+    def test_exhausted(self) -> None:
+        first = self.pool.acquire()
+        second = self.pool.acquire()
+        self.assertIsNot(first, second, "checked out connections are not shared")
+        self.assertRaises(DatabaseException.ConnectionInvalid, self.pool.acquire)
+        self.pool.release(second)
+        self.assertIs(second, self.pool.acquire(), "released connection is available again")
+
+    def test_idle_eviction(self) -> None:
+        first = self.pool.acquire()
+        second = self.pool.acquire()
+        self.pool.release(first)
+        self.pool.release(second)
+        self.assertEqual(2, self.pool.size())
+        self.pool.idleTimeout = 0
+        self.pool.release(self.pool.acquire())
+        self.assertEqual(1, self.pool.size(), "idle connections above minSize are closed")
+
+    def test_broken_connection(self) -> None:
+        connection = self.pool.acquire()
+        connection.close()
+        self.pool.release(connection)
+        self.assertEqual(0, self.pool.size(), "closed connections are dropped from the pool")
+        self.assertFalse(self.pool.acquire().closed, "a fresh connection replaces the dropped one")
+
+    def test_pooled_connector(self) -> None:
+        conn = DBConnector()
+        connection = conn.connection
+        conn.execute("SELECT 1")
+        conn.close()
+        conn = DBConnector()
+        self.assertIs(connection, conn.connection, "close() returns the connection to the pool")
+        conn.close()
+
+    # a call that can not get a connection fails like any other database error
+    @unittest.skipIf(Solution.backendEngine() == 'memory', "the in-memory engine has no pool")
+    def test_exhausted_solution(self) -> None:
+        DBConnector.configurePool(maxSize=1, timeout=0.2)
+        held = DBConnector()
+        try:
+            self.assertEqual(Status.ERROR, Solution.addFile(File(1, "wav", 1)))
+            self.assertEqual(Status.ERROR, Solution.addFileToDisk(File(1, "wav", 1), 1))
+            self.assertEqual(Status.ERROR, Solution.deleteDisk(1))
+            self.assertEqual(None, Solution.getFileByID(1).getFileID())
+            self.assertEqual(None, Solution.getDiskByID(1).getDiskID())
+            self.assertEqual(-1, Solution.averageFileSizeOnDisk(1))
+            self.assertEqual([], Solution.getConflictingDisks())
+            self.assertEqual([], list(Solution.streamConflictingDisks()))
+            self.assertEqual([File.badFile().getFileID()], [file.getFileID() for file in Solution.getFilesByIDs([1])])
+            self.assertEqual([Status.ERROR], Solution.addFilesToDisk([(File(1, "wav", 1), 1)]))
+            self.assertEqual([Status.ERROR], Solution.addDisks([Disk(1, "DELL", 1, 1, 1)]))
+        finally:
+            held.close()
+            DBConnector.configurePool(maxSize=10, timeout=30.0)
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,31 @@
+import unittest
+import IndexAdvisor
+import Solution
+from Utility.DBConnector import PreparedStatement
+from Tests.abstractTest import AbstractTest
+
+
+@unittest.skipIf(Solution.backendEngine() == 'memory', "explains plans of the database")
+class Test(AbstractTest):
+    def test_seq_scans(self) -> None:
+        plan = {"Node Type": "Append", "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "files", "Actual Loops": 1},
+            {"Node Type": "Seq Scan", "Relation Name": "disks", "Actual Loops": 0},
+            {"Node Type": "Index Scan", "Relation Name": "rams", "Actual Loops": 1}]}
+        self.assertEqual(["files"], IndexAdvisor.seqScans(plan), "never executed scans are left out")
+
+    def test_advise(self) -> None:
+        samples = IndexAdvisor.loadDataset(200, 20, 20)
+        PreparedStatement.resetStats()
+        reports = IndexAdvisor.advise(samples)
+        self.assertEqual({0}, {count for stats in PreparedStatement.stats().values() for count in stats.values()},
+                         "explaining a statement is not a call of it")
+        self.assertEqual(len(IndexAdvisor.STATEMENTS), len(reports))
+        for report in reports:
+            self.assertEqual(None, report["error"], report["name"])
+            self.assertTrue(report["time"] >= 0, report["name"])
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
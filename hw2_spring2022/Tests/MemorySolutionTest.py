@@ -0,0 +1,101 @@
+import random
+import types
+import unittest
+from decimal import Decimal
+import Solution
+import MemorySolution
+from Tests.abstractTest import AbstractTest
+from Business.File import File
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+# runs the same random calls against Solution.py on PostgreSQL and against MemorySolution.py
+# and expects the same results, bad arguments included
+@unittest.skipIf(Solution.backendEngine() == 'memory', "Solution.py already runs on the memory engine")
+class Test(AbstractTest):
+    IDS = [1, 2, 3, 4, 5, 6, 0, -1, None, "3", "SIX", 2.5, True, 2 ** 40]
+    TYPES = ["wav", "mp3", None, 7]
+    COMPANIES = ["DELL", "HP", None]
+    SIZES = [0, 1, 2, 5, 10, 40, -3, None, "4"]
+
+    def setUp(self) -> None:
+        super().setUp()
+        MemorySolution.dropTables()
+        MemorySolution.createTables()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        MemorySolution.dropTables()
+
+    # comparable form of a result
+    @staticmethod
+    def normalize(value):
+        if isinstance(value, types.GeneratorType):
+            value = list(value)
+        if isinstance(value, (list, tuple)):
+            return [Test.normalize(item) for item in value]
+        if isinstance(value, File):
+            return "File", value.getFileID(), value.getType(), value.getSize()
+        if isinstance(value, Disk):
+            return ("Disk", value.getDiskID(), value.getCompany(), value.getSpeed(), value.getFreeSpace(),
+                    value.getCost())
+        if isinstance(value, RAM):
+            return "RAM", value.getRamID(), value.getCompany(), value.getSize()
+        if isinstance(value, (float, Decimal)):
+            return round(float(value), 6)
+        return value
+
+    def randomCall(self, rand: random.Random):
+        pick = rand.choice
+        file = lambda: File(pick(Test.IDS), pick(Test.TYPES), pick(Test.SIZES))
+        disk = lambda: Disk(pick(Test.IDS), pick(Test.COMPANIES), pick(Test.SIZES), pick(Test.SIZES * 3),
+                            pick(Test.SIZES))
+        ram = lambda: RAM(pick(Test.IDS), pick(Test.COMPANIES), pick(Test.SIZES))
+        calls = [
+            ("addFile", lambda: (file(),)), ("getFileByID", lambda: (pick(Test.IDS),)),
+            ("deleteFile", lambda: (file(),)), ("addDisk", lambda: (disk(),)),
+            ("getDiskByID", lambda: (pick(Test.IDS),)), ("deleteDisk", lambda: (pick(Test.IDS),)),
+            ("addRAM", lambda: (ram(),)), ("getRAMByID", lambda: (pick(Test.IDS),)),
+            ("deleteRAM", lambda: (pick(Test.IDS),)), ("addDiskAndFile", lambda: (disk(), file())),
+            ("addFileToDisk", lambda: (file(), pick(Test.IDS))),
+            ("removeFileFromDisk", lambda: (file(), pick(Test.IDS))),
+            ("addRAMToDisk", lambda: (pick(Test.IDS), pick(Test.IDS))),
+            ("removeRAMFromDisk", lambda: (pick(Test.IDS), pick(Test.IDS))),
+            ("averageFileSizeOnDisk", lambda: (pick(Test.IDS),)), ("diskTotalRAM", lambda: (pick(Test.IDS),)),
+            ("getCostForType", lambda: (pick(Test.TYPES),)),
+            ("getFilesCanBeAddedToDisk", lambda: (pick(Test.IDS),)),
+            ("getFilesCanBeAddedToDiskAndRAM", lambda: (pick(Test.IDS),)),
+            ("isCompanyExclusive", lambda: (pick(Test.IDS),)), ("getConflictingDisks", lambda: ()),
+            ("mostAvailableDisks", lambda: ()), ("getCloseFiles", lambda: (pick(Test.IDS),)),
+            ("addFiles", lambda: ([file() for _ in range(3)],)),
+            ("addFilesToDisk", lambda: ([(file(), pick(Test.IDS)) for _ in range(3)],)),
+            ("getFilesByIDs", lambda: ([pick(Test.IDS) for _ in range(3)],)),
+            ("areCompaniesExclusive", lambda: ([pick(Test.IDS) for _ in range(3)],)),
+            ("streamFiles", lambda: ()), ("streamFilesOfDisk", lambda: (pick(Test.IDS),)),
+        ]
+        # the adds are more likely, so the tables fill up
+        name, args = pick(calls[:1] * 4 + calls[3:4] * 3 + calls[6:7] * 2 + calls[10:11] * 4 + calls)
+        return name, args()
+
+    def test_same_results(self) -> None:
+        rand = random.Random(236363)
+        for step in range(600):
+            name, args = self.randomCall(rand)
+            expected = Test.normalize(getattr(Solution, name)(*args))
+            actual = Test.normalize(getattr(MemorySolution, name)(*args))
+            self.assertEqual(expected, actual, "step {} {}{}".format(step, name, Test.normalize(list(args))))
+
+    def test_dropped_tables(self) -> None:
+        Solution.dropTables()
+        MemorySolution.dropTables()
+        for name, args in [("addFile", (File(1, "wav", 1),)), ("getDiskByID", (1,)), ("deleteDisk", (1,)),
+                           ("addRAMToDisk", (1, 1)), ("getCloseFiles", (1,)), ("mostAvailableDisks", ()),
+                           ("addFilesToDisk", ([(File(1, "wav", 1), 1)],)), ("streamDisks", ())]:
+            self.assertEqual(Test.normalize(getattr(Solution, name)(*args)),
+                             Test.normalize(getattr(MemorySolution, name)(*args)), name)
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,29 @@
+import unittest
+import Solution
+from Utility.Status import Status
+from Utility.DBConnector import PreparedStatement
+from Tests.abstractTest import AbstractTest
+from Business.File import File
+
+
+@unittest.skipIf(Solution.backendEngine() == 'memory', "prepares statements on the database")
+class Test(AbstractTest):
+    def test_plan_reuse(self) -> None:
+        self.assertEqual(Status.OK, Solution.addFile(File(1, "wav", 10)), "Should work")
+        PreparedStatement.resetStats()
+        for _ in range(10):
+            self.assertEqual(1, Solution.getFileByID(1).getFileID(), "Should work")
+        stats = PreparedStatement.stats()["get_file"]
+        self.assertEqual(10, stats["executions"])
+        self.assertLessEqual(stats["prepares"], 1, "prepared at most once on the pooled connection")
+        self.assertGreaterEqual(stats["reuses"], 9)
+
+    def test_bound_parameters(self) -> None:
+        self.assertEqual(Status.OK, Solution.addFile(File(1, "it's", 10)), "quotes are bound, not inlined")
+        self.assertEqual("it's", Solution.getFileByID(1).getType(), "Should work")
+        self.assertEqual(None, Solution.getFileByID(2).getFileID(), "NO File ID 2")
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
@@ -0,0 +1,78 @@
+import io
+import unittest
+from array import array
+from types import SimpleNamespace
+from Utility.DBConnector import ResultSet, ResultSetDict, numpy
+
+INTEGER, TEXT, DOUBLE = 23, 25, 701
+
+
+def resultSet(header: list, rows: list, types: list = None) -> ResultSet:
+    types = types or [None] * len(header)
+    return ResultSet([SimpleNamespace(name=name, type_code=code) for name, code in zip(header, types)], rows)
+
+
+class Test(unittest.TestCase):
+    def test_rows(self) -> None:
+        rows = [(1, "Roei"), (2, "Noa")]
+        result = resultSet(["id", "name"], rows)
+        self.assertIs(rows, result.rows, "the fetched list is not copied")
+        self.assertEqual(2, result.size())
+        self.assertEqual({"id": 2, "name": "Noa"}, result[1])
+        self.assertEqual("Noa", result[1]["NAME"], "columns are case insensitive")
+        self.assertEqual(None, result[1][0], "only names are columns")
+        self.assertEqual(["id", "name"], list(result[0]))
+        self.assertEqual(1, result[0].get("id"))
+        self.assertEqual(None, result[0].get("age"))
+        self.assertRaises(KeyError, lambda: result[0]["age"])
+        self.assertEqual(1, result.cols["Name"])
+        self.assertEqual(ResultSetDict(), result[2], "invalid row")
+
+    def test_header_case(self) -> None:
+        result = resultSet(["ID", "n", "n"], [(1, 2, 3)])
+        self.assertEqual({"ID": 1, "n": 3}, result[0], "the last of equal names wins")
+        self.assertRaises(KeyError, lambda: result[0]["ID"])  # looked up lowercased, as before
+        self.assertEqual(3, result[0]["N"])
+        self.assertEqual([("ID", 1), ("n", 3)], list(result[0].items()))
+
+    def test_empty(self) -> None:
+        result = ResultSet()
+        self.assertTrue(result.isEmpty())
+        self.assertEqual([], result.cols_header)
+
+    def test_columns(self) -> None:
+        result = resultSet(["id", "type", "size", "ratio"], [(1, "wav", 10, 0.5), (2, "mp3", None, 1.5)],
+                           [INTEGER, TEXT, INTEGER, DOUBLE])
+        columns = result.toColumns()
+        self.assertEqual(["id", "type", "size", "ratio"], list(columns))
+        self.assertEqual(array('q', [1, 2]), columns["id"])
+        self.assertEqual(["wav", "mp3"], columns["type"])
+        self.assertEqual([10, None], columns["size"], "a NULL makes it a list")
+        self.assertEqual(array('d', [0.5, 1.5]), columns["ratio"])
+        self.assertEqual({}, ResultSet().toColumns())
+
+    @unittest.skipIf(numpy is None, "needs numpy")
+    def test_numpy(self) -> None:
+        result = resultSet(["id", "type", "size"], [(1, "wav", 10), (2, "mp3", 20), (3, "wav", None)],
+                           [INTEGER, TEXT, INTEGER])
+        arrays = result.toNumpy(categorical=["type"])
+        self.assertEqual(numpy.int64, arrays["id"].dtype)
+        self.assertEqual([1, 2, 3], arrays["id"].tolist())
+        codes, labels = arrays["type"]
+        self.assertEqual(["mp3", "wav"], labels.tolist())
+        self.assertEqual([1, 0, 1], codes.tolist())
+        self.assertEqual(object, arrays["size"].dtype)
+        self.assertEqual([-1], resultSet(["type"], [(None,)]).toNumpy(categorical=["type"])["type"][0].tolist())
+
+    def test_str(self) -> None:
+        result = resultSet(["id", "name"], [(1, "Roei"), (10, None)])
+        self.assertEqual("id   name\n1    Roei\n10   None\n", str(result))
+        self.assertEqual("\n", str(ResultSet()))
+        output = io.StringIO()
+        resultSet(["id"], [(i,) for i in range(1, 6)]).write(output, limit=2)
+        self.assertEqual("id\n1\n2\n... (3 more rows)\n", output.getvalue())
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
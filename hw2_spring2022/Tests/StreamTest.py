@@ -0,0 +1,83 @@
+import unittest
+import psycopg2
+import Solution
+from array import array
+from Utility.DBConnector import DBConnector, PreparedStatement
+from Utility.Status import Status
+from Tests.abstractTest import AbstractTest
+from Business.File import File
+from Business.RAM import RAM
+from Business.Disk import Disk
+
+
+class Test(AbstractTest):
+    def test_stream_tables(self) -> None:
+        for fileID in [5, 2, 9, 1]:
+            self.assertEqual(Status.OK, Solution.addFile(File(fileID, "wav", fileID * 10)), "Should work")
+        self.assertEqual(Status.OK, Solution.addDisk(Disk(1, "DELL", 10, 100, 10)), "Should work")
+        self.assertEqual(Status.OK, Solution.addRAM(RAM(1, "Kingston", 8)), "Should work")
+        files = Solution.streamFiles(batchSize=3)
+        self.assertEqual([(1, 10), (2, 20), (5, 50), (9, 90)], [(file.getFileID(), file.getSize()) for file in files])
+        self.assertEqual([1], [disk.getDiskID() for disk in Solution.streamDisks()])
+        self.assertEqual([(1, "Kingston", 8)], [(ram.getRamID(), ram.getCompany(), ram.getSize())
+                                                 for ram in Solution.streamRAMs()])
+
+    def test_stream_files_of_disk(self) -> None:
+        self.assertEqual(Status.OK, Solution.addDisk(Disk(1, "DELL", 10, 100, 10)), "Should work")
+        self.assertEqual(Status.OK, Solution.addDisk(Disk(2, "DELL", 10, 100, 10)), "Should work")
+        for fileID in range(1, 8):
+            self.assertEqual(Status.OK, Solution.addFile(File(fileID, "wav", 1)), "Should work")
+            self.assertEqual(Status.OK, Solution.addFileToDisk(File(fileID, "wav", 1), 1 + fileID % 2),
+                             "Should work")
+        self.assertEqual([1, 3, 5, 7], [file.getFileID() for file in Solution.streamFilesOfDisk(2, batchSize=2)])
+        self.assertEqual([], list(Solution.streamFilesOfDisk(3)), "NO Disk ID 3")
+        self.assertEqual([], list(Solution.streamFilesOfDisk("SIX")), "bad id")
+        # an abandoned stream gives its connection back
+        stream = Solution.streamFilesOfDisk(1, batchSize=1)
+        self.assertEqual(2, next(stream).getFileID())
+        stream.close()
+        self.assertEqual([2, 4, 6], [file.getFileID() for file in Solution.streamFilesOfDisk(1)])
+
+    @unittest.skipIf(Solution.backendEngine() == 'memory', "streams from the database")
+    def test_stream_fails_midway(self) -> None:
+        failing = PreparedStatement("stream_fails_midway", """
+                                    SELECT i, 'wav', 10 / (3 - i) FROM generate_series(1, 5) AS i
+                                    """)
+        stream = Solution.streamRows(failing, (), Solution.createFile, 1)
+        self.assertEqual([1, 2], [next(stream).getFileID() for _ in range(2)])
+        self.assertRaises(psycopg2.DataError, next, stream)  # division by zero on the third row, not a short stream
+        self.assertEqual(Status.OK, Solution.addFile(File(1, "wav", 1)), "the connection was given back")
+        self.assertEqual([1], [file.getFileID() for file in Solution.streamFiles()])
+
+    @unittest.skipIf(Solution.backendEngine() == 'memory', "streams from the database")
+    def test_server_side_cursor(self) -> None:
+        conn = DBConnector()
+        try:
+            rows = conn.stream("SELECT i FROM generate_series(1, %s) AS i", args=(2500,), batchSize=1000)
+            self.assertEqual(list(range(1, 2501)), [row[0] for row in rows])
+            statement = PreparedStatement("stream_test", "SELECT $2::TEXT || '%' || $1::TEXT")
+            self.assertEqual(("SELECT %s::TEXT || '%%' || %s::TEXT", ("b", "a")), statement.inline(("a", "b")))
+            self.assertEqual([("b%a",)], list(conn.stream(statement, args=("a", "b"))))
+            conn.commit()
+        finally:
+            conn.close()
+
+    @unittest.skipIf(Solution.backendEngine() == 'memory', "streams from the database")
+    def test_columns(self) -> None:
+        conn = DBConnector()
+        try:
+            columns = conn.columns("""SELECT i AS id, 'f' || i AS name, CASE WHEN i > 2 THEN i END AS size
+                                      FROM generate_series(1, %s) AS i""", args=(5,), batchSize=2)
+            self.assertEqual(array('q', [1, 2, 3, 4, 5]), columns["id"])
+            self.assertEqual(["f1", "f2", "f3", "f4", "f5"], columns["name"])
+            self.assertEqual([None, None, 3, 4, 5], columns["size"])
+            empty = conn.columns("SELECT 1 AS id WHERE FALSE")
+            self.assertEqual({"id": array('q')}, empty)
+            conn.commit()
+        finally:
+            conn.close()
+
+
+# *** DO NOT RUN EACH TEST MANUALLY ***
+if __name__ == '__main__':
+    unittest.main(verbosity=2, exit=False)
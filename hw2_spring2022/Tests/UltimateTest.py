@@ -8,11 +8,11 @@ from Business.Disk import Disk
 
 
 
-class Test(unittest.TestCase):
+class Test(AbstractTest):
 
     # before each test, setUp is executed
     def setUp(self) -> None:
-        Solution.createTables()
+        super().setUp()
 
         # Objects to play with in the coming tests
         self.file1 = File(1, "wav", 1)
@@ -42,7 +42,7 @@ class Test(unittest.TestCase):
 
     # after each test, tearDown is executed
     def tearDown(self) -> None:
-        Solution.dropTables()
+        super().tearDown()
 
     def testFile(self) -> None:
         self.assertEqual(Status.OK, Solution.addFile(self.file1), "Should work")
@@ -1,12 +1,33 @@
+import atexit
+import os
 import unittest
 import Solution
 
+# how the tables are reset between tests, set by the TEST_FIXTURE environment variable:
+#   truncate - (default) the tables are created once for the whole run, emptied by Solution.clearTables
+#              after each test and dropped when the run ends
+#   ddl      - the tables are created before each test and dropped after it
+FIXTURE = os.environ.get("TEST_FIXTURE", "truncate").strip().lower()
+_created = False
+
 
 class AbstractTest(unittest.TestCase):
     # before each test, setUp is executed
     def setUp(self) -> None:
-        Solution.createTables()
+        global _created
+        if FIXTURE == "ddl":
+            Solution.createTables()
+        elif not _created or not Solution.tablesExist():
+            # first test of the run (tables left by an earlier run are replaced), or a test dropped the tables
+            Solution.dropTables()
+            Solution.createTables()
+            if not _created:
+                _created = True
+                atexit.register(Solution.dropTables)
 
     # after each test, tearDown is executed
     def tearDown(self) -> None:
-        Solution.dropTables()
+        if FIXTURE == "ddl":
+            Solution.dropTables()
+        elif Solution.tablesExist():
+            Solution.clearTables()
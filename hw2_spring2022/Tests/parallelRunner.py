@@ -0,0 +1,103 @@
+import argparse
+import glob
+import io
+import multiprocessing
+import os
+import sys
+import time
+import unittest
+from psycopg2 import sql
+import Solution
+from Utility.DBConnector import DBConnector
+
+# runs the test cases of the Tests package in N processes. each worker gets its own schema (see the schema key
+# of the [postgresql] section in DBConnector), created before the run and dropped with everything in it after:
+#   python -m Tests.parallelRunner [-j N] [Tests.SimpleTest Tests.dbTest.Test.test_Disk ...]
+# with no names every Tests/*Test.py module is run
+
+
+# the ids of the test cases in a suite, in order
+def testIDs(suite) -> list:
+    if isinstance(suite, unittest.TestSuite):
+        return [testID for test in suite for testID in testIDs(test)]
+    return [suite.id()]
+
+
+# deals the test cases round robin, so the cases of one module are spread over all the workers
+def shard(ids: list, workers: int) -> list:
+    return [ids[worker::workers] for worker in range(workers) if ids[worker::workers]]
+
+
+# names of the schemas of this run, unique per runner process so that runs can share a database
+def schemaNames(workers: int) -> list:
+    return ["tests_{}_{}".format(os.getpid(), worker) for worker in range(workers)]
+
+
+def createSchemas(schemas: list):
+    conn = DBConnector(pooled=False)
+    try:
+        for schema in schemas:
+            conn.execute(sql.SQL("CREATE SCHEMA {}").format(sql.Identifier(schema)))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def dropSchemas(schemas: list):
+    conn = DBConnector(pooled=False)
+    try:
+        for schema in schemas:
+            conn.execute(sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(sql.Identifier(schema)))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# runs in a worker process, schema is None when the tests need no database schema (memory engine)
+def runShard(schema, ids: list) -> dict:
+    if schema is not None:
+        os.environ["PGSCHEMA"] = schema
+        DBConnector.reloadConfig()
+    stream = io.StringIO()
+    result = unittest.TextTestRunner(stream=stream, verbosity=1).run(unittest.defaultTestLoader.loadTestsFromNames(ids))
+    return {"run": result.testsRun, "failures": len(result.failures), "errors": len(result.errors),
+            "skipped": len(result.skipped), "output": stream.getvalue()}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the tests in parallel processes, one schema per process")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("names", nargs="*", help="test modules, classes or cases (default: Tests/*Test.py)")
+    options = parser.parse_args(argv)
+
+    names = options.names or ["Tests." + os.path.splitext(os.path.basename(path))[0]
+                              for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*Test.py")))]
+    shards = shard(testIDs(unittest.defaultTestLoader.loadTestsFromNames(names)), max(options.workers, 1))
+    if not shards:
+        print("no tests")
+        return 0
+
+    schemas = [None] * len(shards)
+    if Solution.backendEngine() != 'memory':
+        schemas = schemaNames(len(shards))
+        createSchemas(schemas)
+    start = time.monotonic()
+    try:
+        # spawned workers start with no connections, pools or caches of this process
+        with multiprocessing.get_context("spawn").Pool(len(shards)) as pool:
+            results = pool.starmap(runShard, zip(schemas, shards))
+    finally:
+        if schemas[0] is not None:
+            dropSchemas(schemas)
+
+    for worker, result in enumerate(results):
+        print("=== worker {} ({}) ===".format(worker, schemas[worker] or "memory"))
+        print(result["output"].rstrip())
+    total = {key: sum(result[key] for result in results) for key in ["run", "failures", "errors", "skipped"]}
+    print("Ran {run} tests in {time:.3f}s with {workers} workers: {failures} failures, {errors} errors, "
+          "{skipped} skipped".format(time=time.monotonic() - start, workers=len(shards), **total))
+    return 1 if total["failures"] or total["errors"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
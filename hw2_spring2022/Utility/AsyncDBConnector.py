@@ -0,0 +1,337 @@
+import asyncio
+import itertools
+import time
+import weakref
+from collections import deque
+from typing import AsyncIterator, Union
+import psycopg2
+from psycopg2 import errors, extensions, sql
+from Utility.DBConnector import DBConnector, PreparedStatement, ResultSet
+from Utility.Exceptions import DatabaseException
+
+# an asyncio counterpart of DBConnector, on the asynchronous connections of psycopg2: a statement is sent
+# and its result awaited through the event loop (add_reader/add_writer on the connection's socket),
+# so one thread serves any number of concurrent callers over a few connections.
+# usage mirrors DBConnector, with awaits:
+#   conn = await AsyncDBConnector.connect()
+#   try:
+#       rows_effected, result = await conn.execute(query, args=(...))
+#       await conn.commit()
+#   except DatabaseException.UNIQUE_VIOLATION:
+#       await conn.rollback()
+#   finally:
+#       await conn.close()
+# an asynchronous connection is always in autocommit, so the connector opens a transaction (BEGIN, sent with
+# the first statement) and ends it on commit/rollback, like psycopg2 does for a DBConnector.
+# asynchronous connections can not COPY and have no named cursors, see copy and stream
+
+
+# waits, without blocking the event loop, until the operation running on connection is done.
+# raises what the operation raised
+async def wait(connection):
+    loop = asyncio.get_running_loop()
+    while True:
+        state = connection.poll()
+        if state == extensions.POLL_OK:
+            return
+        future = loop.create_future()
+        fileno = connection.fileno()
+        if state == extensions.POLL_READ:
+            loop.add_reader(fileno, _wakeUp, future)
+            remove = loop.remove_reader
+        elif state == extensions.POLL_WRITE:
+            loop.add_writer(fileno, _wakeUp, future)
+            remove = loop.remove_writer
+        else:
+            raise psycopg2.OperationalError("Unexpected poll state {}".format(state))
+        try:
+            await future
+        finally:
+            remove(fileno)
+
+
+def _wakeUp(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AsyncConnectionPool:
+    # the connections of one event loop (they are bound to its sockets), see ConnectionPool for the settings.
+    # a connection is given back with its transaction rolled back, or closed if that fails
+    def __init__(self, params: dict, maxSize=10, idleTimeout=300.0, timeout=30.0):
+        self.params = params
+        self.maxSize = maxSize
+        self.idleTimeout = idleTimeout
+        self.timeout = timeout
+        self.__idle = deque()  # (connection, lastUsed), the most recently used last
+        self.__slots = asyncio.Semaphore(maxSize)
+        self.__size = 0
+        self.__closed = False
+
+    # connections open, checked out or idle
+    def size(self):
+        return self.__size
+
+    # connections waiting in the pool
+    def idle(self):
+        return len(self.__idle)
+
+    # take an idle connection or open a new one, waits up to timeout seconds for a free slot
+    async def acquire(self):
+        if self.__closed:
+            raise DatabaseException.ConnectionInvalid("Connection pool is closed")
+        try:
+            await asyncio.wait_for(self.__slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise DatabaseException.ConnectionInvalid("Connection pool exhausted")
+        try:
+            self.__evictIdle()
+            while self.__idle:
+                connection, _ = self.__idle.pop()
+                if not connection.closed:
+                    return connection
+                self.__size -= 1
+            connection = await AsyncConnectionPool.__connect(self.params)
+            self.__size += 1
+            return connection
+        except BaseException:
+            self.__slots.release()
+            raise
+
+    # give a connection back, any open transaction is rolled back first
+    async def release(self, connection, discard=False):
+        try:
+            if not discard and not connection.closed and \
+                    connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    cursor = connection.cursor()
+                    cursor.execute("ROLLBACK")
+                    await wait(connection)
+                except Exception:
+                    discard = True
+            if discard or connection.closed or self.__closed:
+                connection.close()
+                self.__size -= 1
+            else:
+                self.__idle.append((connection, time.monotonic()))
+        finally:
+            self.__slots.release()
+
+    # close all idle connections, connections still checked out are closed when released
+    def close(self):
+        self.__closed = True
+        while self.__idle:
+            connection, _ = self.__idle.popleft()
+            connection.close()
+            self.__size -= 1
+
+    def __evictIdle(self):
+        now = time.monotonic()
+        while self.__idle and now - self.__idle[0][1] > self.idleTimeout:
+            connection, _ = self.__idle.popleft()
+            connection.close()
+            self.__size -= 1
+
+    @staticmethod
+    async def __connect(params: dict):
+        connection = None
+        try:
+            connection = psycopg2.connect(async_=True, **params)
+            await wait(connection)
+            return connection
+        except Exception:
+            if connection is not None:
+                connection.close()
+            raise DatabaseException.ConnectionInvalid("Could not connect to database")
+
+
+class AsyncDBConnector:
+    # the pool of each event loop, created on first use with the settings of configurePool
+    __pools = weakref.WeakKeyDictionary()
+    __poolSettings = {}
+    # names of the cursors DECLAREd by stream
+    __cursorNames = itertools.count()
+
+    def __init__(self, connection, pool: AsyncConnectionPool = None):
+        self.connection = connection
+        self.cursor = connection.cursor()
+        self.__pool = pool
+        # a statement was interrupted (e.g. its task was cancelled), the connection can not be reused
+        self.__broken = False
+
+    # open a connector, a pooled one borrows its connection from the pool of the running event loop
+    @staticmethod
+    async def connect(pooled=True) -> 'AsyncDBConnector':
+        if pooled:
+            pool = AsyncDBConnector.getPool()
+            return AsyncDBConnector(await pool.acquire(), pool)
+        try:
+            connection = psycopg2.connect(async_=True, **DBConnector.config())
+            await wait(connection)
+        except DatabaseException.database_ini_ERROR:
+            raise
+        except Exception:
+            raise DatabaseException.ConnectionInvalid("Could not connect to database")
+        return AsyncDBConnector(connection)
+
+    # close connection, a pooled connection is returned to the pool instead
+    async def close(self):
+        if self.connection is None:
+            return
+        connection, self.connection = self.connection, None
+        self.cursor.close()
+        self.cursor = None
+        if self.__pool is not None:
+            await self.__pool.release(connection, discard=self.__broken)
+        else:
+            connection.close()
+
+    # get the pool of the running event loop, creating it on first use
+    @staticmethod
+    def getPool() -> AsyncConnectionPool:
+        loop = asyncio.get_running_loop()
+        pool = AsyncDBConnector.__pools.get(loop)
+        if pool is None:
+            pool = AsyncDBConnector.__pools[loop] = AsyncConnectionPool(DBConnector.config(),
+                                                                        **AsyncDBConnector.__poolSettings)
+        return pool
+
+    # change the pool settings (maxSize, idleTimeout, timeout) of the pools created from now on,
+    # the pool of the running event loop (if called from one) is closed
+    @staticmethod
+    def configurePool(**settings):
+        AsyncDBConnector.closePool()
+        AsyncDBConnector.__poolSettings = dict(AsyncDBConnector.__poolSettings, **settings)
+
+    # close the pool of the running event loop
+    @staticmethod
+    def closePool():
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no event loop, no pool
+        pool = AsyncDBConnector.__pools.pop(loop, None)
+        if pool is not None:
+            pool.close()
+
+    # commit changes
+    async def commit(self):
+        if self.connection is not None and self.__inTransaction():
+            try:
+                await self.__run("COMMIT")
+            except Exception:
+                raise DatabaseException.ConnectionInvalid("Could not commit changes")
+
+    # rollback connection's changes
+    async def rollback(self):
+        if self.connection is not None and self.__inTransaction():
+            try:
+                await self.__run("ROLLBACK")
+            except Exception:
+                raise DatabaseException.ConnectionInvalid("Could not rollback changes")
+
+    # executes the query like DBConnector.execute, returns the number of rows effected and a ResultSet (for SELECT)
+    async def execute(self, query: Union[str, sql.Composed, PreparedStatement], printSchema=False,
+                      args: tuple = None) -> (int, ResultSet):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+
+        statement = query if isinstance(query, PreparedStatement) else None
+        if isinstance(query, sql.Composable):
+            query = query.as_string(self.connection)
+        try:
+            if statement is not None:
+                prepare = statement.prepareQuery(self.connection)
+                if prepare is not None:
+                    await self.__run(prepare)
+                    statement.prepared(self.connection)
+                query = statement.executeQuery()
+            await self.__run(query, args)
+            row_effected = max(self.cursor.rowcount, 0)
+        except errors.lookup("26000"):
+            # the prepared statement is gone from the session, it will be prepared again next time
+            if statement is not None:
+                statement.forget(self.connection)
+            raise
+
+        # get entries in case of SELECT
+        if self.cursor.description is not None:
+            entries = ResultSet(self.cursor.description, self.cursor.fetchall())
+        else:
+            entries = ResultSet()
+
+        # print SELECT entries, the first PRINT_LIMIT of them
+        if printSchema:
+            entries.write(limit=DBConnector.PRINT_LIMIT)
+
+        return row_effected, entries
+
+    # yields the rows of a SELECT like DBConnector.stream, batchSize at a time, from a cursor DECLAREd in the
+    # current transaction (an asynchronous connection has no named cursors). commit or rollback once the rows
+    # are consumed or the iteration is abandoned
+    async def stream(self, query: Union[str, sql.Composed, PreparedStatement], args: tuple = None,
+                     batchSize=1000) -> AsyncIterator[tuple]:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        if isinstance(query, PreparedStatement):
+            query, args = query.inline(args)
+        elif isinstance(query, sql.Composable):
+            query = query.as_string(self.connection)
+        name = "stream_{}".format(next(AsyncDBConnector.__cursorNames))
+        await self.__run("DECLARE " + name + " NO SCROLL CURSOR FOR " + query, args)
+        try:
+            while True:
+                await self.__run("FETCH FORWARD {} FROM {}".format(int(batchSize), name))
+                rows = self.cursor.fetchall()
+                if not rows:
+                    return
+                for row in rows:
+                    yield row
+        finally:
+            if self.connection is not None and not self.__broken and \
+                    self.connection.get_transaction_status() == extensions.TRANSACTION_STATUS_INTRANS:
+                await self.__run("CLOSE " + name)
+
+    # adds rows (tuples in the order of columns) to table like DBConnector.copy. an asynchronous connection
+    # can not COPY, so they are sent as multi-row INSERTs of up to pageSize rows, the values parsed by the
+    # server like COPY parses them (a value that does not fit its column fails the statement).
+    # returns the number of rows added
+    async def copy(self, table: str, columns: list, rows, pageSize=1000) -> int:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        insert = sql.SQL("INSERT INTO {table} ({columns}) VALUES ").format(
+            table=sql.Identifier(table),
+            columns=sql.SQL(", ").join(sql.Identifier(column) for column in columns)).as_string(self.connection)
+        placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        added = 0
+        rows = iter(rows)
+        while True:
+            page = list(itertools.islice(rows, pageSize))
+            if not page:
+                return added
+            values = ", ".join(self.cursor.mogrify(placeholders, AsyncDBConnector.__asText(row)).decode()
+                               for row in page)
+            await self.__run(insert + values)
+            added += max(self.cursor.rowcount, 0)
+
+    # COPY sends every value but None as its str(), an INSERT of the str() has the server parse it the same way
+    @staticmethod
+    def __asText(row: tuple) -> tuple:
+        return tuple(None if value is None else str(value) for value in row)
+
+    def __inTransaction(self) -> bool:
+        return self.connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE
+
+    # sends query, opening a transaction first if none is open, and waits for its result
+    async def __run(self, query: str, args: tuple = None):
+        if not self.__inTransaction() and query not in ("COMMIT", "ROLLBACK"):
+            query = "BEGIN; " + query  # one round trip for both, the result is the query's
+        try:
+            with DBConnector.violations():
+                self.cursor.execute(query, args)
+                await wait(self.connection)
+        except BaseException:
+            if self.connection.isexecuting():
+                # interrupted (e.g. its task was cancelled) with the statement in flight
+                self.__broken = True
+            raise
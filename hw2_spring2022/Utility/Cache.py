@@ -0,0 +1,236 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from Utility.DBConnector import DBConnector, NotificationListener
+from Utility.Exceptions import DatabaseException
+
+
+class ObjectCache:
+    # an in-process LRU cache of rows, keyed by id
+    # maxEntries - upper bound on cached rows
+    # maxBytes   - upper bound on the estimated memory of the cached rows (None for no bound)
+    # ttl        - seconds a row is served before it is read again (None for no expiry)
+    # a disabled cache never stores anything and every get() is a miss
+    def __init__(self, enabled=False, maxEntries=10000, maxBytes=None, ttl=None):
+        self.enabled = enabled
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.__entries = OrderedDict()  # key -> (row, size, stored at), least recently used first
+        self.__bytes = 0
+        self.__generation = 0  # bumped by every invalidation, see token()
+        self.__lock = threading.Lock()
+
+    # the cached row of key, or None on a miss
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self.__lock:
+            entry = self.__lookup(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                self.__remove(key)
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    # take a token before reading the database and hand it to put(), a row read before
+    # an invalidation that happened meanwhile is then not cached
+    def token(self) -> int:
+        with self.__lock:
+            return self.__generation
+
+    def put(self, key, row, token=None):
+        if not self.enabled:
+            return
+        size = ObjectCache.__sizeOf(key, row)
+        with self.__lock:
+            if token is not None and token != self.__generation:
+                return
+            if self.__lookup(key) is not None:
+                self.__remove(key)
+            self.__entries[key] = (row, size, time.monotonic())
+            self.__bytes += size
+            while self.__entries and (len(self.__entries) > self.maxEntries or
+                                      (self.maxBytes is not None and self.__bytes > self.maxBytes)):
+                oldest = next(iter(self.__entries))
+                self.__remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self.__lock:
+            self.__generation += 1
+            if self.__lookup(key) is not None:
+                self.__remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__generation += 1
+            self.__entries.clear()
+            self.__bytes = 0
+
+    def stats(self) -> dict:
+        with self.__lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'invalidations': self.invalidations, 'entries': len(self.__entries), 'bytes': self.__bytes}
+
+    def resetStats(self):
+        with self.__lock:
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def __lookup(self, key):
+        try:
+            return self.__entries.get(key)
+        except TypeError:  # unhashable keys are never cached
+            return None
+
+    def __remove(self, key):
+        _, size, _ = self.__entries.pop(key)
+        self.__bytes -= size
+
+    # estimated memory of an entry: the key, the row tuple and its values
+    @staticmethod
+    def __sizeOf(key, row) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+
+
+# the caches in front of Solution.py's getters, one per table, configured by the [cache] section of database.ini:
+#   enabled = true|false, max_entries = <rows>, max_bytes = <bytes>, ttl = <seconds>, listen = true|false
+# with listen on, rows changed by other processes are evicted as the database triggers of Solution.py
+# NOTIFY them on CHANNEL as "<table>:<id>", or "<table>:*" when the whole table is emptied
+CHANNEL = 'cache_invalidation'
+_caches = {}
+_settings = None
+_listen = True
+_listener = None
+_lock = threading.Lock()
+
+
+def getCache(table: str) -> ObjectCache:
+    with _lock:
+        _loadSettings()
+        if table not in _caches:
+            _caches[table] = ObjectCache(**_settings)
+        cache = _caches[table]
+        stopped = _syncListener()
+    if stopped is not None:
+        stopped.stop()
+    return cache
+
+
+# change the settings of every cache (enabled, maxEntries, maxBytes, ttl, listen), cached rows are dropped
+def configure(**settings):
+    global _settings, _listen
+    with _lock:
+        _loadSettings()
+        _listen = settings.pop('listen', _listen)
+        _settings = dict(_settings, **settings)
+        for cache in _caches.values():
+            cache.clear()
+            for name, value in settings.items():
+                setattr(cache, name, value)
+        stopped = _syncListener()
+    if stopped is not None:
+        stopped.stop()
+
+
+def clearAll():
+    with _lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+
+
+def stats() -> dict:
+    with _lock:
+        caches = dict(_caches)
+    return {table: cache.stats() for table, cache in caches.items()}
+
+
+# the running invalidation listener, or None
+def listener():
+    return _listener
+
+
+def _loadSettings():
+    global _settings, _listen
+    if _settings is None:
+        _settings = _readSettings()
+        _listen = _settings.pop('listen', _listen)
+
+
+# run the listener while some cache is enabled and listen is on, called with _lock held.
+# returns the listener to stop, if any: the caller stops it once _lock is released, since stopping waits
+# for the listener thread and that thread takes _lock to evict
+def _syncListener():
+    global _listener
+    wanted = _listen and bool(_settings.get('enabled')) and bool(_caches)
+    if wanted and _listener is None:
+        _listener = NotificationListener(CHANNEL, _evict, onReset=clearAll)
+        _listener.start()
+    elif not wanted and _listener is not None:
+        stopped, _listener = _listener, None
+        return stopped
+    return None
+
+
+def _evict(payload: str):
+    table, _, key = payload.partition(':')
+    with _lock:
+        cache = _caches.get(table.lower())
+    if cache is None:
+        return
+    if key == '*':
+        cache.clear()
+    else:
+        cache.invalidate(int(key))
+
+
+# a forked child has no listener thread and its cached rows may already be stale
+def _afterFork():
+    global _lock, _listener
+    _lock = threading.Lock()
+    _listener = None
+    clearAll()
+    if _settings is not None:
+        with _lock:
+            _syncListener()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_afterFork)
+
+
+def _readSettings() -> dict:
+    try:
+        section = DBConnector.config('cache')
+    except DatabaseException.database_ini_ERROR:
+        return {}
+    settings = {}
+    if 'enabled' in section:
+        settings['enabled'] = _isTrue(section['enabled'])
+    if 'max_entries' in section:
+        settings['maxEntries'] = int(section['max_entries'])
+    if 'max_bytes' in section:
+        settings['maxBytes'] = int(section['max_bytes'])
+    if 'ttl' in section:
+        settings['ttl'] = float(section['ttl'])
+    if 'listen' in section:
+        settings['listen'] = _isTrue(section['listen'])
+    return settings
+
+
+def _isTrue(value: str) -> bool:
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
@@ -1,9 +1,26 @@
 import psycopg2
-from psycopg2 import errors, sql
+from psycopg2 import errors, extensions, sql
 from configparser import ConfigParser
 from Utility.Exceptions import DatabaseException
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from contextlib import contextmanager
+import io
+import itertools
 import os
-from typing import Union
+import re
+import select
+import sys
+import threading
+import time
+import weakref
+from typing import Iterator, Union
+
+try:
+    import numpy
+except ImportError:  # optional, only ResultSet.toNumpy and numpyColumns need it
+    numpy = None
 
 
 class ResultSetDict(dict):
@@ -13,12 +30,127 @@ class ResultSetDict(dict):
         return super().__getitem__(item.lower())
 
 
+class ResultSetRow(Mapping):
+    # a read-only view of one row of a ResultSet, like the dict of column -> value it replaces.
+    # the rows of a ResultSet share its column maps, so a row costs one small object and no copy of the values.
+    # a column is looked up by its lowercased name, lowercased once per ResultSet for each spelling asked for
+    __slots__ = ('_values', '_columns', '_lookup')
+
+    def __init__(self, values: tuple, columns: dict, lookup: dict):
+        self._values = values
+        self._columns = columns  # column name -> index, in header order, the last of equal names wins
+        self._lookup = lookup  # name as asked for -> index
+
+    def __getitem__(self, item):
+        if type(item) is not str:
+            return None
+        index = self._lookup.get(item)
+        if index is None:
+            index = self._lookup[item] = self._columns[item.lower()]
+        return self._values[index]
+
+    def __contains__(self, item):
+        return item in self._columns
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    # the columns by their own names, a header that is not lowercase can not be looked up (as before) but is listed
+    def _asdict(self) -> dict:
+        return {col: self._values[index] for col, index in self._columns.items()}
+
+    def keys(self):
+        return self._columns.keys()
+
+    def values(self):
+        return self._asdict().values()
+
+    def items(self):
+        return self._asdict().items()
+
+    def __eq__(self, other):
+        if isinstance(other, ResultSetRow):
+            other = other._asdict()
+        return self._asdict() == other if isinstance(other, Mapping) else NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._asdict())
+
+
+class ColumnBuilder:
+    # gathers rows, a batch at a time, into one column per name. the type of a column comes from the cursor:
+    # integers are kept in an array('q') (int64) and floating point numbers in an array('d') (float64),
+    # anything else (and a typed column once it meets a NULL) in a list
+    INT_TYPES = {20, 21, 23}  # OIDs of BIGINT, SMALLINT, INTEGER
+    FLOAT_TYPES = {700, 701}  # OIDs of REAL, DOUBLE PRECISION
+
+    def __init__(self, description):
+        self.header = [d.name for d in description]
+        self.columns = [ColumnBuilder.__column(getattr(d, 'type_code', None)) for d in description]
+
+    @staticmethod
+    def __column(typeCode):
+        if typeCode in ColumnBuilder.INT_TYPES:
+            return array('q')
+        if typeCode in ColumnBuilder.FLOAT_TYPES:
+            return array('d')
+        return []
+
+    def extend(self, rows: list):
+        for index, values in enumerate(zip(*rows)):
+            column = self.columns[index]
+            if type(column) is array:
+                length = len(column)
+                try:
+                    column.extend(values)
+                    continue
+                except (TypeError, OverflowError):
+                    # a NULL or a value the array can not hold, drop what was added of the batch
+                    del column[length:]
+                    column = self.columns[index] = column.tolist()
+            column.extend(values)
+
+    # column name -> column, in header order, the last of equal names wins
+    def build(self) -> dict:
+        return dict(zip(self.header, self.columns))
+
+
+# the columns of ColumnBuilder.build as numpy arrays: int64 and float64 for the typed columns, object otherwise.
+# a column named in categorical becomes a pair (codes, labels) instead, labels is the sorted distinct values
+# and codes an int32 array of the index of each value in labels, -1 for NULL
+def numpyColumns(columns: dict, categorical=()) -> dict:
+    if numpy is None:
+        raise ImportError("numpyColumns needs numpy, pip install numpy")
+    arrays = {}
+    for name, column in columns.items():
+        if name in categorical:
+            labels = sorted(set(column) - {None})
+            codes = {label: code for code, label in enumerate(labels)}
+            arrays[name] = (numpy.fromiter((codes.get(value, -1) for value in column), dtype=numpy.int32,
+                                           count=len(column)), numpy.array(labels, dtype=object))
+        elif type(column) is array:
+            arrays[name] = numpy.frombuffer(column, dtype=numpy.int64 if column.typecode == 'q' else numpy.float64)
+        else:
+            values = numpy.empty(len(column), dtype=object)
+            values[:] = column
+            arrays[name] = values
+    return arrays
+
+
 class ResultSet:
     # constructor
     def __init__(self, description=None, results=None):
         self.rows = []
         self.cols_header = []
         self.cols = ResultSetDict()
+        self.__columns = {}
+        self.__lookup = {}
+        self.__description = []
         self.__fromQuery(description, results)
 
     def __getitem__(self, row):
@@ -26,15 +158,28 @@ class ResultSet:
 
     # so you can use print(ResultSet)
     def __str__(self):
-        string = ""
-        for col in self.cols_header:
-            string += str(col) + "   "
-        string += '\n'
-        for row in self.rows:
-            for val in row:
-                string += str(val) + "   "
-            string += '\n'
-        return string
+        output = io.StringIO()
+        self.write(output)
+        return output.getvalue()
+
+    # writes the ResultSet to output (a file-like object, stdout by default) a line at a time, the columns
+    # aligned to their widest value. only the first limit rows are written (all of them if None),
+    # followed by a line counting the rows left out
+    def write(self, output=None, limit: int = None):
+        output = sys.stdout if output is None else output
+        shown = self.rows if limit is None or len(self.rows) <= limit else self.rows[:limit]
+        header = [str(col) for col in self.cols_header]
+        widths = [len(col) for col in header]
+        for row in shown:
+            widths = [max(width, len(str(val))) for width, val in zip(widths, row)]
+
+        def line(values) -> str:
+            return "   ".join(str(val).ljust(width) for val, width in zip(values, widths)).rstrip() + "\n"
+
+        output.write(line(header))
+        output.writelines(line(row) for row in shown)
+        if len(shown) < len(self.rows):
+            output.write("... ({} more rows)\n".format(len(self.rows) - len(shown)))
 
     # what is the size of the ResultSet?
     def size(self):
@@ -44,46 +189,370 @@ class ResultSet:
     def isEmpty(self):
         return self.size() == 0
 
+    # the ResultSet by column, see ColumnBuilder for the type of each column
+    def toColumns(self) -> dict:
+        builder = ColumnBuilder(self.__description)
+        builder.extend(self.rows)
+        return builder.build()
+
+    # the ResultSet by column as numpy arrays, see numpyColumns
+    def toNumpy(self, categorical=()) -> dict:
+        return numpyColumns(self.toColumns(), categorical)
+
     def __getRow(self, row: int):
         if len(self.rows) <= row:
             print('Invalid row ' + str(row))
             return ResultSetDict()
-        row_to_return = ResultSetDict()
-        for val, col in zip(self.rows[row], self.cols_header):
-            row_to_return[col] = val
-        return row_to_return
+        return ResultSetRow(self.rows[row], self.__columns, self.__lookup)
 
+    # the fetched list is kept as it is, the ResultSet owns it
     def __fromQuery(self, description, results: list):
+        self.__description = description or []
         if results is None or len(results) == 0:  # no results
             self.cols = ResultSetDict()
         else:
-            self.rows = results.copy()
+            self.rows = results
             self.cols_header = [d.name for d in description]
             self.cols = ResultSetDict()
             for col, index in zip(self.cols_header, range(len(results[0]))):
                 self.cols[col] = index
+                self.__columns[col] = index
+            self.__lookup.update((col, index) for col, index in self.__columns.items() if col == col.lower())
+
+
+class CopyStream:
+    # a read-only file-like object rendering rows in COPY text format on demand,
+    # None is sent as NULL and every other value as its str()
+    __escapes = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+    def __init__(self, rows):
+        self.__rows = iter(rows)
+        self.__buffer = ''
+
+    def read(self, size=-1) -> str:
+        parts = [self.__buffer]
+        length = len(self.__buffer)
+        while size < 0 or length < size:
+            row = next(self.__rows, None)
+            if row is None:
+                break
+            line = '\t'.join('\\N' if value is None else str(value).translate(CopyStream.__escapes)
+                             for value in row) + '\n'
+            parts.append(line)
+            length += len(line)
+        data = ''.join(parts)
+        if size < 0:
+            size = len(data)
+        self.__buffer = data[size:]
+        return data[:size]
+
+
+class ConnectionPool:
+    # a process-wide pool of open connections, shared by every pooled DBConnector
+    # minSize      - connections kept open even when idle
+    # maxSize      - upper bound on open connections, acquire() waits for a free one beyond it
+    # idleTimeout  - seconds an idle connection above minSize is kept before it is closed
+    # checkInterval - connections idle for longer than this are pinged before being handed out
+    # timeout      - seconds acquire() waits for a free connection before giving up
+    def __init__(self, params: dict, minSize=1, maxSize=10, idleTimeout=300.0, checkInterval=30.0, timeout=30.0):
+        if minSize < 0 or maxSize < 1 or minSize > maxSize:
+            raise ValueError("Invalid pool size, expected 0 <= minSize <= maxSize and maxSize >= 1")
+        self.params = params
+        self.minSize = minSize
+        self.maxSize = maxSize
+        self.idleTimeout = idleTimeout
+        self.checkInterval = checkInterval
+        self.timeout = timeout
+        self.__idle = deque()  # (connection, last used) pairs, most recently used on the right
+        self.__size = 0  # open connections, idle and checked out
+        self.__closed = False
+        self.__cond = threading.Condition()
+        for _ in range(minSize):
+            self.__idle.append((self.__connect(), time.monotonic()))
+            self.__size += 1
+
+    # number of open connections, idle and checked out
+    def size(self):
+        with self.__cond:
+            return self.__size
+
+    # number of connections waiting in the pool
+    def idle(self):
+        with self.__cond:
+            return len(self.__idle)
+
+    # get a healthy connection, opening a new one if the pool is empty and not full
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            connection, lastUsed = self.__reserve(deadline)
+            if connection is None:
+                try:
+                    return self.__connect()
+                except Exception:
+                    self.__forget()
+                    raise
+            if self.__isHealthy(connection, lastUsed):
+                return connection
+            self.__close(connection)
+            self.__forget()
+
+    # give a connection back, any open transaction is rolled back first
+    def release(self, connection, discard=False):
+        if not discard and not connection.closed:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+        with self.__cond:
+            if discard or connection.closed or self.__closed:
+                self.__close(connection)
+                self.__size -= 1
+            else:
+                self.__idle.append((connection, time.monotonic()))
+            self.__cond.notify()
+
+    # close all idle connections, connections still checked out are closed when released
+    def close(self):
+        with self.__cond:
+            self.__closed = True
+            while self.__idle:
+                connection, _ = self.__idle.popleft()
+                self.__close(connection)
+                self.__size -= 1
+            self.__cond.notify_all()
+
+    # pop an idle connection or reserve a slot for a new one (returned as None)
+    def __reserve(self, deadline):
+        with self.__cond:
+            while True:
+                if self.__closed:
+                    raise DatabaseException.ConnectionInvalid("Connection pool is closed")
+                self.__evictIdle()
+                if self.__idle:
+                    return self.__idle.pop()
+                if self.__size < self.maxSize:
+                    self.__size += 1
+                    return None, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DatabaseException.ConnectionInvalid("Connection pool exhausted")
+                self.__cond.wait(remaining)
+
+    # release a slot reserved by __reserve whose connection never made it back
+    def __forget(self):
+        with self.__cond:
+            self.__size -= 1
+            self.__cond.notify()
+
+    # close connections that stayed idle for too long, keeping at least minSize open
+    def __evictIdle(self):
+        now = time.monotonic()
+        while self.__size > self.minSize and self.__idle and now - self.__idle[0][1] > self.idleTimeout:
+            connection, _ = self.__idle.popleft()
+            self.__close(connection)
+            self.__size -= 1
+
+    def __isHealthy(self, connection, lastUsed):
+        if connection.closed or connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if time.monotonic() - lastUsed <= self.checkInterval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def __connect(self):
+        try:
+            connection = psycopg2.connect(**self.params)
+        except Exception:
+            raise DatabaseException.ConnectionInvalid("Could not connect to database")
+        connection.autocommit = False
+        return connection
+
+    @staticmethod
+    def __close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+class PreparedStatement:
+    # a named statement that is PREPAREd once per connection and EXECUTEd with bound parameters after that,
+    # so the server parses and plans it once per connection instead of once per call.
+    # the query refers to its parameters as $1, $2, ...
+    __registry = {}
+    __lock = threading.Lock()
+    # names of the statements already prepared on each open connection
+    __prepared = weakref.WeakKeyDictionary()
+
+    def __init__(self, name: str, query: str):
+        if re.fullmatch(r"[a-z_][a-z0-9_]*", name) is None:
+            raise ValueError("Invalid statement name " + name)
+        self.name = name
+        self.query = query
+        self.prepares = 0
+        self.executions = 0
+        params = max([int(n) for n in re.findall(r"\$(\d+)", query)], default=0)
+        self.__execute = "EXECUTE " + name
+        if params > 0:
+            self.__execute += " (" + ", ".join(["%s"] * params) + ")"
+        with PreparedStatement.__lock:
+            registered = PreparedStatement.__registry.get(name)
+            if registered is not None and registered.query != query:
+                raise ValueError("Statement " + name + " is already registered")
+            PreparedStatement.__registry[name] = self
+
+    # prepare the statement on the cursor's connection if needed, returns the EXECUTE query to run.
+    # count=False leaves the stats alone, for tooling (e.g. EXPLAIN) that is not a real call
+    def bind(self, cursor, count=True) -> str:
+        prepare = self.prepareQuery(cursor.connection)
+        if prepare is not None:
+            cursor.execute(prepare)
+            self.prepared(cursor.connection, count)
+        return self.executeQuery(count)
+
+    # the PREPARE to run first on connection, None if it is already prepared there
+    def prepareQuery(self, connection):
+        with PreparedStatement.__lock:
+            if self.name in PreparedStatement.__prepared.get(connection, ()):
+                return None
+        return "PREPARE " + self.name + " AS " + self.query
+
+    # the PREPARE of prepareQuery ran on connection
+    def prepared(self, connection, count=True):
+        with PreparedStatement.__lock:
+            PreparedStatement.__prepared.setdefault(connection, set()).add(self.name)
+            if count:
+                self.prepares += 1
+
+    # the EXECUTE query with a %s placeholder for each parameter, counted as an execution unless count=False
+    def executeQuery(self, count=True) -> str:
+        if count:
+            with PreparedStatement.__lock:
+                self.executions += 1
+        return self.__execute
+
+    # the query with %s placeholders and the args in the order they appear, for where the statement cannot be
+    # EXECUTEd, e.g. on a server-side cursor (DECLARE takes a SELECT only)
+    def inline(self, args: tuple = None) -> (str, tuple):
+        args = args or ()
+        order = [int(n) - 1 for n in re.findall(r"\$(\d+)", self.query)]
+        return re.sub(r"\$(\d+)", "%s", self.query.replace("%", "%%")), tuple(args[i] for i in order)
+
+    # the statement is no longer prepared on this connection (e.g. after DEALLOCATE), prepare it again on next use
+    def forget(self, connection):
+        with PreparedStatement.__lock:
+            PreparedStatement.__prepared.get(connection, set()).discard(self.name)
+
+    # how many times each registered statement was prepared and executed,
+    # every execution beyond the prepares reused an existing plan
+    @staticmethod
+    def stats() -> dict:
+        with PreparedStatement.__lock:
+            return {name: {'prepares': statement.prepares, 'executions': statement.executions,
+                           'reuses': statement.executions - statement.prepares}
+                    for name, statement in PreparedStatement.__registry.items()}
+
+    @staticmethod
+    def resetStats():
+        with PreparedStatement.__lock:
+            for statement in PreparedStatement.__registry.values():
+                statement.prepares = 0
+                statement.executions = 0
 
 
 class DBConnector:
-    # constructor
-    def __init__(self):
+    # environment variables overriding the matching key of the [postgresql] section
+    CONFIG_ENV_OVERRIDES = {'PGHOST': 'host', 'PGPORT': 'port', 'PGDATABASE': 'database', 'PGUSER': 'user',
+                            'PGPASSWORD': 'password', 'PGSCHEMA': 'schema'}
+    __configCache = None
+    __configLock = threading.Lock()
+    # rows printed by execute(printSchema=True)
+    PRINT_LIMIT = 100
+
+    # names of the server-side cursors of stream
+    __cursorNames = itertools.count()
+    # how many times execute/copy failed with each SQLSTATE, see errorStats
+    __errorCounts = {}
+    __errorLock = threading.Lock()
+
+    # settings of the process-wide pool, see ConnectionPool for their meaning
+    __poolSettings = {}
+    __processPool = None
+    __processPoolPid = None
+    __poolLock = threading.Lock()
+    # pools inherited from a parent process, kept referenced so their sockets are never closed by the child
+    __inheritedPools = []
+
+    # constructor, a pooled connector borrows its connection from the process-wide pool
+    def __init__(self, pooled=True):
+        self.connection = None
+        self.cursor = None
+        self.__pool = DBConnector.getPool() if pooled else None
         try:
-            # Obtain the configuration parameters
-            params = DBConnector.__config()
-            self.connection = psycopg2.connect(**params)
-            self.connection.autocommit = False
+            if self.__pool is not None:
+                self.connection = self.__pool.acquire()
+            else:
+                # Obtain the configuration parameters
+                params = DBConnector.config()
+                self.connection = psycopg2.connect(**params)
+                self.connection.autocommit = False
             self.cursor = self.connection.cursor()
         except Exception as e:
-            self.connection = None
-            self.cursor = None
+            self.close()
             raise DatabaseException.ConnectionInvalid("Could not connect to database")
 
-    # close connection
+    # close connection, a pooled connection is returned to the pool instead
     def close(self):
         if self.cursor is not None:
             self.cursor.close()
+            self.cursor = None
         if self.connection is not None:
-            self.connection.close()
+            if self.__pool is not None:
+                self.__pool.release(self.connection)
+            else:
+                self.connection.close()
+            self.connection = None
+
+    # get the process-wide pool, creating it on first use (and again after a fork)
+    @staticmethod
+    def getPool() -> ConnectionPool:
+        with DBConnector.__poolLock:
+            if DBConnector.__processPool is not None and DBConnector.__processPoolPid != os.getpid():
+                DBConnector.__inheritedPools.append(DBConnector.__processPool)
+                DBConnector.__processPool = None
+            if DBConnector.__processPool is None:
+                try:
+                    pool = ConnectionPool(DBConnector.config(), **DBConnector.__poolSettings)
+                except DatabaseException.ConnectionInvalid:
+                    raise
+                except Exception:
+                    raise DatabaseException.ConnectionInvalid("Could not create connection pool")
+                DBConnector.__processPool = pool
+                DBConnector.__processPoolPid = os.getpid()
+            return DBConnector.__processPool
+
+    # change the pool settings (minSize, maxSize, idleTimeout, checkInterval, timeout),
+    # the current pool is closed and a new one is created on next use
+    @staticmethod
+    def configurePool(**settings):
+        DBConnector.closePool()
+        with DBConnector.__poolLock:
+            DBConnector.__poolSettings = dict(DBConnector.__poolSettings, **settings)
+
+    # close the process-wide pool
+    @staticmethod
+    def closePool():
+        with DBConnector.__poolLock:
+            if DBConnector.__processPool is not None and DBConnector.__processPoolPid == os.getpid():
+                DBConnector.__processPool.close()
+            DBConnector.__processPool = None
 
     # commit connection's changes
     def commit(self):
@@ -102,15 +571,116 @@ class DBConnector:
                 raise DatabaseException.ConnectionInvalid("Could not rollback changes")
 
     # executes the query, if it is SELECT you may ask to print the results with printSchema
+    # args are bound to the query's placeholders (%s for plain queries, $1, $2, ... for a PreparedStatement)
     # returns the number of rows effected and a ResultSet (for SELECT)
-    def execute(self, query: Union[str, sql.Composed], printSchema=False) -> (int, ResultSet):
+    def execute(self, query: Union[str, sql.Composed, PreparedStatement], printSchema=False,
+                args: tuple = None) -> (int, ResultSet):
         if self.connection is None:
             raise DatabaseException.ConnectionInvalid("Connection Invalid")
 
         # try execute the query
+        statement = query if isinstance(query, PreparedStatement) else None
         try:
-            self.cursor.execute(query)
-            row_effected = max(self.cursor.rowcount, 0)
+            with DBConnector.violations():
+                if statement is not None:
+                    query = statement.bind(self.cursor)
+                self.cursor.execute(query, args)
+                row_effected = max(self.cursor.rowcount, 0)
+        except errors.lookup("26000"):
+            # the prepared statement is gone from the session, it will be prepared again next time
+            if statement is not None:
+                statement.forget(self.connection)
+            raise
+
+        # get entries in case of SELECT
+        if self.cursor.description is not None:
+            entries = ResultSet(self.cursor.description, self.cursor.fetchall())
+        else:
+            entries = ResultSet()
+
+        # print SELECT entries, the first PRINT_LIMIT of them
+        if printSchema:
+            entries.write(limit=DBConnector.PRINT_LIMIT)
+
+        return row_effected, entries
+
+    # runs a SELECT on a server-side (named) cursor and yields its rows as tuples, fetched batchSize at a time,
+    # so only one batch is ever held in memory. the cursor belongs to the current transaction: commit or
+    # rollback once the rows are consumed or the iteration is abandoned
+    def stream(self, query: Union[str, sql.Composed, PreparedStatement], args: tuple = None,
+               batchSize=1000) -> Iterator[tuple]:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        for _, rows in self.__batches(query, args, batchSize):
+            yield from rows
+
+    # runs a SELECT like stream and gathers its rows into one column per name, a batch at a time, see ColumnBuilder
+    # for the type of each column. the rows are never held as tuples beyond one batch
+    def columns(self, query: Union[str, sql.Composed, PreparedStatement], args: tuple = None,
+                batchSize=10000) -> dict:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        builder = None
+        for description, rows in self.__batches(query, args, batchSize):
+            if builder is None:
+                builder = ColumnBuilder(description)
+            builder.extend(rows)
+        return builder.build()
+
+    # yields the description and rows of every batch fetched from a server-side cursor, the first even if empty
+    def __batches(self, query, args, batchSize) -> Iterator[tuple]:
+        if isinstance(query, PreparedStatement):
+            query, args = query.inline(args)
+        cursor = self.connection.cursor(name="stream_{}".format(next(DBConnector.__cursorNames)))
+        try:
+            with DBConnector.violations():
+                cursor.execute(query, args)
+            while True:
+                with DBConnector.violations():
+                    rows = cursor.fetchmany(batchSize)
+                yield cursor.description, rows
+                if not rows:
+                    return
+        finally:
+            cursor.close()
+
+    # streams rows (tuples in the order of columns) into table with COPY FROM STDIN,
+    # the rows are consumed lazily so they never have to be materialized at once
+    # returns the number of rows copied
+    def copy(self, table: str, columns: list, rows) -> int:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        query = sql.SQL("COPY {table} ({columns}) FROM STDIN").format(
+            table=sql.Identifier(table), columns=sql.SQL(", ").join(sql.Identifier(column) for column in columns))
+        with DBConnector.violations():
+            self.cursor.copy_expert(query, CopyStream(rows))
+        return max(self.cursor.rowcount, 0)
+
+    # how many statements of this process failed with each SQLSTATE (e.g. 40001 for a serialization failure,
+    # 40P01 for a deadlock), whether or not the caller handled the error
+    @staticmethod
+    def errorStats() -> dict:
+        with DBConnector.__errorLock:
+            return dict(DBConnector.__errorCounts)
+
+    @staticmethod
+    def resetErrorStats():
+        with DBConnector.__errorLock:
+            DBConnector.__errorCounts.clear()
+
+    # translate constraint violations raised by psycopg2 into DatabaseException (and count the SQLSTATE),
+    # around every statement sent by DBConnector and AsyncDBConnector
+    @staticmethod
+    @contextmanager
+    def violations():
+        try:
+            try:
+                yield
+            except psycopg2.Error as e:
+                if e.pgcode is not None:
+                    with DBConnector.__errorLock:
+                        DBConnector.__errorCounts[e.pgcode] = DBConnector.__errorCounts.get(e.pgcode, 0) + 1
+                raise
         except errors.lookup("23502"):
             raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
         except errors.lookup("23503"):
@@ -120,37 +690,109 @@ class DBConnector:
         except errors.lookup("23514"):
             raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
 
-        # get entries in case of SELECT
-        if self.cursor.description is not None:
-            entries = ResultSet(self.cursor.description, self.cursor.fetchall())
-        else:
-            entries = ResultSet()
+    # grant credentials, the [postgresql] section of database.ini with the environment overrides applied
+    @staticmethod
+    def config(section='postgresql') -> dict:
+        with DBConnector.__configLock:
+            if DBConnector.__configCache is None:
+                DBConnector.__configCache = DBConnector.__loadConfig()
+            sections = DBConnector.__configCache
+        if section not in sections:
+            raise DatabaseException.database_ini_ERROR("Please modify database.ini file under Utility")
+        return dict(sections[section])
 
-        # print SELECT entries
-        if printSchema:
-            print(entries)
+    # forget the parsed database.ini, the next connection reads it (and the environment) again.
+    # the process-wide pool is closed so that it reconnects with the new parameters
+    @staticmethod
+    def reloadConfig():
+        with DBConnector.__configLock:
+            DBConnector.__configCache = None
+        DBConnector.closePool()
 
-        return row_effected, entries
+    # parse the first database.ini that has a [postgresql] section, returns all of its sections
+    @staticmethod
+    def __loadConfig() -> dict:
+        sections = {}
+        for filename in DBConnector.__configFiles():
+            # create a parser
+            parser = ConfigParser()
+            # read config file
+            parser.read(filename)
+            if parser.has_section('postgresql'):
+                sections = {name: dict(parser.items(name)) for name in parser.sections()}
+                break
+        db = sections.get('postgresql')
+        for variable, param in DBConnector.CONFIG_ENV_OVERRIDES.items():
+            if os.environ.get(variable):
+                if db is None:
+                    db = sections['postgresql'] = {}
+                db[param] = os.environ[variable]
+        # schema = <name> puts every connection in that schema: it becomes the only schema of the search_path,
+        # so the tables are created in and read from it (the schema must exist)
+        if db is not None and db.get('schema'):
+            schema = db.pop('schema')
+            if re.fullmatch(r"[a-z_][a-z0-9_]*", schema) is None:
+                raise DatabaseException.database_ini_ERROR("Invalid schema name " + schema)
+            db['options'] = (db.get('options', '') + ' -c search_path=' + schema).strip()
+        return sections
 
-    # grant credentials
+    # database.ini under the working directory, its parent, or next to this module
     @staticmethod
-    def __config(filename=os.path.join(os.path.join(os.getcwd(), "Utility"), 'database.ini'),
-                 section='postgresql'):
-        # create a parser
-        parser = ConfigParser()
-        # read config file
-        parser.read(filename)
-
-        # get section
-        db = {}
-        if parser.has_section(section):
-            params = parser.items(section)
-            for param in params:
-                db[param[0]] = param[1]
-        else:
-            # file not found
-            db = DBConnector.__config(
-                filename=os.path.join(os.path.join(os.path.dirname(os.getcwd()), 'Utility'), 'database.ini'))
-            if db is None:
-                raise DatabaseException.database_ini_ERROR("Please modify database.ini file under Utility")
-        return db
+    def __configFiles() -> list:
+        return [os.path.join(os.getcwd(), 'Utility', 'database.ini'),
+                os.path.join(os.path.dirname(os.getcwd()), 'Utility', 'database.ini'),
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database.ini')]
+
+
+class NotificationListener(threading.Thread):
+    # a daemon thread that LISTENs on a channel over its own connection and calls handler(payload)
+    # for every notification. onReset() is called once listening starts and again after every
+    # reconnect, since notifications sent while the connection was down are lost
+    def __init__(self, channel: str, handler, onReset=None, pollInterval=1.0, retryInterval=1.0):
+        super().__init__(name="NotificationListener-" + channel, daemon=True)
+        self.channel = channel
+        self.handler = handler
+        self.onReset = onReset
+        self.pollInterval = pollInterval
+        self.retryInterval = retryInterval
+        self.ready = threading.Event()  # set while LISTEN is active
+        self.__stopped = threading.Event()
+
+    def stop(self, timeout=None):
+        self.__stopped.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def run(self):
+        while not self.__stopped.is_set():
+            connection = None
+            try:
+                connection = psycopg2.connect(**DBConnector.config())
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                self.__reset()
+                self.ready.set()
+                self.__listen(connection)
+            except Exception:
+                self.__stopped.wait(self.retryInterval)
+            finally:
+                self.ready.clear()
+                if connection is not None:
+                    connection.close()
+
+    def __listen(self, connection):
+        while not self.__stopped.is_set():
+            if select.select([connection], [], [], self.pollInterval) == ([], [], []):
+                continue
+            connection.poll()
+            while connection.notifies:
+                notify = connection.notifies.pop(0)
+                try:
+                    self.handler(notify.payload)
+                except Exception:
+                    pass  # a bad payload must not stop the listener
+
+    def __reset(self):
+        if self.onReset is not None:
+            self.onReset()